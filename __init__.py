@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import logging
+from contextlib import contextmanager
 from pathlib import Path
+from time import perf_counter
+from typing import Iterator
 
 from homeassistant.components import frontend
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.start import async_at_started
 
-from .const import DOMAIN, PLATFORMS
+from .const import CONF_NOTIFY_DELAY_MS, DEFAULT_NOTIFY_DELAY_MS, DOMAIN, PLATFORMS
+from .http import MaintenanceTasksView
 from .services import async_setup_services
 from .storage import MaintenanceDB
 
@@ -32,36 +39,105 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
+@contextmanager
+def _phase(timings: dict[str, float], name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((perf_counter() - start) * 1000, 2)
+        _LOGGER.debug("Setup phase %s took %.2f ms", name, timings[name])
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
-
-    await _register_static_assets(hass)
-    await _register_panel(hass)
+    timings: dict[str, float] = {}
 
     # Create DB once per entry
-    db = MaintenanceDB(hass, entry.entry_id)
-    await db.async_load()
+    db = MaintenanceDB(hass, entry.entry_id, notify_delay=_notify_delay(entry))
+    with _phase(timings, "load"):
+        await db.async_load()
 
     # Store entry data
     name = entry.title or "Maintenance"
     hass.data[DOMAIN][entry.entry_id] = {
         "db": db,
         "name": name,
+        "setup_timings": timings,
     }
 
     # ✅ Register services ONCE globally
     # If you have multiple entries, you still want only one set of services.
     if not hass.data[DOMAIN].get("_services_registered"):
-        await async_setup_services(hass, db)
+        with _phase(timings, "services"):
+            await async_setup_services(hass, db)
         hass.data[DOMAIN]["_services_registered"] = True
 
+    # Views cannot be removed again, so like services this happens once.
+    if not hass.data[DOMAIN].get("view_registered"):
+        hass.http.register_view(MaintenanceTasksView(hass))
+        hass.data[DOMAIN]["view_registered"] = True
+
+    # The sidebar panel, its assets and the search index are not needed to
+    # bring entities up; do that work once Home Assistant has finished starting.
+    async def _async_started(_hass: HomeAssistant) -> None:
+        with _phase(timings, "frontend"):
+            await _register_static_assets(hass)
+            await _register_panel(hass)
+        with _phase(timings, "warm_indexes"):
+            await db.async_warm()
+
+    entry.async_on_unload(async_at_started(hass, _async_started))
+
+    # Due dates are local midnights; recompute them if the instance time zone changes.
+    time_zone = hass.config.time_zone
+
+    async def _async_core_config_updated(event: Event) -> None:
+        nonlocal time_zone
+        if hass.config.time_zone == time_zone:
+            return
+        time_zone = hass.config.time_zone
+        changed = await db.async_reindex_due()
+        if changed:
+            _LOGGER.debug("Recomputed due dates for %s task(s) after config update", changed)
+        db.refresh_summary()
+        await db.notify()
+
+    # Overdue / due-today counters are relative to the local day.
+    @callback
+    def _async_midnight(now) -> None:
+        db.refresh_summary()
+        hass.async_create_task(db.notify())
+
+    entry.async_on_unload(hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, _async_core_config_updated))
+    entry.async_on_unload(async_track_time_change(hass, _async_midnight, hour=0, minute=0, second=0))
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
     # Forward platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with _phase(timings, "platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    _LOGGER.debug("Set up %s with %s task(s): %s", entry.title, len(db.tasks), timings)
     return True
 
 
+def _notify_delay(entry: ConfigEntry) -> float:
+    return int(entry.options.get(CONF_NOTIFY_DELAY_MS, DEFAULT_NOTIFY_DELAY_MS)) / 1000
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data:
+        data["db"].notify_delay = _notify_delay(entry)
+        # Entities read the payload mode live; rewrite them in the new shape.
+        await data["db"].notify()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    # Deliver a coalesced notify while the entities are still listening.
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data:
+        data["db"].flush()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import bisect
+import operator
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from itertools import compress, repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+ANALYTICS_STORAGE_VERSION = 1
+
+# Completions are batched into one write at most this often.
+ANALYTICS_SAVE_DELAY = 30
+
+BUCKET_DAY = "day"
+BUCKET_WEEK = "week"
+BUCKET_MONTH = "month"
+BUCKETS = (BUCKET_DAY, BUCKET_WEEK, BUCKET_MONTH)
+
+# Column name -> array typecode. Rows are kept sorted by "ts".
+COLUMNS: Dict[str, str] = {
+    "task": "I",
+    "zone": "I",
+    "user": "I",
+    "ts": "d",  # completion time, epoch seconds
+    "minutes": "f",
+    "days_late": "i",  # local days after the due date; 0 or less is on time
+}
+
+
+class _Codes:
+    """Interns strings as small integer codes for the columns."""
+
+    def __init__(self, names: Optional[List[str]] = None) -> None:
+        self.names: List[str] = list(names or [])
+        self._codes: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+@dataclass(frozen=True)
+class LogSnapshot:
+    """Point-in-time copy of the columns, safe to read from an executor thread."""
+
+    columns: Dict[str, array]
+    tasks: Tuple[str, ...]
+    zones: Tuple[str, ...]
+    users: Tuple[str, ...]
+
+
+class CompletionLog:
+    """Append-only completion history in compact typed columns.
+
+    Each completion costs about 26 bytes. The columns are persisted as raw
+    array bytes in their own store file, which is read on first use;
+    completions recorded before that are buffered and merged on load.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        self.hass = hass
+        self.store: Store = Store(hass, ANALYTICS_STORAGE_VERSION, key)
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS.items()}
+        self.tasks = _Codes()
+        self.zones = _Codes()
+        self.users = _Codes()
+        self._loaded = False
+        self._pending: list[tuple] = []
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.columns["ts"]) + len(self._pending)
+
+    async def async_load(self) -> None:
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self.store.async_load()
+            if isinstance(data, dict):
+                await self.hass.async_add_executor_job(self._decode, data)
+            self._loaded = True
+            for row in self._pending:
+                self._append(*row)
+            if self._pending:
+                self._pending.clear()
+                self._schedule_save()
+
+    def record(self, task_id: str, zone: str, user: Optional[str], ts: float, minutes: float, days_late: int) -> None:
+        row = (task_id, zone, user or "unknown", ts, minutes, days_late)
+        if not self._loaded:
+            self._pending.append(row)
+            return
+        self._append(*row)
+        self._schedule_save()
+
+    def _append(self, task_id: str, zone: str, user: str, ts: float, minutes: float, days_late: int) -> None:
+        values = {
+            "task": self.tasks.code(task_id),
+            "zone": self.zones.code(zone),
+            "user": self.users.code(user),
+            "ts": ts,
+            "minutes": minutes,
+            "days_late": days_late,
+        }
+        ts_col = self.columns["ts"]
+        if not ts_col or ts >= ts_col[-1]:
+            for name, col in self.columns.items():
+                col.append(values[name])
+            return
+        # A clock step backwards; insert in place so range lookups can bisect.
+        i = bisect.bisect_right(ts_col, ts)
+        for name, col in self.columns.items():
+            col.insert(i, values[name])
+
+    def snapshot(self) -> LogSnapshot:
+        """Copy the columns (a memcpy each) so reports never see a half-appended row."""
+        return LogSnapshot(
+            {name: col[:] for name, col in self.columns.items()},
+            tuple(self.tasks.names),
+            tuple(self.zones.names),
+            tuple(self.users.names),
+        )
+
+    def _schedule_save(self) -> None:
+        self.store.async_delay_save(self._data_to_save, ANALYTICS_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "byteorder": sys.byteorder,
+            "tasks": self.tasks.names,
+            "zones": self.zones.names,
+            "users": self.users.names,
+            "columns": {name: base64.b64encode(col.tobytes()).decode("ascii") for name, col in self.columns.items()},
+        }
+
+    def _decode(self, data: Dict[str, Any]) -> None:
+        raw = data.get("columns")
+        if not isinstance(raw, dict):
+            return
+        columns: Dict[str, array] = {}
+        for name, code in COLUMNS.items():
+            col = array(code)
+            try:
+                col.frombytes(base64.b64decode(raw.get(name, "")))
+            except (TypeError, ValueError):
+                return
+            if data.get("byteorder", sys.byteorder) != sys.byteorder:
+                col.byteswap()
+            columns[name] = col
+        if len({len(col) for col in columns.values()}) != 1:
+            return
+        self.columns = columns
+        self.tasks = _Codes(data.get("tasks"))
+        self.zones = _Codes(data.get("zones"))
+        self.users = _Codes(data.get("users"))
+
+
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == BUCKET_WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == BUCKET_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, bucket: str) -> date:
+    if bucket == BUCKET_WEEK:
+        return day + timedelta(days=7)
+    if bucket == BUCKET_MONTH:
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def _summary(count: int, minutes: float, on_time: int, days_late: int) -> Dict[str, Any]:
+    return {
+        "completions": count,
+        "minutes": round(minutes, 1),
+        "mean_min": round(minutes / count, 1) if count else None,
+        "on_time_rate": round(on_time / count, 3) if count else None,
+        "mean_days_late": round(days_late / count, 2) if count else None,
+    }
+
+
+def build_report(
+    snap: LogSnapshot,
+    start: datetime,
+    end: datetime,
+    *,
+    tz: tzinfo,
+    bucket: str = BUCKET_WEEK,
+    zone: Optional[str] = None,
+    user: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Throughput, on-time rate and duration trend for completions in [start, end).
+
+    Pure function of the snapshot; meant to run in an executor. Rows are sorted
+    by time, so the range and every trend bucket are contiguous slices found by
+    bisection. Totals come from sum() over column slices, and zones and users
+    from one sort of the row numbers by (zone, user), so no Python code runs
+    per row.
+    """
+
+    ts = snap.columns["ts"]
+    lo = bisect.bisect_left(ts, start.timestamp())
+    hi = bisect.bisect_left(ts, end.timestamp())
+
+    # Trend bucket boundaries as timestamps, in local time.
+    first = _bucket_start(start.astimezone(tz).date(), bucket)
+    labels: List[str] = []
+    edges: List[float] = []
+    day = first
+    while True:
+        nxt = _next_bucket(day, bucket)
+        labels.append(day.isoformat())
+        if datetime.combine(nxt, time.min, tzinfo=tz) >= end:
+            edges.append(float("inf"))
+            break
+        edges.append(datetime.combine(nxt, time.min, tzinfo=tz).timestamp())
+        day = nxt
+
+    zone_code = snap.zones.index(zone) if zone in snap.zones else None
+    user_code = snap.users.index(user) if user in snap.users else None
+    if (zone is not None and zone_code is None) or (user is not None and user_code is None):
+        hi = lo  # filter matches nothing
+
+    # Work on copies of the rows in range, narrowed to the filtered ones.
+    cols = {name: col[lo:hi] for name, col in snap.columns.items() if name != "task"}
+    mask = None
+    for name, code in (("zone", zone_code), ("user", user_code)):
+        if code is not None:
+            hits = map(operator.eq, cols[name], repeat(code))
+            mask = hits if mask is None else map(operator.and_, mask, hits)
+    if mask is not None:
+        rows = list(compress(range(hi - lo), mask))
+        cols = {name: array(col.typecode, map(col.__getitem__, rows)) for name, col in cols.items()}
+    minutes = cols["minutes"]
+    on_time = array("b", map(operator.le, cols["days_late"], repeat(0)))
+    days_late = array("i", map(max, cols["days_late"], repeat(0)))
+
+    def sums(part: slice) -> List[Any]:
+        part_minutes = minutes[part]
+        return [len(part_minutes), sum(part_minutes), sum(on_time[part]), sum(days_late[part])]
+
+    # Group index: one stable sort of the row numbers by (zone, user) puts each
+    # pair's rows next to each other; zones and users are merged from the pairs.
+    n_users = len(snap.users)
+    pair = array("I", map(operator.add, map(operator.mul, cols["zone"], repeat(n_users)), cols["user"]))
+    order = sorted(range(len(pair)), key=pair.__getitem__)
+    take = operator.itemgetter(*order) if len(order) > 1 else lambda col: [col[i] for i in order]
+    grouped_minutes, grouped_late = take(minutes), take(days_late)
+    on_time_by_pair = Counter(compress(pair, on_time))
+    by_zone: Dict[str, List[Any]] = {}
+    by_user: Dict[str, List[Any]] = {}
+    offset = 0
+    for code, count in sorted(Counter(pair).items()):
+        part = slice(offset, offset + count)
+        offset += count
+        totals = [count, sum(grouped_minutes[part]), on_time_by_pair[code], sum(grouped_late[part])]
+        for groups, name in ((by_zone, snap.zones[code // n_users]), (by_user, snap.users[code % n_users])):
+            acc = groups.setdefault(name, [0, 0.0, 0, 0])
+            acc[:] = map(operator.add, acc, totals)
+
+    # Rows are sorted by time, so each trend bucket is one slice.
+    offsets = [0] + [bisect.bisect_left(cols["ts"], edge) for edge in edges]
+
+    return {
+        "start": start.astimezone(timezone.utc).isoformat(),
+        "end": end.astimezone(timezone.utc).isoformat(),
+        "bucket": bucket,
+        "total": _summary(*sums(slice(None))),
+        "by_zone": {name: _summary(*acc) for name, acc in sorted(by_zone.items())},
+        "by_user": {name: _summary(*acc) for name, acc in sorted(by_user.items())},
+        "trend": [{"period": label, **_summary(*sums(slice(a, b)))} for label, a, b in zip(labels, offsets, offsets[1:])],
+    }
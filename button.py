@@ -9,21 +9,6 @@ from .const import DOMAIN
 from .storage import MaintenanceDB
 
 
-def _find_entity_id(hass: HomeAssistant, domain: str, contains: str) -> str:
-    # Helper to locate our select entities even if entity_id differs slightly
-    for st in hass.states.async_all(domain):
-        if contains in st.entity_id:
-            return st.entity_id
-    raise HomeAssistantError(f"Could not find {domain} entity containing '{contains}'")
-
-
-def _get_selected(hass: HomeAssistant, task_select_eid: str) -> str:
-    task_id = hass.states.get(task_select_eid).state
-    if task_id in ("unknown", "unavailable", "", None):
-        raise HomeAssistantError("No task selected")
-    return task_id
-
-
 class _BaseMaintenanceButton(ButtonEntity):
     _attr_has_entity_name = True
 
@@ -32,16 +17,12 @@ class _BaseMaintenanceButton(ButtonEntity):
         self._db = db
         self._attr_name = name
         self._attr_unique_id = unique_id
-        self._task_select_eid: str | None = None
-
-    async def async_added_to_hass(self) -> None:
-        # Find our selects once entity registry is available
-        self._task_select_eid = _find_entity_id(self.hass, "select", "maintenance_task")
 
     def _selected(self) -> str:
-        if not self._task_select_eid:
-            raise HomeAssistantError("Selector entities not ready")
-        return _get_selected(self.hass, self._task_select_eid)
+        task_id = self._db.selection.current
+        if not task_id:
+            raise HomeAssistantError("No task selected")
+        return task_id
 
 
 class MaintenanceStartButton(_BaseMaintenanceButton):
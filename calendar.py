@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .recurrence import occurrences
+from .storage import MaintenanceDB, Task
+
+
+class MaintenanceCalendarEntity(CalendarEntity):
+    """Due dates and projected repeats of every task as all-day events."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, db: MaintenanceDB, name: str, unique_id: str) -> None:
+        self._db = db
+        self._attr_name = f"{name} Schedule"
+        self._attr_unique_id = unique_id
+        self._remove_listener = None
+
+    async def async_added_to_hass(self) -> None:
+        self._remove_listener = self._db.add_listener(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._remove_listener:
+            self._remove_listener()
+
+    def _event(self, t: Task, day: date) -> CalendarEvent:
+        return CalendarEvent(
+            start=day,
+            end=day + timedelta(days=1),
+            summary=f"[{t.zone}] {t.title}",
+            description=t.notes_preview or None,
+            uid=f"{t.id}_{day.isoformat()}",
+        )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """The next task falling due today or later."""
+        today_start, _ = self._db.local_day_bounds()
+        tid = self._db.by_due.first_due_at_or_after(today_start)
+        t = self._db.get(tid) if tid else None
+        if t is None or t.due is None:
+            return None
+        return self._event(t, t.due.astimezone(self._db.time_zone).date())
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        tz = self._db.time_zone
+        start = start_date.astimezone(tz).date()
+        # A day belongs to the window if its local midnight falls before end_date.
+        end_local = end_date.astimezone(tz)
+        end = end_local.date() + timedelta(days=0 if end_local.time() == time.min else 1)
+
+        # Only tasks first due before the window closes can have dates inside it;
+        # the due ordering lets us stop there instead of visiting every task.
+        before = datetime.combine(end, time.min, tzinfo=tz).astimezone(timezone.utc)
+        events: list[CalendarEvent] = []
+        for tid in self._db.by_due.ids_due_before(before):
+            t = self._db.get(tid)
+            if t is None:
+                continue
+            for day in occurrences(t, start, end, tz):
+                events.append(self._event(t, day))
+        events.sort(key=lambda ev: (ev.start, ev.summary))
+        return events
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
+    db: MaintenanceDB = hass.data[DOMAIN][entry.entry_id]["db"]
+    name: str = hass.data[DOMAIN][entry.entry_id]["name"]
+    async_add_entities([MaintenanceCalendarEntity(db, name, f"{entry.entry_id}_calendar")])
@@ -5,7 +5,15 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 
-from .const import CONF_NAME, DEFAULT_NAME, DOMAIN
+from .const import (
+    CONF_NAME,
+    CONF_NOTIFY_DELAY_MS,
+    CONF_STATIC_PAYLOAD,
+    DEFAULT_NAME,
+    DEFAULT_NOTIFY_DELAY_MS,
+    DEFAULT_STATIC_PAYLOAD,
+    DOMAIN,
+)
 
 
 class MaintenanceConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -25,5 +33,28 @@ class MaintenanceConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
-        return None
+        return MaintenanceOptionsFlow()
+
+
+class MaintenanceOptionsFlow(config_entries.OptionsFlow):
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_NOTIFY_DELAY_MS,
+                        default=options.get(CONF_NOTIFY_DELAY_MS, DEFAULT_NOTIFY_DELAY_MS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+                    vol.Optional(
+                        CONF_STATIC_PAYLOAD,
+                        default=options.get(CONF_STATIC_PAYLOAD, DEFAULT_STATIC_PAYLOAD),
+                    ): bool,
+                }
+            ),
+        )
 
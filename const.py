@@ -1,6 +1,6 @@
 DOMAIN = "maintenance"
 
-PLATFORMS = ["todo", "select", "button", "sensor"]
+PLATFORMS = ["todo", "select", "button", "sensor", "calendar"]
 
 STORE_VERSION = 1
 STORE_KEY = f"{DOMAIN}_store_v{STORE_VERSION}"
@@ -8,12 +8,31 @@ STORE_KEY = f"{DOMAIN}_store_v{STORE_VERSION}"
 CONF_NAME = "name"
 DEFAULT_NAME = "Maintenance"
 
+CONF_NOTIFY_DELAY_MS = "notify_delay_ms"
+DEFAULT_NOTIFY_DELAY_MS = 0
+
+# Leave running_sec/total_sec out of entity attributes so they only change on real mutations.
+CONF_STATIC_PAYLOAD = "static_payload"
+DEFAULT_STATIC_PAYLOAD = False
+
 SERVICE_ADD_TASK = "add_task"
 SERVICE_UPDATE_TASK = "update_task"
 SERVICE_DELETE_TASK = "delete_task"
 SERVICE_START_TASK = "start_task"
 SERVICE_PAUSE_TASK = "pause_task"
 SERVICE_COMPLETE_TASK = "complete_task"
+SERVICE_SEARCH_TASKS = "search_tasks"
+SERVICE_ASSIGN_ZONES = "assign_zones"
+SERVICE_GET_USER_TASKS = "get_user_tasks"
+SERVICE_PLAN_SESSION = "plan_session"
+
+# Task lifecycle events, fired once a change has been saved.
+EVENT_TASK_CREATED = f"{DOMAIN}_task_created"
+EVENT_TASK_UPDATED = f"{DOMAIN}_task_updated"
+EVENT_TASK_DELETED = f"{DOMAIN}_task_deleted"
+EVENT_TASK_STARTED = f"{DOMAIN}_task_started"
+EVENT_TASK_PAUSED = f"{DOMAIN}_task_paused"
+EVENT_TASK_COMPLETED = f"{DOMAIN}_task_completed"
 
 ATTR_TASK_ID = "task_id"
 ATTR_TITLE = "title"
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .storage import MaintenanceDB
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Store size, index sizes and service-layer metrics (latency, conflicts, saves)."""
+
+    data = hass.data[DOMAIN][entry.entry_id]
+    db: MaintenanceDB = data["db"]
+    return {
+        "setup_timings_ms": data.get("setup_timings", {}),
+        "options": dict(entry.options),
+        "revision": db.revision,
+        "tasks": len(db.tasks),
+        "completions_logged": len(db.analytics),
+        "indexes": {
+            "search": len(db.search_index),
+            "status": db.by_status.counts(),
+            "locked": len(db.by_locked_by),
+            "due": len(db.by_due),
+        },
+        "summary": db.summary.as_dict(),
+        "metrics": db.metrics.as_dict(),
+    }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from homeassistant.core import Context, HomeAssistant
+
+from .storage import Task
+
+
+def changed_fields(before: Task, after: Task) -> Dict[str, Any]:
+    """New values of the stored fields that differ between two versions of a task."""
+
+    old, new = before.to_dict(), after.to_dict()
+    changed = {key: value for key, value in new.items() if key != "rev" and old.get(key) != value}
+    if "stats" in changed:
+        # The raw sketches are noise to an automation; send the figures instead.
+        changed["stats"] = after.stats.summary() if after.stats else None
+    return changed
+
+
+def fire_task_event(
+    hass: HomeAssistant,
+    event_type: str,
+    task_id: str,
+    *,
+    user: Optional[str] = None,
+    context: Optional[Context] = None,
+    **data: Any,
+) -> None:
+    """Fire a small lifecycle event so automations need not diff the tasks sensor."""
+
+    hass.bus.async_fire(event_type, {"task_id": task_id, "user": user, **data}, context=context)
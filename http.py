@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Optional
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN
+from .payload import sort_key, task_payload
+from .storage import MaintenanceDB
+
+TASKS_URL_PATH = "/api/maintenance/tasks"
+
+# Filter combinations kept per revision; older ones are encoded again on demand.
+SNAPSHOT_CACHE_SIZE = 32
+# Bodies smaller than this are not worth compressing.
+GZIP_MIN_BYTES = 1024
+# Completions this many local days back count towards a user's slice, the
+# default of maintenance.get_user_tasks.
+USER_RECENT_DAYS = 7
+
+# Zones, statuses and the user whose slice is served ("" for all tasks).
+FilterKey = tuple[tuple[str, ...], tuple[str, ...], str]
+
+
+@dataclass
+class _Snapshot:
+    etag: str
+    body: bytes
+    gzipped: Optional[bytes] = None
+
+
+@dataclass
+class SnapshotCache:
+    """Encoded task snapshots of one database, valid for one revision and local day.
+
+    days_left is relative to the local day, so a new day invalidates the
+    snapshots just like a new revision does.
+    """
+
+    version: tuple[int, str] = (-1, "")
+    snapshots: dict[FilterKey, _Snapshot] = field(default_factory=dict)
+
+    def get(self, version: tuple[int, str], key: FilterKey) -> Optional[_Snapshot]:
+        if version != self.version:
+            self.version = version
+            self.snapshots.clear()
+            return None
+        return self.snapshots.get(key)
+
+    def put(self, key: FilterKey, snapshot: _Snapshot) -> None:
+        if len(self.snapshots) >= SNAPSHOT_CACHE_SIZE:
+            del self.snapshots[next(iter(self.snapshots))]
+        self.snapshots[key] = snapshot
+
+
+def _task_ids(db: MaintenanceDB, key: FilterKey, matches: dict[str, list[str]]) -> set[str]:
+    zones, statuses, user = key
+    ids = set(matches) if user else set(db.tasks)
+    if zones:
+        ids &= set().union(*(db.by_zone.ids(z) for z in zones))
+    if statuses:
+        wanted: set[str] = set()
+        for status in statuses:
+            if status == "idle":
+                # The status index leaves idle tasks out; they are everything else.
+                wanted |= {tid for tid in ids if db.by_status.key_of(tid) is None}
+            else:
+                wanted |= db.by_status.ids(status)
+        ids &= wanted
+    return ids
+
+
+def _encode(db: MaintenanceDB, key: FilterKey, day_start: datetime) -> bytes:
+    user = key[2]
+    # Counted from the start of a local day, so the slice holds for the day the
+    # snapshot is cached for.
+    matches = db.user_slice(user, done_since=day_start - timedelta(days=USER_RECENT_DAYS)) if user else {}
+    tasks = []
+    for tid in _task_ids(db, key, matches):
+        item = task_payload(db.tasks[tid])
+        if user:
+            item["match"] = matches[tid]
+        tasks.append(item)
+    tasks.sort(key=sort_key)
+    body = {
+        "revision": db.revision,
+        "tasks": tasks,
+        "zones": sorted({t.zone or "Unsorted" for t in db.tasks.values()}),
+        "zone_stats": {zone: st.summary() for zone, st in sorted(db.zone_stats.items())},
+    }
+    if user:
+        body["user"] = user
+        body["user_zones"] = db.user_zones.get(user, [])
+    return json_bytes(body)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class MaintenanceTasksView(HomeAssistantView):
+    """Task snapshot for external dashboards and scripts.
+
+    The JSON body is encoded once per revision and filter and then served
+    from memory. Clients that send the ETag back get an empty 304. A `user`
+    parameter narrows the tasks to that user's slice, as in
+    maintenance.get_user_tasks.
+    """
+
+    url = TASKS_URL_PATH
+    name = "api:maintenance:tasks"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._caches: dict[str, SnapshotCache] = {}
+
+    def _entry(self, entry_id: Optional[str]) -> Optional[tuple[str, MaintenanceDB]]:
+        for eid, data in self.hass.data.get(DOMAIN, {}).items():
+            if isinstance(data, dict) and "db" in data and entry_id in (None, eid):
+                return eid, data["db"]
+        return None
+
+    async def get(self, request: web.Request) -> web.Response:
+        found = self._entry(request.query.get("entry_id"))
+        if found is None:
+            return self.json_message("Unknown maintenance entry", HTTPStatus.NOT_FOUND)
+        entry_id, db = found
+
+        key: FilterKey = (
+            tuple(sorted({z for z in request.query.getall("zone", []) if z})),
+            tuple(sorted({s for s in request.query.getall("status", []) if s})),
+            request.query.get("user", "").strip(),
+        )
+        day_start, _ = db.local_day_bounds()
+        version = (db.revision, day_start.date().isoformat())
+
+        cache = self._caches.setdefault(entry_id, SnapshotCache())
+        snapshot = cache.get(version, key)
+        if snapshot is None:
+            digest = hashlib.blake2s(repr((entry_id, key)).encode(), digest_size=6).hexdigest()
+            snapshot = _Snapshot(f"{version[0]}-{version[1]}-{digest}", _encode(db, key, day_start))
+            cache.put(key, snapshot)
+
+        use_gzip = len(snapshot.body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("Accept-Encoding", "")
+        # A strong ETag names exact bytes, so the compressed body gets its own.
+        etag = f'"{snapshot.etag}-gz"' if use_gzip else f'"{snapshot.etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if _etag_matches(request.headers.get("If-None-Match", ""), etag):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        body = snapshot.body
+        if use_gzip:
+            if snapshot.gzipped is None:
+                snapshot.gzipped = await self.hass.async_add_executor_job(gzip.compress, snapshot.body, 6)
+            body = snapshot.gzipped
+            headers["Content-Encoding"] = "gzip"
+        return web.Response(body=body, content_type="application/json", headers=headers)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import bisect
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class KeyIndex:
+    """Maps the value of one task attribute to the ids of the tasks holding it.
+
+    Values in `skip` are not indexed, which keeps the index proportional to the
+    interesting tasks (e.g. running ones) rather than the whole database.
+    """
+
+    def __init__(self, attr: str, skip: Iterable[Any] = (None,)) -> None:
+        self._attr = attr
+        self._skip = frozenset(skip)
+        self._ids: Dict[Hashable, Set[str]] = {}
+        # task_id -> key it is currently filed under, for cheap moves and removal.
+        self._keys: Dict[str, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._keys.clear()
+
+    def update(self, task: Any) -> None:
+        key = getattr(task, self._attr)
+        if key in self._skip:
+            self.remove(task.id)
+            return
+        if task.id in self._keys and self._keys[task.id] == key:
+            return
+        self.remove(task.id)
+        self._ids.setdefault(key, set()).add(task.id)
+        self._keys[task.id] = key
+
+    def remove(self, task_id: str) -> None:
+        if task_id not in self._keys:
+            return
+        key = self._keys.pop(task_id)
+        ids = self._ids.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del self._ids[key]
+
+    def rebuild(self, tasks: Iterable[Any]) -> None:
+        self.clear()
+        for t in tasks:
+            self.update(t)
+
+    def ids(self, key: Hashable) -> frozenset[str]:
+        return frozenset(self._ids.get(key, ()))
+
+    def key_of(self, task_id: str) -> Optional[Hashable]:
+        return self._keys.get(task_id)
+
+    def counts(self) -> Dict[Hashable, int]:
+        return {key: len(ids) for key, ids in self._ids.items()}
+
+
+class DueIndex:
+    """Task ids ordered by due date so date-range queries need not scan every task.
+
+    Tasks without a due date are not filed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[datetime, str]] = []
+        self._due: Dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._due.clear()
+
+    def update(self, task: Any) -> None:
+        if task.id in self._due and self._due[task.id] == task.due:
+            return
+        self.remove(task.id)
+        if task.due is None:
+            return
+        bisect.insort(self._entries, (task.due, task.id))
+        self._due[task.id] = task.due
+
+    def remove(self, task_id: str) -> None:
+        due = self._due.pop(task_id, None)
+        if due is None:
+            return
+        i = bisect.bisect_left(self._entries, (due, task_id))
+        if i < len(self._entries) and self._entries[i] == (due, task_id):
+            del self._entries[i]
+
+    def rebuild(self, tasks: Iterable[Any]) -> None:
+        self._due = {t.id: t.due for t in tasks if t.due is not None}
+        self._entries = sorted((due, tid) for tid, due in self._due.items())
+
+    def ids_due_before(self, end: datetime) -> Iterator[str]:
+        """Ids of tasks due before end, earliest first."""
+        stop = bisect.bisect_left(self._entries, (end,))
+        for i in range(stop):
+            yield self._entries[i][1]
+
+    def first(self, count: int) -> list[str]:
+        """Ids of the count earliest-due tasks."""
+        return [tid for _, tid in self._entries[:count]]
+
+    def first_due_at_or_after(self, start: datetime) -> Optional[str]:
+        i = bisect.bisect_left(self._entries, (start,))
+        return self._entries[i][1] if i < len(self._entries) else None
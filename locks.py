@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict
+
+
+@dataclass
+class _Entry:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Holders plus waiters; the entry is dropped when this reaches zero.
+    users: int = 0
+
+
+class KeyedLock:
+    """One asyncio lock per key, created on demand and dropped when unused.
+
+    Callers working on different keys never wait for each other, and the
+    table only holds keys somebody is currently using.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+
+    @asynccontextmanager
+    async def hold(self, *keys: str) -> AsyncIterator[None]:
+        # A fixed acquisition order keeps two multi-key holders from deadlocking.
+        entries = []
+        for key in sorted(set(keys)):
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.users += 1
+            entries.append((key, entry))
+
+        acquired: list[asyncio.Lock] = []
+        try:
+            for _, entry in entries:
+                await entry.lock.acquire()
+                acquired.append(entry.lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            for key, entry in entries:
+                entry.users -= 1
+                if not entry.users:
+                    del self._entries[key]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Recent latencies kept per operation for percentile reporting.
+LATENCY_WINDOW = 512
+
+
+def _percentile(sorted_vals: list[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(p * (len(sorted_vals) - 1))))]
+
+
+class Metrics:
+    """Cheap in-process counters and latency windows for the service layer.
+
+    Everything is updated on the event loop; reading is for diagnostics and
+    load testing, so no locking is needed.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.counters: Dict[str, int] = {}
+        self._latency: Dict[str, Deque[float]] = {}
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        window = self._latency.get(name)
+        if window is None:
+            window = self._latency[name] = deque(maxlen=LATENCY_WINDOW)
+        window.append(seconds)
+
+    def reset(self) -> None:
+        self.started = time.monotonic()
+        self.counters.clear()
+        self._latency.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        latency = {}
+        for name, window in self._latency.items():
+            vals = sorted(window)
+            latency[name] = {
+                "count": len(vals),
+                **{f"p{int(p * 100)}_ms": round(_percentile(vals, p) * 1000, 3) for p in (0.5, 0.95, 0.99)},
+            }
+        return {
+            "elapsed_sec": round(elapsed, 3),
+            "counters": dict(self.counters),
+            "per_sec": {name: round(count / elapsed, 3) for name, count in self.counters.items()},
+            "latency": latency,
+        }
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+NOTES_STORAGE_VERSION = 1
+
+# Characters of a task's notes carried inline in task payloads.
+NOTES_PREVIEW_CHARS = 120
+
+_UNSET: Any = object()
+
+
+def notes_preview(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= NOTES_PREVIEW_CHARS:
+        return text
+    return text[: NOTES_PREVIEW_CHARS - 1].rstrip() + "…"
+
+
+class NotesStore:
+    """Full task notes in their own store file, only read when first needed.
+
+    Changes are staged in a pending map so writers never wait for the file to
+    load; reads and saves merge the pending map over the loaded notes.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        self.store: Store = Store(hass, NOTES_STORAGE_VERSION, key)
+        self._notes: Optional[Dict[str, str]] = None
+        self._pending: Dict[str, Optional[str]] = {}
+        self._load_lock = asyncio.Lock()
+
+    async def _async_base(self) -> Dict[str, str]:
+        async with self._load_lock:
+            if self._notes is None:
+                data = await self.store.async_load() or {}
+                raw = data.get("notes", {})
+                self._notes = {
+                    str(tid): str(text) for tid, text in (raw.items() if isinstance(raw, dict) else ()) if text
+                }
+        return self._notes
+
+    async def async_load(self) -> None:
+        await self._async_base()
+
+    def peek(self, task_id: str) -> Optional[str]:
+        """Full notes if known without I/O, else None."""
+        if task_id in self._pending:
+            return self._pending[task_id] or ""
+        if self._notes is None:
+            return None
+        return self._notes.get(task_id, "")
+
+    async def async_get(self, task_id: str) -> str:
+        if task_id in self._pending:
+            return self._pending[task_id] or ""
+        return (await self._async_base()).get(task_id, "")
+
+    async def async_all(self) -> Dict[str, str]:
+        merged = dict(await self._async_base())
+        for tid, text in self._pending.items():
+            if text:
+                merged[tid] = text
+            else:
+                merged.pop(tid, None)
+        return merged
+
+    def stage(self, changes: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Apply changes in memory; returns what unstage() needs to undo them."""
+        previous = {tid: self._pending.get(tid, _UNSET) for tid in changes}
+        self._pending.update(changes)
+        return previous
+
+    def unstage(self, previous: Dict[str, Any]) -> None:
+        for tid, text in previous.items():
+            if text is _UNSET:
+                self._pending.pop(tid, None)
+            else:
+                self._pending[tid] = text
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    async def async_save(self) -> None:
+        pending = dict(self._pending)
+        merged = await self.async_all()
+        await self.store.async_save({"notes": merged})
+        self._notes = merged
+        # Keep anything staged while the write was in flight for the next save.
+        for tid, text in pending.items():
+            if self._pending.get(tid, _UNSET) is text:
+                del self._pending[tid]
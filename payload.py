@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .storage import Task, _dt_to_iso, utcnow
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return _dt_to_iso(dt)
+
+
+def days_left(due: datetime | None) -> int | None:
+    if not due:
+        return None
+    now = utcnow()
+    delta = due - now
+    total_seconds = delta.total_seconds()
+
+    # Round toward zero for overdue tasks, but avoid early "0d" for upcoming tasks.
+    if total_seconds >= 0:
+        return int(math.ceil(total_seconds / 86400))
+    return -int(math.ceil(abs(total_seconds) / 86400))
+
+
+def running_seconds(task: Any, now: datetime) -> int:
+    if task.status == "running" and task.started_at:
+        return max(0, int((now - task.started_at).total_seconds()))
+    return 0
+
+
+def sort_key(task: Dict[str, Any]):
+    # overdue first, then soonest due, then title
+    due = task.get("due")
+    if due:
+        try:
+            d = datetime.fromisoformat(due)
+            if d.tzinfo is None:
+                d = d.replace(tzinfo=timezone.utc)
+        except Exception:
+            d = None
+    else:
+        d = None
+    return (d is None, d or datetime.max.replace(tzinfo=timezone.utc), task.get("title", ""))
+
+
+def task_payload(t: Task, running_sec: Optional[int] = None) -> Dict[str, Any]:
+    """The task shape the board renders; live durations only when running_sec is given."""
+
+    item = {
+        "id": t.id,
+        "rev": t.rev,
+        "title": t.title,
+        "zone": t.zone or "Unsorted",
+        "freq_days": int(t.freq_days or 0),
+
+        "due": _iso(t.due),
+        "last_done": _iso(t.last_done),
+        "last_done_by": t.last_done_by,
+        "days_left": days_left(t.due),
+        "recurrence": t.recurrence.to_dict() if t.recurrence else None,
+
+        "status": t.status,
+        "locked_by": t.locked_by,
+        "started_at": _iso(t.started_at),
+
+        "accum_sec": int(t.accum_sec or 0),
+
+        "est_min": int(t.est_min or 0),
+        "avg_min": int(t.avg_min or 0),
+        "n": int(t.n or 0),
+        "stats": t.stats.summary() if t.stats else None,
+
+        "notes_preview": t.notes_preview,
+        "notes_len": t.notes_len,
+    }
+    if running_sec is not None:
+        item["running_sec"] = running_sec
+        item["total_sec"] = int(t.accum_sec or 0) + running_sec
+    return item
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional
+
+from .summary import estimated_minutes
+
+# Tasks without a schedule are ranked as if they repeated weekly.
+DEFAULT_PERIOD_DAYS = 7
+
+# How long a task is expected to take: its average, or its 90th percentile for
+# plans that should rarely overrun. Both fall back to est_min without history.
+ESTIMATE_MEAN = "mean"
+ESTIMATE_P90 = "p90"
+ESTIMATES = (ESTIMATE_MEAN, ESTIMATE_P90)
+
+
+@dataclass(frozen=True)
+class PlannedTask:
+    task: Any
+    minutes: int
+    days_overdue: float
+    severity: float
+
+
+@dataclass
+class Plan:
+    budget_min: int
+    tasks: List[PlannedTask]
+    planned_min: int = 0
+    # Candidates that were due but did not fit into what was left of the budget.
+    skipped: int = 0
+
+    @property
+    def remaining_min(self) -> int:
+        return self.budget_min - self.planned_min
+
+
+def period_days(task: Any) -> int:
+    if task.recurrence is not None:
+        return task.recurrence.period_days
+    return int(task.freq_days or 0) or DEFAULT_PERIOD_DAYS
+
+
+def task_minutes(task: Any, estimate: str = ESTIMATE_MEAN) -> int:
+    if estimate == ESTIMATE_P90 and task.stats is not None and task.stats.p90 is not None:
+        return int(math.ceil(task.stats.p90))
+    return estimated_minutes(task)
+
+
+def severity(task: Any, now: datetime) -> float:
+    """How late a task is relative to its own cycle; 1.0 means a whole cycle late.
+
+    Two days late on a daily task outranks two weeks late on a yearly one.
+    Tasks due later today score slightly below zero so overdue work goes first.
+    """
+    days_overdue = (now - task.due).total_seconds() / 86400
+    return days_overdue / period_days(task)
+
+
+def plan_session(
+    candidates: Iterable[Any],
+    budget_min: int,
+    *,
+    now: datetime,
+    due_before: datetime,
+    estimate: str = ESTIMATE_MEAN,
+) -> Plan:
+    """Pick due tasks for a session of budget_min minutes, most severe first.
+
+    Candidates due before due_before are ranked by severity and packed
+    first-fit: a task that does not fit is skipped and smaller, less severe
+    tasks may still fill the rest of the budget. O(n log n) in the candidates.
+    """
+
+    ranked: List[tuple[float, str, Any]] = []
+    for t in candidates:
+        if t.due is None or t.due >= due_before:
+            continue
+        ranked.append((-severity(t, now), t.id, t))
+    ranked.sort(key=lambda item: (item[0], item[1]))
+
+    plan = Plan(budget_min=budget_min, tasks=[])
+    remaining = budget_min
+    for neg_severity, _tid, t in ranked:
+        minutes = task_minutes(t, estimate)
+        if minutes > remaining:
+            plan.skipped += 1
+            continue
+        remaining -= minutes
+        plan.tasks.append(
+            PlannedTask(
+                task=t,
+                minutes=minutes,
+                days_overdue=(now - t.due).total_seconds() / 86400,
+                severity=-neg_severity,
+            )
+        )
+    plan.planned_min = budget_min - remaining
+    return plan
+
+
+def due_candidates(
+    db: Any, due_before: datetime, zones: Optional[Iterable[str]], user: Optional[str]
+) -> Iterator[Any]:
+    """Tasks due before due_before in the given zones that are not locked by someone else.
+
+    Walks the due index up to due_before, so tasks that are not due yet are
+    never visited.
+    """
+
+    wanted = set(zones or ())
+    for tid in db.by_due.ids_due_before(due_before):
+        t = db.tasks.get(tid)
+        if t is None or (wanted and t.zone not in wanted):
+            continue
+        if t.locked_by is not None and t.locked_by != user:
+            continue
+        yield t
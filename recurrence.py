@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+FREQ_DAILY = "daily"
+FREQ_WEEKLY = "weekly"
+FREQ_MONTHLY = "monthly"
+FREQ_YEARLY = "yearly"
+FREQS = (FREQ_DAILY, FREQ_WEEKLY, FREQ_MONTHLY, FREQ_YEARLY)
+
+# completion: the next occurrence is counted from when the task was last done.
+# fixed: occurrences follow a calendar anchored at `anchor` and never drift.
+MODE_COMPLETION = "completion"
+MODE_FIXED = "fixed"
+MODES = (MODE_COMPLETION, MODE_FIXED)
+
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+_UNIT_DAYS = {FREQ_DAILY: 1, FREQ_WEEKLY: 7, FREQ_MONTHLY: 31, FREQ_YEARLY: 366}
+
+# Rules whose constraints can never be met (e.g. a yearly date outside its own
+# season window) give up after this many years instead of looping forever.
+_HORIZON_YEARS = 8
+
+
+def _parse_weekday(val: Any) -> int:
+    if isinstance(val, str) and not val.strip().isdigit():
+        key = val.strip().lower()[:3]
+        if key not in WEEKDAY_NAMES:
+            raise ValueError(f"Unknown weekday: {val}")
+        return WEEKDAY_NAMES.index(key)
+    wd = int(val)
+    if not 0 <= wd <= 6:
+        raise ValueError(f"Weekday out of range (0=Mon..6=Sun): {val}")
+    return wd
+
+
+def _parse_month_day(val: Any) -> Tuple[int, int]:
+    try:
+        month_s, day_s = str(val).split("-")
+        month, day = int(month_s), int(day_s)
+    except ValueError as err:
+        raise ValueError(f"Expected MM-DD, got {val!r}") from err
+    if not 1 <= month <= 12 or not 1 <= day <= 31:
+        raise ValueError(f"Invalid month/day: {val!r}")
+    return month, day
+
+
+def _add_months(d: date, months: int) -> date:
+    idx = d.year * 12 + (d.month - 1) + months
+    year, month = divmod(idx, 12)
+    month += 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def _add_units(d: date, freq: str, count: int) -> date:
+    if count <= 0:
+        return d
+    if freq == FREQ_DAILY:
+        return d + timedelta(days=count)
+    if freq == FREQ_WEEKLY:
+        return d + timedelta(weeks=count)
+    if freq == FREQ_MONTHLY:
+        return _add_months(d, count)
+    return _add_months(d, 12 * count)
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """A parsed recurrence rule; immutable so it can be shared and cached."""
+
+    freq: str
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()
+    nth: Optional[int] = None  # 1..5, or -1 for the last weekday of the month
+    month_day: Optional[int] = None  # 1..31, or -1 for the last day of the month
+    month: Optional[int] = None  # yearly rules only
+    season: Optional[Tuple[int, int, int, int]] = None  # start month/day, end month/day
+    mode: str = MODE_COMPLETION
+    anchor: Optional[date] = None
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> "RecurrenceRule":
+        if not isinstance(d, dict):
+            raise ValueError("Recurrence must be a mapping")
+
+        freq = str(d.get("freq", "")).strip().lower()
+        if freq not in FREQS:
+            raise ValueError(f"freq must be one of {', '.join(FREQS)}")
+
+        interval = int(d.get("interval", 1) or 1)
+        if interval < 1:
+            raise ValueError("interval must be 1 or greater")
+
+        raw_weekdays = d.get("weekdays") or ()
+        if isinstance(raw_weekdays, (str, int)):
+            raw_weekdays = [raw_weekdays]
+        weekdays = tuple(sorted({_parse_weekday(wd) for wd in raw_weekdays}))
+
+        nth = d.get("nth")
+        if nth is not None:
+            nth = int(nth)
+            if nth not in (-1, 1, 2, 3, 4, 5):
+                raise ValueError("nth must be 1..5 or -1 (last)")
+            if freq not in (FREQ_MONTHLY, FREQ_YEARLY):
+                raise ValueError("nth is only valid for monthly or yearly rules")
+
+        month_day = d.get("month_day")
+        if month_day is not None:
+            month_day = int(month_day)
+            if month_day != -1 and not 1 <= month_day <= 31:
+                raise ValueError("month_day must be 1..31 or -1 (last)")
+            if nth is not None:
+                raise ValueError("Use either nth or month_day, not both")
+
+        month = d.get("month")
+        if month is not None:
+            month = int(month)
+            if not 1 <= month <= 12:
+                raise ValueError("month must be 1..12")
+            if freq != FREQ_YEARLY:
+                raise ValueError("month is only valid for yearly rules")
+
+        season = None
+        raw_season = d.get("season")
+        if raw_season:
+            if not isinstance(raw_season, dict):
+                raise ValueError("season must have start and end (MM-DD)")
+            season = _parse_month_day(raw_season.get("start")) + _parse_month_day(raw_season.get("end"))
+
+        mode = str(d.get("mode", MODE_COMPLETION) or MODE_COMPLETION).strip().lower()
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+        anchor = d.get("anchor")
+        if isinstance(anchor, datetime):
+            anchor = anchor.date()
+        elif anchor and not isinstance(anchor, date):
+            try:
+                anchor = date.fromisoformat(str(anchor)[:10])
+            except ValueError as err:
+                raise ValueError(f"anchor must be a date (YYYY-MM-DD), got {anchor!r}") from err
+        anchor = anchor or None
+
+        return RecurrenceRule(
+            freq=freq,
+            interval=interval,
+            weekdays=weekdays,
+            nth=nth,
+            month_day=month_day,
+            month=month,
+            season=season,
+            mode=mode,
+            anchor=anchor,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {"freq": self.freq, "interval": self.interval, "mode": self.mode}
+        if self.weekdays:
+            d["weekdays"] = [WEEKDAY_NAMES[wd] for wd in self.weekdays]
+        if self.nth is not None:
+            d["nth"] = self.nth
+        if self.month_day is not None:
+            d["month_day"] = self.month_day
+        if self.month is not None:
+            d["month"] = self.month
+        if self.season:
+            sm, sd, em, ed = self.season
+            d["season"] = {"start": f"{sm:02d}-{sd:02d}", "end": f"{em:02d}-{ed:02d}"}
+        if self.anchor:
+            d["anchor"] = self.anchor.isoformat()
+        return d
+
+    def with_anchor(self, anchor: date) -> "RecurrenceRule":
+        return replace(self, anchor=anchor)
+
+    @property
+    def period_days(self) -> int:
+        """Rough length of one cycle, for ranking; not used for scheduling."""
+        return _UNIT_DAYS[self.freq] * self.interval
+
+    def _in_season(self, d: date) -> bool:
+        if not self.season:
+            return True
+        sm, sd, em, ed = self.season
+        key = (d.month, d.day)
+        if (sm, sd) <= (em, ed):
+            return (sm, sd) <= key <= (em, ed)
+        # Window wraps around the new year (e.g. 11-01 .. 02-28).
+        return key >= (sm, sd) or key <= (em, ed)
+
+    def _days_in_month(self, year: int, month: int, anchor: date) -> List[date]:
+        last = calendar.monthrange(year, month)[1]
+
+        if self.nth is not None:
+            out = []
+            for wd in self.weekdays or (anchor.weekday(),):
+                first = (wd - date(year, month, 1).weekday()) % 7 + 1
+                if self.nth == -1:
+                    day = first + 7 * ((last - first) // 7)
+                else:
+                    day = first + 7 * (self.nth - 1)
+                    if day > last:
+                        continue
+                out.append(date(year, month, day))
+            out.sort()
+            return out
+
+        day = self.month_day or anchor.day
+        if day == -1 or day > last:
+            day = last
+        return [date(year, month, day)]
+
+    def _iter_dates(self, start: date, anchor: date, aligned: bool) -> Iterator[date]:
+        """Yield matching dates on or after start, in order.
+
+        When aligned, only periods a multiple of `interval` away from the
+        anchor's period are eligible (fixed schedules).
+        """
+
+        interval = self.interval
+
+        if self.freq == FREQ_DAILY:
+            d = start
+            step = 1
+            if aligned:
+                offset = (d - anchor).days % interval
+                if offset:
+                    d += timedelta(days=interval - offset)
+                step = interval
+            while True:
+                if not self.weekdays or d.weekday() in self.weekdays:
+                    yield d
+                d += timedelta(days=step)
+
+        elif self.freq == FREQ_WEEKLY:
+            weekdays = self.weekdays or (anchor.weekday(),)
+            week = start - timedelta(days=start.weekday())
+            anchor_week = anchor - timedelta(days=anchor.weekday())
+            while True:
+                if not aligned or ((week - anchor_week).days // 7) % interval == 0:
+                    for wd in weekdays:
+                        d = week + timedelta(days=wd)
+                        if d >= start:
+                            yield d
+                week += timedelta(weeks=1)
+
+        elif self.freq == FREQ_MONTHLY:
+            year, month = start.year, start.month
+            anchor_idx = anchor.year * 12 + anchor.month
+            while True:
+                if not aligned or (year * 12 + month - anchor_idx) % interval == 0:
+                    for d in self._days_in_month(year, month, anchor):
+                        if d >= start:
+                            yield d
+                month += 1
+                if month > 12:
+                    month = 1
+                    year += 1
+
+        else:
+            year = start.year
+            month = self.month or anchor.month
+            while True:
+                if not aligned or (year - anchor.year) % interval == 0:
+                    for d in self._days_in_month(year, month, anchor):
+                        if d >= start:
+                            yield d
+                year += 1
+
+    def next_date(self, last_done: Optional[date]) -> Optional[date]:
+        """Return the next local date this rule is due after last_done."""
+
+        if self.mode == MODE_FIXED:
+            anchor = self.anchor or last_done
+            if anchor is None:
+                return None
+            start = anchor if last_done is None else max(anchor, last_done + timedelta(days=1))
+            aligned = True
+        else:
+            if last_done is None:
+                return None
+            anchor = last_done
+            start = _add_units(last_done, self.freq, self.interval - 1) + timedelta(days=1)
+            aligned = False
+
+        horizon = start + timedelta(days=366 * _HORIZON_YEARS + _UNIT_DAYS[self.freq] * self.interval)
+        for d in self._iter_dates(start, anchor, aligned):
+            if d > horizon:
+                return None
+            if self._in_season(d):
+                return d
+        return None
+
+
+def parse_rule(val: Any) -> Optional[RecurrenceRule]:
+    if val is None or val == {}:
+        return None
+    if isinstance(val, RecurrenceRule):
+        return val
+    return RecurrenceRule.from_dict(val)
+
+
+def _local_midnight_utc(d: date, target_tz: tzinfo) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=target_tz).astimezone(timezone.utc)
+
+
+def compute_due(
+    last_done: datetime | None,
+    freq_days: int,
+    rule: RecurrenceRule | None,
+    *,
+    tzinfo: tzinfo | None,
+) -> datetime | None:
+    """Return the next due time at local midnight in the given timezone, as UTC."""
+
+    target_tz = tzinfo or timezone.utc
+
+    last_local: date | None = None
+    if last_done is not None:
+        base = last_done if last_done.tzinfo else last_done.replace(tzinfo=timezone.utc)
+        last_local = base.astimezone(target_tz).date()
+
+    if rule is None:
+        if last_local is None or freq_days <= 0:
+            return None
+        return _local_midnight_utc(last_local + timedelta(days=int(freq_days)), target_tz)
+
+    next_local = rule.next_date(last_local)
+    if next_local is None:
+        return None
+    return _local_midnight_utc(next_local, target_tz)
+
+
+def occurrences(task: Any, start: date, end: date, tzinfo: tzinfo | None) -> Iterator[date]:
+    """Yield the local dates a task falls on within [start, end), lazily.
+
+    The series begins at task.due; later dates assume each occurrence is done
+    on the day it falls due. Interval and fixed schedules jump straight to the
+    window instead of walking the series from the first due date.
+    """
+
+    if task.due is None:
+        return
+    first = task.due.astimezone(tzinfo or timezone.utc).date()
+    if first >= end:
+        return
+    if first >= start:
+        yield first
+
+    rule = task.recurrence
+    if rule is None:
+        step = int(task.freq_days or 0)
+        if step <= 0:
+            return
+        skip = max(1, -(-(start - first).days // step))
+        d = first + timedelta(days=skip * step)
+        while d < end:
+            yield d
+            d += timedelta(days=step)
+        return
+
+    if rule.mode == MODE_FIXED:
+        # Anchored calendars do not depend on completions: resume just before the window.
+        d = rule.next_date(max(first, start - timedelta(days=1)))
+    else:
+        d = rule.next_date(first)
+    while d is not None and d < end:
+        if d >= start:
+            yield d
+        d = rule.next_date(d)
+
+
+def due_key(task: Any, tzinfo: tzinfo | None) -> tuple:
+    """Return the schedule inputs a task's due date is derived from."""
+
+    return (task.recurrence, int(task.freq_days or 0), task.last_done, tzinfo)
+
+
+def has_schedule(task: Any) -> bool:
+    """Whether the task's due date is derived from a schedule rather than set by hand."""
+
+    return task.recurrence is not None or int(task.freq_days or 0) > 0
+
+
+def refresh_due(task: Any, tzinfo: tzinfo | None) -> bool:
+    """Recompute task.due if its schedule inputs changed; return True if it did.
+
+    The inputs are cached on the task so repeated calls (and bulk passes) skip
+    tasks whose rule, frequency, last_done and timezone are unchanged.
+    """
+
+    key = due_key(task, tzinfo)
+    if task.due_key == key:
+        return False
+    task.due_key = key
+    task.due = compute_due(task.last_done, int(task.freq_days or 0), task.recurrence, tzinfo=tzinfo)
+    return True
+
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Matches in the title rank above zone matches, which rank above notes.
+FIELD_WEIGHTS: Dict[str, float] = {"title": 3.0, "zone": 2.0, "notes": 1.0}
+
+# Prefix-only matches score lower than whole-word matches.
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: Any) -> List[str]:
+    return _TOKEN_RE.findall(str(text or "").casefold())
+
+
+class SearchIndex:
+    """Inverted index over task title, zone and notes, updated per task."""
+
+    def __init__(self) -> None:
+        # token -> {task_id: weight}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # Sorted vocabulary so prefix lookups are a bisect plus a short scan.
+        self._terms: List[str] = []
+        # task_id -> tokens currently indexed for it, for cheap removal.
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._doc_terms.clear()
+
+    def index(self, task: Any, notes: Optional[str] = None) -> None:
+        """(Re)index a task; notes is its full text if known, else its preview is used."""
+        self.remove(task.id)
+
+        texts = {
+            "title": task.title,
+            "zone": task.zone,
+            "notes": task.notes_preview if notes is None else notes,
+        }
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for tok in tokenize(texts[field]):
+                weights[tok] = weights.get(tok, 0.0) + weight
+
+        for tok, weight in weights.items():
+            postings = self._postings.get(tok)
+            if postings is None:
+                postings = self._postings[tok] = {}
+                bisect.insort(self._terms, tok)
+            postings[task.id] = weight
+
+        if weights:
+            self._doc_terms[task.id] = tuple(weights)
+
+    def remove(self, task_id: str) -> None:
+        for tok in self._doc_terms.pop(task_id, ()):
+            postings = self._postings.get(tok)
+            if postings is None:
+                continue
+            postings.pop(task_id, None)
+            if not postings:
+                del self._postings[tok]
+                i = bisect.bisect_left(self._terms, tok)
+                if i < len(self._terms) and self._terms[i] == tok:
+                    del self._terms[i]
+
+    def _expand(self, prefix: str) -> Iterator[str]:
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            yield self._terms[i]
+            i += 1
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Return (task_id, score) pairs matching every query token by prefix."""
+
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+
+        # Expand every token to its vocabulary terms and start from the most
+        # selective one, so later tokens only have to probe the survivors.
+        expanded = []
+        for tok in tokens:
+            terms = list(self._expand(tok))
+            if not terms:
+                return []
+            size = sum(len(self._postings[term]) for term in terms)
+            expanded.append((size, tok, terms))
+        expanded.sort()
+
+        scores: Dict[str, float] = {}
+        for pos, (size, tok, terms) in enumerate(expanded):
+            factors = [(self._postings[term], 1.0 if term == tok else PREFIX_FACTOR) for term in terms]
+
+            if pos == 0:
+                for postings, factor in factors:
+                    for tid, weight in postings.items():
+                        score = weight * factor
+                        if score > scores.get(tid, 0.0):
+                            scores[tid] = score
+                continue
+
+            if len(scores) * len(factors) < size:
+                term_scores: Dict[str, float] = {}
+                for tid in scores:
+                    best = 0.0
+                    for postings, factor in factors:
+                        weight = postings.get(tid)
+                        if weight is not None and weight * factor > best:
+                            best = weight * factor
+                    if best:
+                        term_scores[tid] = best
+            else:
+                term_scores = {}
+                for postings, factor in factors:
+                    for tid, weight in postings.items():
+                        if tid not in scores:
+                            continue
+                        score = weight * factor
+                        if score > term_scores.get(tid, 0.0):
+                            term_scores[tid] = score
+
+            scores = {tid: scores[tid] + sc for tid, sc in term_scores.items()}
+            if not scores:
+                return []
+
+        return heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], kv[0]))
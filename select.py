@@ -9,6 +9,13 @@ from .storage import MaintenanceDB
 
 
 class MaintenanceTaskSelect(SelectEntity):
+    """Picks the task the buttons act on, from a bounded window of options.
+
+    Listing every task id would write the whole database into the state
+    machine on each change; see TaskSelection for what the window holds.
+    maintenance.select_task reaches any task by id or search.
+    """
+
     _attr_has_entity_name = True
 
     def __init__(self, db: MaintenanceDB, name: str, unique_id: str) -> None:
@@ -17,22 +24,27 @@ class MaintenanceTaskSelect(SelectEntity):
         self._attr_unique_id = unique_id
         self._options: list[str] = []
         self._current: str | None = None
-        self._remove_listener = None
+        self._remove_listeners: list = []
 
     async def async_added_to_hass(self) -> None:
-        self._remove_listener = self._db.add_listener(self._refresh_from_db)
+        self._remove_listeners = [
+            self._db.add_listener(self._refresh_from_db),
+            self._db.selection.add_listener(self._refresh_from_db),
+        ]
         self._refresh_from_db()
-        self.async_write_ha_state()
 
     async def async_will_remove_from_hass(self) -> None:
-        if self._remove_listener:
-            self._remove_listener()
+        for remove in self._remove_listeners:
+            remove()
 
     def _refresh_from_db(self) -> None:
-        opts = sorted(self._db.tasks.keys())
+        opts = self._db.selection.options()
+        current = self._db.selection.current
+        # Most notifies leave the window alone; skip the state write then.
+        if opts == self._options and current == self._current:
+            return
         self._options = opts
-        if self._current not in opts:
-            self._current = opts[0] if opts else None
+        self._current = current
         self.async_write_ha_state()
 
     @property
@@ -44,10 +56,7 @@ class MaintenanceTaskSelect(SelectEntity):
         return self._current
 
     async def async_select_option(self, option: str) -> None:
-        if option not in self._options:
-            return
-        self._current = option
-        self.async_write_ha_state()
+        self._db.selection.select(option)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .storage import MaintenanceDB
+
+# Sizes of the parts of the option window; the select never lists more than their sum.
+DUE_SOON_OPTIONS = 20
+RECENT_OPTIONS = 10
+SEARCH_OPTIONS = 20
+
+
+class TaskSelection:
+    """The currently selected task plus a small window of options to pick from.
+
+    The window is the earliest-due tasks, the recently selected ones and the
+    last search results, so its size does not grow with the database. Each
+    rebuild is O(window): due order comes from the due index and every id is
+    checked with a dict lookup.
+    """
+
+    def __init__(self, db: "MaintenanceDB") -> None:
+        self._db = db
+        self.current: Optional[str] = None
+        self.recent: list[str] = []
+        self.search_results: list[str] = []
+        self._listeners: list[Callable[[], None]] = []
+
+    def add_listener(self, cb: Callable[[], None]) -> Callable[[], None]:
+        self._listeners.append(cb)
+
+        def remove() -> None:
+            try:
+                self._listeners.remove(cb)
+            except ValueError:
+                pass
+
+        return remove
+
+    def _changed(self) -> None:
+        for cb in list(self._listeners):
+            cb()
+
+    def select(self, task_id: str) -> bool:
+        """Select a task by id; False if there is no such task."""
+        if task_id not in self._db.tasks:
+            return False
+        self.current = task_id
+        if task_id in self.recent:
+            self.recent.remove(task_id)
+        self.recent.insert(0, task_id)
+        del self.recent[RECENT_OPTIONS:]
+        self._changed()
+        return True
+
+    def set_search_results(self, task_ids: Iterable[str]) -> None:
+        self.search_results = list(islice(task_ids, SEARCH_OPTIONS))
+        self._clamp()
+        self._changed()
+
+    def tasks_changed(self) -> None:
+        """Called by the database after tasks were loaded, added or deleted."""
+        tasks = self._db.tasks
+        self.recent = [tid for tid in self.recent if tid in tasks]
+        self.search_results = [tid for tid in self.search_results if tid in tasks]
+        if self.current not in tasks:
+            self.current = None
+        self._clamp()
+
+    def _clamp(self) -> None:
+        # Without a selection, the first option is selected.
+        if self.current is None:
+            self.current = next(iter(self.options()), None)
+
+    def options(self) -> list[str]:
+        """Current window: the selection, the last search, recent picks, then the earliest due."""
+        tasks = self._db.tasks
+        due_soon = self._db.by_due.first(DUE_SOON_OPTIONS)
+        if len(due_soon) < DUE_SOON_OPTIONS:
+            # Tasks without a due date are not in the due index; top up from the rest.
+            seen = set(due_soon)
+            due_soon += islice((tid for tid in tasks if tid not in seen), DUE_SOON_OPTIONS - len(due_soon))
+
+        head = [self.current] if self.current else []
+        return list(dict.fromkeys(head + self.search_results + self.recent + due_soon))
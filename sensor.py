@@ -1,47 +1,39 @@
 from __future__ import annotations
 
-import math
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime, timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
-from .storage import MaintenanceDB, _dt_to_iso, utcnow
-
-
-def _iso(dt: datetime | None) -> str | None:
-    return _dt_to_iso(dt)
-
-
-def _days_left(due: datetime | None) -> int | None:
-    if not due:
-        return None
-    now = utcnow()
-    delta = due - now
-    total_seconds = delta.total_seconds()
-
-    # Round toward zero for overdue tasks, but avoid early "0d" for upcoming tasks.
-    if total_seconds >= 0:
-        return int(math.ceil(total_seconds / 86400))
-    return -int(math.ceil(abs(total_seconds) / 86400))
-
-
-def _sort_key(task: Any):
-    # overdue first, then soonest due, then title
-    due = task.get("due")
-    if due:
-        try:
-            d = datetime.fromisoformat(due)
-            if d.tzinfo is None:
-                d = d.replace(tzinfo=timezone.utc)
-        except Exception:
-            d = None
-    else:
-        d = None
-    return (d is None, d or datetime.max.replace(tzinfo=timezone.utc), task.get("title", ""))
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import CONF_STATIC_PAYLOAD, DEFAULT_STATIC_PAYLOAD, DOMAIN
+from .payload import _iso, days_left, running_seconds, sort_key, task_payload
+from .storage import MaintenanceDB, utcnow
+from .summary import (
+    SUMMARY_BACKLOG_MIN,
+    SUMMARY_DUE_TODAY,
+    SUMMARY_OVERDUE,
+    SUMMARY_PAUSED,
+    SUMMARY_RUNNING,
+)
+
+# key, name suffix, unit, icon
+SUMMARY_SENSORS = (
+    (SUMMARY_OVERDUE, "Overdue", None, "mdi:alert-circle-outline"),
+    (SUMMARY_DUE_TODAY, "Due Today", None, "mdi:calendar-today"),
+    (SUMMARY_RUNNING, "Running", None, "mdi:play-circle-outline"),
+    (SUMMARY_PAUSED, "Paused", None, "mdi:pause-circle-outline"),
+    (SUMMARY_BACKLOG_MIN, "Backlog", UnitOfTime.MINUTES, "mdi:timer-sand"),
+)
+
+# How often the active timers sensor refreshes while at least one task is running.
+TIMER_TICK_INTERVAL = timedelta(seconds=15)
+
+
+def _static_payload(entry: ConfigEntry) -> bool:
+    return bool(entry.options.get(CONF_STATIC_PAYLOAD, DEFAULT_STATIC_PAYLOAD))
 
 
 class MaintenanceTasksSensor(SensorEntity):
@@ -49,8 +41,9 @@ class MaintenanceTasksSensor(SensorEntity):
 
     _attr_has_entity_name = True
 
-    def __init__(self, hass: HomeAssistant, db: MaintenanceDB, name: str, unique_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, db: MaintenanceDB, name: str, unique_id: str) -> None:
         self.hass = hass
+        self._entry = entry
         self._db = db
         self._attr_name = f"{name} Tasks"
         self._attr_unique_id = unique_id
@@ -73,118 +66,190 @@ class MaintenanceTasksSensor(SensorEntity):
         tasks = []
         zones = set()
 
-        now = utcnow()
+        # Live durations only concern running tasks, which the status index hands us directly.
+        static = _static_payload(self._entry)
+        running: dict[str, int] = {}
+        if not static:
+            now = utcnow()
+            running = {t.id: running_seconds(t, now) for t in self._db.tasks_with_status("running")}
 
         for t in self._db.tasks.values():
             zones.add(t.zone or "Unsorted")
+            tasks.append(task_payload(t, None if static else running.get(t.id, 0)))
 
-            running_sec = 0
-            if t.status == "running" and t.started_at:
-                running_sec = int((now - t.started_at).total_seconds())
-                if running_sec < 0:
-                    running_sec = 0
-
-            total_sec = int(t.accum_sec) + running_sec
-
-            tasks.append(
-                {
-                    "id": t.id,
-                    "title": t.title,
-                    "zone": t.zone or "Unsorted",
-                    "freq_days": int(t.freq_days or 0),
-
-                    "due": _iso(t.due),
-                    "last_done": _iso(t.last_done),
-                    "last_done_by": t.last_done_by,
-                    "days_left": _days_left(t.due),
-
-                    "status": t.status,
-                    "locked_by": t.locked_by,
-                    "started_at": _iso(t.started_at),
-
-                    "accum_sec": int(t.accum_sec or 0),
-                    "running_sec": running_sec,
-                    "total_sec": total_sec,
-
-                    "est_min": int(t.est_min or 0),
-                    "avg_min": int(t.avg_min or 0),
-                    "n": int(t.n or 0),
-
-                    "notes": t.notes or "",
-                }
-            )
-
-        tasks.sort(key=_sort_key)
-        return {"tasks": tasks, "zones": sorted(zones)}
+        tasks.sort(key=sort_key)
+        return {
+            "revision": self._db.revision,
+            "tasks": tasks,
+            "zones": sorted(zones),
+            "zone_stats": {zone: st.summary() for zone, st in sorted(self._db.zone_stats.items())},
+        }
 
 
 class MaintenanceSelectedTaskSensor(SensorEntity):
     _attr_has_entity_name = True
 
-    def __init__(self, hass: HomeAssistant, db: MaintenanceDB, name: str, unique_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, db: MaintenanceDB, name: str, unique_id: str) -> None:
         self.hass = hass
+        self._entry = entry
         self._db = db
         self._attr_name = f"{name} Selected Task"
         self._attr_unique_id = unique_id
-        self._remove_listener = None
-        self._task_select_eid: str | None = None
+        self._remove_listeners: list = []
 
     async def async_added_to_hass(self) -> None:
-        self._task_select_eid = next(
-            (st.entity_id for st in self.hass.states.async_all("select") if "maintenance_task" in st.entity_id),
-            None,
-        )
-        self._remove_listener = self._db.add_listener(self.async_write_ha_state)
+        self._remove_listeners = [
+            self._db.add_listener(self.async_write_ha_state),
+            self._db.selection.add_listener(self.async_write_ha_state),
+        ]
 
     async def async_will_remove_from_hass(self) -> None:
-        if self._remove_listener:
-            self._remove_listener()
+        for remove in self._remove_listeners:
+            remove()
 
     @property
     def native_value(self) -> str:
-        if not self._task_select_eid:
-            return "none"
-        return self.hass.states.get(self._task_select_eid).state
+        return self._db.selection.current or "none"
 
     @property
     def extra_state_attributes(self) -> dict:
-        if not self._task_select_eid:
+        tid = self._db.selection.current
+        if not tid:
             return {}
 
-        tid = self.hass.states.get(self._task_select_eid).state
         t = self._db.get(tid)
         if not t:
             return {"error": "unknown task"}
 
-        now = utcnow()
-        running_sec = 0
-        if t.status == "running" and t.started_at:
-            running_sec = int((now - t.started_at).total_seconds())
-            if running_sec < 0:
-                running_sec = 0
-
-        total_sec = int(t.accum_sec) + running_sec
-
-        return {
+        attrs = {
+            "revision": self._db.revision,
             "title": t.title,
             "zone": t.zone,
             "freq_days": t.freq_days,
             "due": _iso(t.due),
             "last_done": _iso(t.last_done),
             "last_done_by": t.last_done_by,
-            "days_left": _days_left(t.due),
+            "days_left": days_left(t.due),
+            "recurrence": t.recurrence.to_dict() if t.recurrence else None,
             "status": t.status,
             "locked_by": t.locked_by,
             "started_at": _iso(t.started_at),
             "accum_sec": int(t.accum_sec or 0),
-            "running_sec": running_sec,
-            "total_sec": total_sec,
             "est_min": t.est_min,
             "avg_min": t.avg_min,
             "n": t.n,
-            "notes": t.notes,
+            "stats": t.stats.summary() if t.stats else None,
+            "notes_preview": t.notes_preview,
+            "notes_len": t.notes_len,
+        }
+        if not _static_payload(self._entry):
+            running_sec = running_seconds(t, utcnow())
+            attrs["running_sec"] = running_sec
+            attrs["total_sec"] = int(t.accum_sec) + running_sec
+        return attrs
+
+
+class MaintenanceSummarySensor(SensorEntity):
+    """One counter from MaintenanceDB.summary; cheap to compute and to record."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        db: MaintenanceDB,
+        name: str,
+        unique_id: str,
+        key: str,
+        unit: str | None,
+        icon: str,
+    ) -> None:
+        self._db = db
+        self._key = key
+        self._attr_name = name
+        self._attr_unique_id = unique_id
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        if unit is not None:
+            self._attr_device_class = SensorDeviceClass.DURATION
+        self._remove_listener = None
+
+    async def async_added_to_hass(self) -> None:
+        self._remove_listener = self._db.add_listener(self.async_write_ha_state)
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._remove_listener:
+            self._remove_listener()
+
+    @property
+    def native_value(self) -> int:
+        return getattr(self._db.summary, self._key)
+
+
+class MaintenanceActiveTimersSensor(SensorEntity):
+    """Live elapsed time of running tasks, refreshed on a tick only while any are running.
+
+    Lets the large tasks payload stay static between mutations while still
+    offering a fresh duration to automations and cards that want one.
+    """
+
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-outline"
+    _unrecorded_attributes = frozenset({"timers"})
+
+    def __init__(self, db: MaintenanceDB, name: str, unique_id: str) -> None:
+        self._db = db
+        self._attr_name = f"{name} Active Timers"
+        self._attr_unique_id = unique_id
+        self._remove_listener = None
+        self._remove_tick = None
+
+    async def async_added_to_hass(self) -> None:
+        self._remove_listener = self._db.add_listener(self._async_db_changed)
+        self._sync_tick()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._remove_listener:
+            self._remove_listener()
+        if self._remove_tick:
+            self._remove_tick()
+            self._remove_tick = None
+
+    @callback
+    def _async_db_changed(self) -> None:
+        self._sync_tick()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        self.async_write_ha_state()
+
+    def _sync_tick(self) -> None:
+        running = bool(self._db.by_status.ids("running"))
+        if running and self._remove_tick is None:
+            self._remove_tick = async_track_time_interval(self.hass, self._async_tick, TIMER_TICK_INTERVAL)
+        elif not running and self._remove_tick is not None:
+            self._remove_tick()
+            self._remove_tick = None
+
+    def _timers(self) -> dict[str, int]:
+        now = utcnow()
+        return {
+            t.id: int(t.accum_sec or 0) + running_seconds(t, now)
+            for t in self._db.tasks_with_status("running")
         }
 
+    @property
+    def native_value(self) -> int:
+        return sum(self._timers().values())
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {"timers": self._timers()}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     db: MaintenanceDB = hass.data[DOMAIN][entry.entry_id]["db"]
@@ -192,8 +257,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     async_add_entities(
         [
-            MaintenanceTasksSensor(hass, db, name, f"{entry.entry_id}_tasks_sensor"),
-            MaintenanceSelectedTaskSensor(hass, db, name, f"{entry.entry_id}_selected_sensor"),
+            MaintenanceTasksSensor(hass, entry, db, name, f"{entry.entry_id}_tasks_sensor"),
+            MaintenanceSelectedTaskSensor(hass, entry, db, name, f"{entry.entry_id}_selected_sensor"),
+            MaintenanceActiveTimersSensor(db, name, f"{entry.entry_id}_active_timers_sensor"),
+        ]
+        + [
+            MaintenanceSummarySensor(db, f"{name} {label}", f"{entry.entry_id}_{key}_sensor", key, unit, icon)
+            for key, label, unit, icon in SUMMARY_SENSORS
         ]
     )
 
@@ -1,16 +1,50 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta, timezone
+import csv
+from collections.abc import Callable, Container
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from pathlib import Path
+import time
 import uuid
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
 from homeassistant.helpers import config_validation as cv
-from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
-from .storage import MaintenanceDB, Task, utcnow
+from .analytics import BUCKET_WEEK, BUCKETS, build_report
+from .const import (
+    DOMAIN,
+    EVENT_TASK_COMPLETED,
+    EVENT_TASK_CREATED,
+    EVENT_TASK_DELETED,
+    EVENT_TASK_PAUSED,
+    EVENT_TASK_STARTED,
+    EVENT_TASK_UPDATED,
+)
+from .events import changed_fields, fire_task_event
+from .payload import sort_key, task_payload
+from .planner import ESTIMATES, ESTIMATE_MEAN, due_candidates, plan_session
+from .recurrence import MODE_FIXED, RecurrenceRule, parse_rule, refresh_due
+from .selection import SEARCH_OPTIONS
+from .snapshots import MAX_SNAPSHOTS, Snapshot
+from .stats import DurationStats
+from .storage import MaintenanceDB, Task, _dt_to_iso, utcnow
+from .transfer import (
+    FORMATS,
+    TRANSFER_DIR,
+    TRANSFER_SUFFIXES,
+    TaskFileReader,
+    guess_format,
+    row_to_call_data,
+    write_tasks,
+)
+
+# Rows validated per executor round trip while importing.
+IMPORT_BATCH_SIZE = 500
+# Per-row errors returned to the caller; the total is always reported.
+IMPORT_MAX_ERRORS = 100
 
 
 def _ensure_aware(dt: datetime | None) -> datetime | None:
@@ -22,22 +56,28 @@ def _ensure_aware(dt: datetime | None) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
-def _compute_due(
-    last_done: datetime | None, freq_days: int, *, tzinfo: timezone | None
-) -> datetime | None:
-    """Return due at midnight in the given timezone, converted to UTC."""
+def _transfer_file(hass: HomeAssistant, path: str) -> Path:
+    """Resolve an import/export path, which must be a .csv or .json file under <config>/maintenance.
 
-    if last_done is None:
-        return None
-    if freq_days <= 0:
-        return None
+    Keeping transfers in their own directory means an export can never
+    overwrite configuration, secrets or .storage, and an import cannot read them.
+    """
 
-    base = _ensure_aware(last_done)
-    target_tz = tzinfo or timezone.utc
-    base_local = base.astimezone(target_tz)
-    due_date = base_local.date() + timedelta(days=int(freq_days))
-    due_local = datetime.combine(due_date, time.min, tzinfo=target_tz)
-    return due_local.astimezone(timezone.utc)
+    transfer_dir = Path(hass.config.config_dir).resolve() / TRANSFER_DIR
+    full = (Path(hass.config.config_dir) / path).resolve()
+    if transfer_dir not in full.parents:
+        raise HomeAssistantError(f"Path must be a file inside {transfer_dir}")
+    if full.suffix.lower() not in TRANSFER_SUFFIXES:
+        raise HomeAssistantError(f"File must end in {' or '.join(TRANSFER_SUFFIXES)}")
+    return full
+
+
+def _recurrence(val):
+    """Validate a recurrence mapping into a RecurrenceRule."""
+    try:
+        return parse_rule(val)
+    except (TypeError, ValueError) as err:
+        raise vol.Invalid(f"Invalid recurrence: {err}") from err
 
 
 ADD_TASK_SCHEMA = vol.Schema(
@@ -49,6 +89,7 @@ ADD_TASK_SCHEMA = vol.Schema(
         vol.Optional("est_min", default=0): vol.Coerce(int),
         vol.Optional("notes", default=""): cv.string,
         vol.Optional("last_done"): cv.datetime,
+        vol.Optional("recurrence"): vol.Any(None, _recurrence),
     },
     extra=vol.PREVENT_EXTRA,
 )
@@ -62,22 +103,33 @@ UPDATE_TASK_SCHEMA = vol.Schema(
         vol.Optional("est_min"): vol.Coerce(int),
         vol.Optional("notes"): cv.string,
         vol.Optional("last_done"): cv.datetime,
+        vol.Optional("recurrence"): vol.Any(None, _recurrence),
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
     },
     extra=vol.PREVENT_EXTRA,
 )
 
 DELETE_TASK_SCHEMA = vol.Schema(
-    {vol.Required("task_id"): cv.string},
+    {
+        vol.Required("task_id"): cv.string,
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    },
     extra=vol.PREVENT_EXTRA,
 )
 
 START_SCHEMA = vol.Schema(
-    {vol.Required("task_id"): cv.string},
+    {
+        vol.Required("task_id"): cv.string,
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    },
     extra=vol.PREVENT_EXTRA,
 )
 
 PAUSE_SCHEMA = vol.Schema(
-    {vol.Required("task_id"): cv.string},
+    {
+        vol.Required("task_id"): cv.string,
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    },
     extra=vol.PREVENT_EXTRA,
 )
 
@@ -86,19 +138,128 @@ COMPLETE_SCHEMA = vol.Schema(
         vol.Required("task_id"): cv.string,
         # Optional: allow overriding actual minutes spent on completion
         vol.Optional("actual_min"): vol.Coerce(int),
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
     },
     extra=vol.PREVENT_EXTRA,
 )
 
 RESET_SCHEMA = vol.Schema(
-    {vol.Required("task_id"): cv.string},
+    {
+        vol.Required("task_id"): cv.string,
+        vol.Optional("expected_revision"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    },
     extra=vol.PREVENT_EXTRA,
 )
 
+IMPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required("path"): cv.string,
+        vol.Optional("format"): vol.In(FORMATS),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
 
-async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
-    target_tz = dt_util.get_time_zone(hass.config.time_zone) or dt_util.DEFAULT_TIME_ZONE
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Required("path"): cv.string,
+        vol.Optional("format"): vol.In(FORMATS),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Required("query"): cv.string,
+        vol.Optional("limit", default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+ASSIGN_ZONES_SCHEMA = vol.Schema(
+    {
+        vol.Required("user"): cv.string,
+        vol.Required("zones"): vol.All(cv.ensure_list, [cv.string]),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+USER_TASKS_SCHEMA = vol.Schema(
+    {
+        # Defaults to the calling user.
+        vol.Optional("user"): cv.string,
+        vol.Optional("recent_days", default=7): vol.All(vol.Coerce(int), vol.Range(min=0, max=365)),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+PLAN_SESSION_SCHEMA = vol.Schema(
+    {
+        vol.Required("budget_min"): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 60)),
+        vol.Optional("zones"): vol.All(cv.ensure_list, [cv.string]),
+        # Tasks locked by anyone else are left out; defaults to the calling user.
+        vol.Optional("user"): cv.string,
+        vol.Optional("estimate", default=ESTIMATE_MEAN): vol.In(ESTIMATES),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+DURATION_STATS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("task_id"): cv.string,
+        vol.Optional("zone"): cv.string,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+ANALYTICS_SCHEMA = vol.Schema(
+    {
+        # Defaults to the 30 days up to end, which defaults to now.
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("bucket", default=BUCKET_WEEK): vol.In(BUCKETS),
+        vol.Optional("zone"): cv.string,
+        vol.Optional("user"): cv.string,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+SELECT_TASK_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive("task_id", "target"): cv.string,
+            vol.Exclusive("query", "target"): cv.string,
+        },
+        extra=vol.PREVENT_EXTRA,
+    ),
+    cv.has_at_least_one_key("task_id", "query"),
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): vol.All(cv.string, vol.Length(min=1, max=64)),
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+LIST_SNAPSHOTS_SCHEMA = vol.Schema({}, extra=vol.PREVENT_EXTRA)
 
+TASK_NOTES_SCHEMA = vol.Schema(
+    {
+        vol.Required("task_id"): cv.string,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+METRICS_SCHEMA = vol.Schema(
+    {
+        # Start a fresh measurement window after reading, e.g. between load test scenarios.
+        vol.Optional("reset", default=False): cv.boolean,
+    },
+    extra=vol.PREVENT_EXTRA,
+)
+
+
+async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
     def _norm(s: str) -> str:
         return " ".join(str(s or "").strip().split()).lower()
 
@@ -113,6 +274,54 @@ async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
                 return existing
         return None
 
+    def _admin_only(handler):
+        """The check async_register_admin_service applies; that helper cannot return a response."""
+
+        async def wrapper(call: ServiceCall):
+            if call.context.user_id:
+                user = await hass.auth.async_get_user(call.context.user_id)
+                if user is None:
+                    raise UnknownUser(context=call.context)
+                if not user.is_admin:
+                    raise Unauthorized(context=call.context)
+            return await handler(call)
+
+        return wrapper
+
+    def _lock_conflict(t: Task) -> HomeAssistantError:
+        db.metrics.inc("lock_conflicts")
+        return HomeAssistantError(f"Task is locked by {t.locked_by}")
+
+    def _check_revision(t: Task, data: dict) -> None:
+        """Compare-and-set: refuse the change if the task moved past the caller's copy."""
+        expected = data.get("expected_revision")
+        if expected is not None and expected != t.rev:
+            db.metrics.inc("revision_conflicts")
+            raise HomeAssistantError(f"Task {t.id} has changed (revision {t.rev}, expected {expected})")
+
+    def _timed(service: str, handler):
+        """Record call count, failures and latency of a service handler."""
+
+        async def wrapper(call: ServiceCall):
+            start = time.perf_counter()
+            try:
+                return await handler(call)
+            except Exception:
+                db.metrics.inc(f"{service}_errors")
+                raise
+            finally:
+                db.metrics.inc(f"{service}_calls")
+                db.metrics.observe(service, time.perf_counter() - start)
+
+        return wrapper
+
+    def _anchor_rule(rule: RecurrenceRule | None, last_done: datetime | None) -> RecurrenceRule | None:
+        """Fixed schedules without an explicit anchor start from last_done, else today."""
+        if rule is None or rule.mode != MODE_FIXED or rule.anchor is not None:
+            return rule
+        base = last_done or utcnow()
+        return rule.with_anchor(base.astimezone(db.time_zone).date())
+
     def _new_task_id() -> str:
         task_id = uuid.uuid4().hex
         while db.get(task_id):
@@ -136,8 +345,13 @@ async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
                 return user.name or user_id
         return "unknown"
 
-    async def handle_add_task(call: ServiceCall) -> None:
-        data = ADD_TASK_SCHEMA(dict(call.data))
+    def _build_new_task(
+        data: dict,
+        *,
+        find_existing: Callable[[tuple[str, str]], Task | None],
+        taken_ids: Container[str] = (),
+    ) -> Task:
+        """Create a Task from validated add_task data, enforcing title/zone uniqueness."""
 
         title = data["title"].strip()
         if not title:
@@ -145,19 +359,18 @@ async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
 
         zone = data["zone"].strip() or "Unsorted"
         key = _task_key(zone, title)
-        existing = _find_by_key(key)
+        existing = find_existing(key)
         if existing:
             raise HomeAssistantError(f"A task already exists: [{existing.zone}] {existing.title}")
 
         task_id = (data.get("task_id") or "").strip() or _new_task_id()
-        if db.get(task_id):
+        while db.get(task_id) or task_id in taken_ids:
             task_id = _new_task_id()
 
         freq_days = int(data.get("freq_days", 0))
         est_min = int(data.get("est_min", 0))
 
         last_done = _ensure_aware(data.get("last_done"))
-        due = _compute_due(last_done, freq_days, tzinfo=target_tz)
 
         t = Task(
             id=task_id,
@@ -171,127 +384,160 @@ async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
             locked_by=None,
             started_at=None,
             accum_sec=0,
-            notes=data.get("notes", "") or "",
             last_done=last_done,
-            due=due,
+            recurrence=_anchor_rule(data.get("recurrence"), last_done),
         )
+        refresh_due(t, db.time_zone)
+        return t
 
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+    async def handle_add_task(call: ServiceCall) -> None:
+        data = ADD_TASK_SCHEMA(dict(call.data))
+        user = await _resolve_user(call)
+
+        async with db.transaction() as tx:
+            t = _build_new_task(data, find_existing=_find_by_key)
+            if data.get("notes"):
+                tx.set_notes(t, data["notes"])
+            tx.upsert(t)
+
+        fire_task_event(hass, EVENT_TASK_CREATED, t.id, user=user, context=call.context, title=t.title, zone=t.zone)
 
     async def handle_update_task(call: ServiceCall) -> None:
         data = UPDATE_TASK_SCHEMA(dict(call.data))
         task_id = data["task_id"]
         user = await _resolve_user(call)
 
-        t = db.get(task_id)
-        if not t:
-            raise HomeAssistantError(f"Unknown task: {task_id}")
-
-        if t.locked_by is not None and t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
-
-        next_title = data["title"].strip() if "title" in data else t.title
-        if not next_title:
-            raise HomeAssistantError("Title cannot be empty")
-        next_zone_raw = data["zone"] if "zone" in data else t.zone
-        next_zone = next_zone_raw.strip() or "Unsorted"
-        next_key = _task_key(next_zone, next_title)
-        existing = _find_by_key(next_key, exclude_id=t.id)
-        if existing:
-            raise HomeAssistantError(f"A task already exists: [{existing.zone}] {existing.title}")
-
-        # Apply updates
-        if "title" in data:
-            t.title = data["title"].strip()
-        if "zone" in data:
-            t.zone = data["zone"].strip() or "Unsorted"
-        if "freq_days" in data:
-            t.freq_days = int(data["freq_days"])
-        if "est_min" in data:
-            t.est_min = int(data["est_min"])
-        if "notes" in data:
-            t.notes = data["notes"] or ""
-
-        if "last_done" in data:
-            t.last_done = _ensure_aware(data.get("last_done"))
-            t.last_done_by = user
-
-        t.due = _compute_due(t.last_done, int(t.freq_days or 0), tzinfo=target_tz)
-
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            before = db.get(task_id)
+            _check_revision(t, data)
+
+            if t.locked_by is not None and t.locked_by != user:
+                raise _lock_conflict(t)
+
+            next_title = data["title"].strip() if "title" in data else t.title
+            if not next_title:
+                raise HomeAssistantError("Title cannot be empty")
+            next_zone_raw = data["zone"] if "zone" in data else t.zone
+            next_zone = next_zone_raw.strip() or "Unsorted"
+            next_key = _task_key(next_zone, next_title)
+            existing = _find_by_key(next_key, exclude_id=t.id)
+            if existing:
+                raise HomeAssistantError(f"A task already exists: [{existing.zone}] {existing.title}")
+
+            # Apply updates
+            if "title" in data:
+                t.title = data["title"].strip()
+            if "zone" in data:
+                t.zone = data["zone"].strip() or "Unsorted"
+            if "freq_days" in data:
+                t.freq_days = int(data["freq_days"])
+            if "est_min" in data:
+                t.est_min = int(data["est_min"])
+            if "notes" in data:
+                tx.set_notes(t, data["notes"] or "")
+
+            if "last_done" in data:
+                t.last_done = _ensure_aware(data.get("last_done"))
+                t.last_done_by = user
+
+            if "recurrence" in data:
+                t.recurrence = _anchor_rule(data["recurrence"], t.last_done)
+
+            refresh_due(t, db.time_zone)
+            tx.upsert(t)
+
+        changed = changed_fields(before, t)
+        if changed:
+            fire_task_event(hass, EVENT_TASK_UPDATED, t.id, user=user, context=call.context, changed=changed)
 
     async def handle_delete_task(call: ServiceCall) -> None:
         data = DELETE_TASK_SCHEMA(dict(call.data))
         task_id = data["task_id"]
         user = await _resolve_user(call)
 
-        if not db.get(task_id):
-            raise HomeAssistantError(f"Unknown task: {task_id}")
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            _check_revision(t, data)
+
+            if t.locked_by is not None and t.locked_by != user:
+                raise _lock_conflict(t)
 
-        t = db.get(task_id)
-        if t and t.locked_by is not None and t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
+            tx.delete(task_id)
 
-        db.delete(task_id)
-        await db.async_save()
-        await db.notify()
+        fire_task_event(hass, EVENT_TASK_DELETED, t.id, user=user, context=call.context, title=t.title, zone=t.zone)
 
     async def handle_start_task(call: ServiceCall) -> None:
         data = START_SCHEMA(dict(call.data))
         task_id = data["task_id"]
         user = await _resolve_user(call)
 
-        t = db.get(task_id)
-        if not t:
-            raise HomeAssistantError(f"Unknown task: {task_id}")
-
-        # Lock rules
-        if t.locked_by is not None and t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
-
-        now = utcnow()
-
-        # If unlocked, take the lock; if already locked, it must be this user
-        if t.locked_by is None:
-            t.locked_by = user
-
-        # Already running: keep prior start to preserve elapsed time
-        if t.status == "running" and t.started_at:
-            t.started_at = _ensure_aware(t.started_at)
-        else:
-            t.status = "running"
-            t.started_at = now
-
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            _check_revision(t, data)
+
+            # Lock rules
+            if t.locked_by is not None and t.locked_by != user:
+                raise _lock_conflict(t)
+
+            now = utcnow()
+
+            # If unlocked, take the lock; if already locked, it must be this user
+            if t.locked_by is None:
+                t.locked_by = user
+
+            # Already running: keep prior start to preserve elapsed time
+            was_running = t.status == "running" and t.started_at
+            resumed = t.status == "paused"
+            if was_running:
+                t.started_at = _ensure_aware(t.started_at)
+            else:
+                t.status = "running"
+                t.started_at = now
+
+            tx.upsert(t)
+
+        if not was_running:
+            fire_task_event(
+                hass,
+                EVENT_TASK_STARTED,
+                t.id,
+                user=user,
+                context=call.context,
+                started_at=_dt_to_iso(t.started_at),
+                resumed=resumed,
+            )
 
     async def handle_pause_task(call: ServiceCall) -> None:
         data = PAUSE_SCHEMA(dict(call.data))
         task_id = data["task_id"]
         user = await _resolve_user(call)
 
-        t = db.get(task_id)
-        if not t:
-            raise HomeAssistantError(f"Unknown task: {task_id}")
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            _check_revision(t, data)
 
-        if t.locked_by is None or t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
+            if t.locked_by is None or t.locked_by != user:
+                raise _lock_conflict(t)
 
-        now = utcnow()
-        elapsed = _elapsed_seconds(t.started_at, now)
+            now = utcnow()
+            elapsed = _elapsed_seconds(t.started_at, now)
 
-        t.accum_sec = int(t.accum_sec or 0) + elapsed
-        t.started_at = None
-        t.status = "paused"
+            t.accum_sec = int(t.accum_sec or 0) + elapsed
+            t.started_at = None
+            t.status = "paused"
 
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+            tx.upsert(t)
+
+        fire_task_event(hass, EVENT_TASK_PAUSED, t.id, user=user, context=call.context, accum_sec=t.accum_sec)
 
     async def handle_complete_task(call: ServiceCall) -> None:
         data = COMPLETE_SCHEMA(dict(call.data))
@@ -299,86 +545,552 @@ async def async_setup_services(hass: HomeAssistant, db: MaintenanceDB) -> None:
         user = await _resolve_user(call)
         actual_min = data.get("actual_min")
 
-        t = db.get(task_id)
-        if not t:
-            raise HomeAssistantError(f"Unknown task: {task_id}")
-
-        # Respect lock if someone else holds it
-        if t.locked_by is not None and t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
-
-        now = utcnow()
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            _check_revision(t, data)
+
+            # Respect lock if someone else holds it
+            if t.locked_by is not None and t.locked_by != user:
+                raise _lock_conflict(t)
+
+            now = utcnow()
+
+            # If running, fold running time into accum before completing
+            if t.status == "running" and t.started_at:
+                elapsed = _elapsed_seconds(t.started_at, now)
+                t.accum_sec = int(t.accum_sec or 0) + elapsed
+                t.started_at = None
+
+            # Determine minutes spent for stats, unrounded so the mean does not drift
+            if actual_min is not None:
+                spent_min = float(max(0, int(actual_min)))
+            else:
+                spent_min = max(0, int(t.accum_sec or 0)) / 60
+
+            # Tasks completed before stats existed continue from their running average
+            stats = t.stats or DurationStats.from_legacy(int(t.avg_min or 0), int(t.n or 0))
+            t.stats = stats.add(spent_min)
+            t.n = t.stats.n
+            t.avg_min = int(round(t.stats.mean))
+            tx.record_zone_duration(t.zone, spent_min)
+            tx.record_completion(t, user, spent_min, now, t.due)
+
+            # Completion sets last_done and reschedules due from completion time (your requirement)
+            t.last_done = now
+            t.last_done_by = user
+            refresh_due(t, db.time_zone)
 
-        # If running, fold running time into accum before completing
-        if t.status == "running" and t.started_at:
-            elapsed = _elapsed_seconds(t.started_at, now)
-            t.accum_sec = int(t.accum_sec or 0) + elapsed
+            # Clear runtime state
+            t.locked_by = None
             t.started_at = None
-
-        # Determine minutes spent for stats
-        spent_min = None
-        if actual_min is not None:
-            spent_min = max(0, int(actual_min))
-        else:
-            spent_min = max(0, int((int(t.accum_sec or 0)) // 60))
-
-        # Update avg_min (simple running average)
-        prev_n = int(t.n or 0)
-        prev_avg = int(t.avg_min or 0)
-        new_n = prev_n + 1
-        if new_n <= 0:
-            new_avg = spent_min
-        else:
-            new_avg = int(round((prev_avg * prev_n + spent_min) / new_n))
-
-        t.n = new_n
-        t.avg_min = new_avg
-
-        # Completion sets last_done and reschedules due from completion time (your requirement)
-        t.last_done = now
-        t.last_done_by = user
-        t.due = _compute_due(now, int(t.freq_days or 0), tzinfo=target_tz)
-
-        # Clear runtime state
-        t.locked_by = None
-        t.started_at = None
-        t.accum_sec = 0
-        t.status = "idle"
-
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+            t.accum_sec = 0
+            t.status = "idle"
+
+            tx.upsert(t)
+
+        fire_task_event(
+            hass,
+            EVENT_TASK_COMPLETED,
+            t.id,
+            user=user,
+            context=call.context,
+            minutes=round(spent_min, 1),
+            last_done=_dt_to_iso(t.last_done),
+            due=_dt_to_iso(t.due),
+        )
 
     async def handle_reset_task(call: ServiceCall) -> None:
         data = RESET_SCHEMA(dict(call.data))
         task_id = data["task_id"]
         user = await _resolve_user(call)
 
-        t = db.get(task_id)
-        if not t:
-            raise HomeAssistantError(f"Unknown task: {task_id}")
-
-        if t.locked_by is not None and t.locked_by != user:
-            raise HomeAssistantError(f"Task is locked by {t.locked_by}")
+        async with db.lock(task_id), db.transaction() as tx:
+            t = tx.get(task_id)
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {task_id}")
+            before = db.get(task_id)
+            _check_revision(t, data)
 
-        t.n = 0
-        t.avg_min = int(t.est_min or 0)
-        t.accum_sec = 0
-        t.started_at = None
-        t.status = "idle"
-        t.locked_by = None
-        t.due = _compute_due(t.last_done, int(t.freq_days or 0), tzinfo=target_tz)
+            if t.locked_by is not None and t.locked_by != user:
+                raise _lock_conflict(t)
 
-        db.upsert(t)
-        await db.async_save()
-        await db.notify()
+            t.n = 0
+            t.avg_min = int(t.est_min or 0)
+            t.stats = None
+            t.accum_sec = 0
+            t.started_at = None
+            t.status = "idle"
+            t.locked_by = None
+            t.due_key = None  # force a fresh due date even if the schedule inputs are unchanged
+            refresh_due(t, db.time_zone)
+
+            tx.upsert(t)
+
+        changed = changed_fields(before, t)
+        if changed:
+            fire_task_event(hass, EVENT_TASK_UPDATED, t.id, user=user, context=call.context, changed=changed)
+
+    async def handle_import_tasks(call: ServiceCall) -> ServiceResponse:
+        data = IMPORT_SCHEMA(dict(call.data))
+        path = _transfer_file(hass, data["path"])
+        reader = TaskFileReader(path, data.get("format") or guess_format(path))
+
+        # Look up duplicates through one key map instead of scanning per row.
+        read_revision = db.revision
+        by_key: dict[tuple[str, str], Task] = {_task_key(t.zone, t.title): t for t in db.tasks.values()}
+        staged: dict[str, Task] = {}
+        staged_notes: dict[str, str] = {}
+        staged_rows: dict[str, int] = {}
+        errors: list[dict] = []
+        error_count = 0
+
+        def row_error(row_no: int, message: str) -> None:
+            nonlocal error_count
+            error_count += 1
+            if len(errors) < IMPORT_MAX_ERRORS:
+                errors.append({"row": row_no, "error": message})
+
+        try:
+            await hass.async_add_executor_job(reader.open)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot read {path}: {err}") from err
+
+        try:
+            while True:
+                try:
+                    batch = await hass.async_add_executor_job(reader.read_batch, IMPORT_BATCH_SIZE)
+                except (OSError, ValueError, csv.Error) as err:
+                    raise HomeAssistantError(f"Cannot read {path}: {err}") from err
+                if not batch:
+                    break
+
+                for row_no, row in batch:
+                    try:
+                        if not isinstance(row, dict):
+                            raise HomeAssistantError("Row is not an object")
+                        row_data = ADD_TASK_SCHEMA(row_to_call_data(row))
+                        t = _build_new_task(row_data, find_existing=by_key.get, taken_ids=staged)
+                    except (vol.Invalid, HomeAssistantError, TypeError, ValueError) as err:
+                        row_error(row_no, str(err))
+                        continue
+
+                    staged[t.id] = t
+                    staged_rows[t.id] = row_no
+                    if row_data.get("notes"):
+                        staged_notes[t.id] = row_data["notes"]
+                    by_key[_task_key(t.zone, t.title)] = t
+        finally:
+            await hass.async_add_executor_job(reader.close)
+
+        async with db.lock(*staged), db.transaction() as tx:
+            # The checks above ran while reading; tasks added since then win and
+            # the rows that now clash with them are reported instead of written.
+            if db.revision != read_revision:
+                current_keys = {_task_key(t.zone, t.title) for t in db.tasks.values()}
+                for t in list(staged.values()):
+                    if db.get(t.id) is not None:
+                        row_error(staged_rows[t.id], f"Task id already exists: {t.id}")
+                    elif _task_key(t.zone, t.title) in current_keys:
+                        row_error(staged_rows[t.id], f"A task already exists: [{t.zone}] {t.title}")
+                    else:
+                        continue
+                    del staged[t.id]
+            for t in staged.values():
+                if t.id in staged_notes:
+                    tx.set_notes(t, staged_notes[t.id])
+                tx.upsert(t)
 
-    hass.services.async_register(DOMAIN, "add_task", handle_add_task, schema=ADD_TASK_SCHEMA)
-    hass.services.async_register(DOMAIN, "update_task", handle_update_task, schema=UPDATE_TASK_SCHEMA)
-    hass.services.async_register(DOMAIN, "delete_task", handle_delete_task, schema=DELETE_TASK_SCHEMA)
+        user = await _resolve_user(call)
+        for t in staged.values():
+            fire_task_event(hass, EVENT_TASK_CREATED, t.id, user=user, context=call.context, title=t.title, zone=t.zone)
+
+        return {
+            "imported": len(staged),
+            "error_count": error_count,
+            "errors": errors,
+            "revision": db.revision,
+        }
+
+    async def handle_export_tasks(call: ServiceCall) -> ServiceResponse:
+        data = EXPORT_SCHEMA(dict(call.data))
+        path = _transfer_file(hass, data["path"])
+        fmt = data.get("format") or guess_format(path)
+
+        tasks = list(db.tasks.values())
+        notes = await db.notes.async_all()
+        try:
+            await hass.async_add_executor_job(partial(path.parent.mkdir, parents=True, exist_ok=True))
+            count = await hass.async_add_executor_job(write_tasks, path, fmt, tasks, notes)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot write {path}: {err}") from err
+
+        return {"exported": count, "path": str(path), "revision": db.revision}
+
+    async def handle_search_tasks(call: ServiceCall) -> ServiceResponse:
+        data = SEARCH_SCHEMA(dict(call.data))
+        # Finishes a deferred index build, loading full notes so they are searchable.
+        await db.async_warm()
+
+        results = []
+        for t, score in db.search(data["query"], data["limit"]):
+            results.append(
+                {
+                    "id": t.id,
+                    "title": t.title,
+                    "zone": t.zone,
+                    "status": t.status,
+                    "due": _dt_to_iso(t.due),
+                    "score": round(score, 3),
+                }
+            )
+        return {"revision": db.revision, "tasks": results}
+
+    async def handle_assign_zones(call: ServiceCall) -> None:
+        data = ASSIGN_ZONES_SCHEMA(dict(call.data))
+        user = data["user"].strip()
+        if not user:
+            raise HomeAssistantError("User cannot be empty")
+        zones = [z.strip() for z in data["zones"] if z.strip()]
+        await db.async_set_user_zones(user, zones)
+
+    async def handle_get_user_tasks(call: ServiceCall) -> ServiceResponse:
+        data = USER_TASKS_SCHEMA(dict(call.data))
+        user = (data.get("user") or "").strip() or await _resolve_user(call)
+        done_since = utcnow() - timedelta(days=data["recent_days"])
+
+        tasks = []
+        for tid, reasons in db.user_slice(user, done_since=done_since).items():
+            t = db.get(tid)
+            if t is None:
+                continue
+            item = task_payload(t)
+            item["match"] = reasons
+            tasks.append(item)
+        tasks.sort(key=sort_key)
+
+        return {
+            "revision": db.revision,
+            "user": user,
+            "zones": db.user_zones.get(user, []),
+            "tasks": tasks,
+        }
+
+    async def handle_plan_session(call: ServiceCall) -> ServiceResponse:
+        data = PLAN_SESSION_SCHEMA(dict(call.data))
+        user = (data.get("user") or "").strip() or await _resolve_user(call)
+        zones = [z.strip() for z in data.get("zones", []) if z.strip()]
+
+        _, tomorrow_start = db.local_day_bounds()
+        plan = plan_session(
+            due_candidates(db, tomorrow_start, zones, user),
+            data["budget_min"],
+            now=utcnow(),
+            due_before=tomorrow_start,
+            estimate=data["estimate"],
+        )
 
-    hass.services.async_register(DOMAIN, "start_task", handle_start_task, schema=START_SCHEMA)
-    hass.services.async_register(DOMAIN, "pause_task", handle_pause_task, schema=PAUSE_SCHEMA)
-    hass.services.async_register(DOMAIN, "complete_task", handle_complete_task, schema=COMPLETE_SCHEMA)
-    hass.services.async_register(DOMAIN, "reset_task", handle_reset_task, schema=RESET_SCHEMA)
+        return {
+            "revision": db.revision,
+            "user": user,
+            "budget_min": plan.budget_min,
+            "planned_min": plan.planned_min,
+            "remaining_min": plan.remaining_min,
+            "skipped": plan.skipped,
+            "tasks": [
+                {
+                    "id": p.task.id,
+                    "title": p.task.title,
+                    "zone": p.task.zone,
+                    "due": _dt_to_iso(p.task.due),
+                    "minutes": p.minutes,
+                    "days_overdue": round(p.days_overdue, 1),
+                    "severity": round(p.severity, 3),
+                }
+                for p in plan.tasks
+            ],
+        }
+
+    async def handle_duration_stats(call: ServiceCall) -> ServiceResponse:
+        data = DURATION_STATS_SCHEMA(dict(call.data))
+
+        tasks: dict[str, dict] = {}
+        if "task_id" in data:
+            t = db.get(data["task_id"])
+            if not t:
+                raise HomeAssistantError(f"Unknown task: {data['task_id']}")
+            tasks[t.id] = (t.stats or DurationStats.from_legacy(t.avg_min, t.n)).summary()
 
+        if "zone" in data:
+            zone_stats = db.zone_stats.get(data["zone"])
+            zones = {data["zone"]: zone_stats.summary() if zone_stats else DurationStats().summary()}
+        elif "task_id" in data:
+            zones = {}
+        else:
+            zones = {zone: st.summary() for zone, st in sorted(db.zone_stats.items())}
+
+        return {"revision": db.revision, "tasks": tasks, "zones": zones}
+
+    async def handle_analytics_report(call: ServiceCall) -> ServiceResponse:
+        data = ANALYTICS_SCHEMA(dict(call.data))
+        end = _ensure_aware(data.get("end")) or utcnow()
+        start = _ensure_aware(data.get("start")) or end - timedelta(days=30)
+        if start >= end:
+            raise HomeAssistantError("start must be before end")
+
+        await db.analytics.async_load()
+        # Copy the columns on the loop; aggregation then runs without touching live state.
+        snapshot = db.analytics.snapshot()
+        report = await hass.async_add_executor_job(
+            partial(
+                build_report,
+                snapshot,
+                start,
+                end,
+                tz=db.time_zone,
+                bucket=data["bucket"],
+                zone=data.get("zone"),
+                user=data.get("user"),
+            )
+        )
+        return {"recorded": len(snapshot.columns["ts"]), **report}
+
+    async def handle_select_task(call: ServiceCall) -> ServiceResponse:
+        data = SELECT_TASK_SCHEMA(dict(call.data))
+
+        if "task_id" in data:
+            if not db.selection.select(data["task_id"]):
+                raise HomeAssistantError(f"Unknown task: {data['task_id']}")
+            return {"task_id": data["task_id"], "matches": [data["task_id"]]}
+
+        await db.async_warm()
+        matches = [t.id for t, _ in db.search(data["query"], SEARCH_OPTIONS)]
+        if not matches:
+            raise HomeAssistantError(f"No task matches: {data['query']}")
+        # The other matches join the select's options for picking from there.
+        db.selection.set_search_results(matches)
+        db.selection.select(matches[0])
+        return {"task_id": matches[0], "matches": matches}
+
+    def _snapshot(name: str) -> Snapshot:
+        snap = db.snapshots.get(name)
+        if snap is None:
+            raise HomeAssistantError(f"Unknown snapshot: {name}")
+        return snap
+
+    async def handle_create_snapshot(call: ServiceCall) -> None:
+        data = SNAPSHOT_SCHEMA(dict(call.data))
+        name = data["name"].strip()
+        if name in db.snapshots:
+            raise HomeAssistantError(f"A snapshot named {name} already exists")
+        if len(db.snapshots) >= MAX_SNAPSHOTS:
+            raise HomeAssistantError(f"At most {MAX_SNAPSHOTS} snapshots can be kept; delete one first")
+        await db.async_create_snapshot(name)
+
+    async def handle_delete_snapshot(call: ServiceCall) -> None:
+        data = SNAPSHOT_SCHEMA(dict(call.data))
+        await db.async_delete_snapshot(_snapshot(data["name"].strip()).name)
+
+    async def handle_list_snapshots(call: ServiceCall) -> ServiceResponse:
+        LIST_SNAPSHOTS_SCHEMA(dict(call.data))
+        return {
+            "revision": db.revision,
+            "snapshots": [
+                {
+                    "name": snap.name,
+                    "created_at": _dt_to_iso(snap.created_at),
+                    "revision": snap.revision,
+                    "changed_tasks": len(db.snapshot_changes(snap)),
+                }
+                for snap in sorted(db.snapshots.values(), key=lambda s: s.created_at)
+            ],
+        }
+
+    async def handle_diff_snapshot(call: ServiceCall) -> ServiceResponse:
+        data = SNAPSHOT_SCHEMA(dict(call.data))
+        snap = _snapshot(data["name"].strip())
+
+        created, deleted, changed = [], [], []
+        for tid in db.snapshot_changes(snap):
+            before, current = snap.tasks[tid], db.get(tid)
+            if before is None:
+                created.append({"id": tid, "title": current.title, "zone": current.zone})
+            elif current is None:
+                deleted.append({"id": tid, "title": before.title, "zone": before.zone})
+            else:
+                # Values as of the snapshot, i.e. what restore_snapshot would write back.
+                old = before.to_dict()
+                old["stats"] = before.stats.summary() if before.stats else None
+                fields = changed_fields(before, current)
+                changed.append(
+                    {
+                        "id": tid,
+                        "title": current.title,
+                        "zone": current.zone,
+                        "fields": {key: {"from": old.get(key), "to": value} for key, value in fields.items()},
+                        "notes_changed": tid in snap.notes and (db.notes.peek(tid) or "") != snap.notes[tid],
+                    }
+                )
+
+        return {
+            "name": snap.name,
+            "revision": db.revision,
+            "created": created,
+            "deleted": deleted,
+            "changed": changed,
+        }
+
+    async def handle_restore_snapshot(call: ServiceCall) -> ServiceResponse:
+        data = SNAPSHOT_SCHEMA(dict(call.data))
+        restored = await db.async_restore_snapshot(_snapshot(data["name"].strip()).name)
+        return {"name": data["name"].strip(), "restored": restored, "revision": db.revision}
+
+    async def handle_get_task_notes(call: ServiceCall) -> ServiceResponse:
+        data = TASK_NOTES_SCHEMA(dict(call.data))
+        t = db.get(data["task_id"])
+        if not t:
+            raise HomeAssistantError(f"Unknown task: {data['task_id']}")
+        notes = await db.notes.async_get(t.id) if t.notes_len else ""
+        return {"task_id": t.id, "notes": notes, "revision": db.revision}
+
+    async def handle_get_metrics(call: ServiceCall) -> ServiceResponse:
+        data = METRICS_SCHEMA(dict(call.data))
+        out = db.metrics.as_dict()
+        if data["reset"]:
+            db.metrics.reset()
+        return out
+
+    hass.services.async_register(
+        DOMAIN, "add_task", _timed("add_task", handle_add_task), schema=ADD_TASK_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "update_task", _timed("update_task", handle_update_task), schema=UPDATE_TASK_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "delete_task", _timed("delete_task", handle_delete_task), schema=DELETE_TASK_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN, "start_task", _timed("start_task", handle_start_task), schema=START_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "pause_task", _timed("pause_task", handle_pause_task), schema=PAUSE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "complete_task", _timed("complete_task", handle_complete_task), schema=COMPLETE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "reset_task", _timed("reset_task", handle_reset_task), schema=RESET_SCHEMA
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "import_tasks",
+        _timed("import_tasks", _admin_only(handle_import_tasks)),
+        schema=IMPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "export_tasks",
+        _timed("export_tasks", _admin_only(handle_export_tasks)),
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "search_tasks",
+        _timed("search_tasks", handle_search_tasks),
+        schema=SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN, "assign_zones", _timed("assign_zones", handle_assign_zones), schema=ASSIGN_ZONES_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "get_user_tasks",
+        _timed("get_user_tasks", handle_get_user_tasks),
+        schema=USER_TASKS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "plan_session",
+        _timed("plan_session", handle_plan_session),
+        schema=PLAN_SESSION_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "duration_stats",
+        _timed("duration_stats", handle_duration_stats),
+        schema=DURATION_STATS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "analytics_report",
+        _timed("analytics_report", handle_analytics_report),
+        schema=ANALYTICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "select_task",
+        _timed("select_task", handle_select_task),
+        schema=SELECT_TASK_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN, "create_snapshot", _timed("create_snapshot", handle_create_snapshot), schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, "delete_snapshot", _timed("delete_snapshot", handle_delete_snapshot), schema=SNAPSHOT_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "list_snapshots",
+        _timed("list_snapshots", handle_list_snapshots),
+        schema=LIST_SNAPSHOTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "diff_snapshot",
+        _timed("diff_snapshot", handle_diff_snapshot),
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "restore_snapshot",
+        _timed("restore_snapshot", handle_restore_snapshot),
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_task_notes",
+        _timed("get_task_notes", handle_get_task_notes),
+        schema=TASK_NOTES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # Not wrapped in _timed so reading the metrics does not show up in them.
+    hass.services.async_register(
+        DOMAIN,
+        "get_metrics",
+        handle_get_metrics,
+        schema=METRICS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
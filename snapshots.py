@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from .storage import Task
+
+# Named snapshots kept per database; each costs memory only for tasks changed since.
+MAX_SNAPSHOTS = 20
+
+
+@dataclass
+class Snapshot:
+    """A named point in time, kept as an undo log against the live tasks.
+
+    Taking one is O(1): it starts empty. The first time a task changes
+    afterwards, its previous version is recorded here. That version is the
+    immutable live object, so it is shared, not copied. Tasks that never
+    change cost nothing. None means the task did not exist yet.
+    """
+
+    name: str
+    created_at: datetime
+    revision: int
+    tasks: Dict[str, Optional["Task"]] = field(default_factory=dict)
+    # Full notes before their first change; "" means none.
+    notes: Dict[str, str] = field(default_factory=dict)
+    # Stored form of each recorded task, built once since the versions never change.
+    _encoded: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict, repr=False)
+
+    def record(self, task_id: str, before: Optional["Task"]) -> None:
+        if task_id not in self.tasks:
+            self.tasks[task_id] = before
+            self._encoded[task_id] = before.to_dict() if before is not None else None
+
+    def record_notes(self, task_id: str, before: str) -> None:
+        self.notes.setdefault(task_id, before)
+
+    def task_unchanged(self, task_id: str, current: Optional["Task"]) -> bool:
+        """Whether current matches the recorded version, ignoring its rev.
+
+        Identity settles it while the recorded version is still live; after a
+        reload or a restore the stored forms are compared instead.
+        """
+        before = self.tasks[task_id]
+        if current is before:
+            return True
+        if current is None or before is None:
+            return False
+        now = current.to_dict()
+        return all(now.get(key) == value for key, value in self._encoded[task_id].items() if key != "rev")
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Copies of the maps so a save encoding this in a thread never sees them grow.
+        return {
+            "created_at": self.created_at.isoformat(),
+            "revision": self.revision,
+            "tasks": dict(self._encoded),
+            "notes": dict(self.notes),
+        }
+
+    @staticmethod
+    def from_dict(name: str, d: Any, task_from_dict: Callable[[Dict[str, Any]], "Task"]) -> Optional["Snapshot"]:
+        if not isinstance(d, dict):
+            return None
+        try:
+            snap = Snapshot(name, datetime.fromisoformat(d["created_at"]), int(d.get("revision", 0) or 0))
+        except (KeyError, TypeError, ValueError):
+            return None
+        raw_tasks = d.get("tasks")
+        for tid, td in (raw_tasks.items() if isinstance(raw_tasks, dict) else ()):
+            snap.record(str(tid), task_from_dict({**td, "id": tid}) if isinstance(td, dict) else None)
+        raw_notes = d.get("notes")
+        for tid, text in (raw_notes.items() if isinstance(raw_notes, dict) else ()):
+            snap.record_notes(str(tid), str(text or ""))
+        return snap
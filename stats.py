@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.9)
+
+# Samples kept verbatim per quantile before switching to the five-marker sketch.
+EXACT_SAMPLES = 16
+
+# Stored floats are rounded to this many decimals to keep the store compact.
+_PRECISION = 4
+
+
+def _sign(x: float) -> int:
+    return 1 if x > 0 else -1
+
+
+@dataclass(frozen=True)
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (Jain & Chlamtac P²).
+
+    The first EXACT_SAMPLES samples are kept and answered exactly. After that
+    five markers are seeded from them and each sample moves the markers in
+    O(1). Immutable: add() returns the updated sketch.
+    """
+
+    p: float
+    # Sorted samples while count <= EXACT_SAMPLES, else the five marker heights.
+    heights: Tuple[float, ...] = ()
+    # Positions of markers 1..3; marker 0 sits at 0 and marker 4 at count - 1.
+    positions: Tuple[int, ...] = ()
+    count: int = 0
+
+    def _increments(self) -> Tuple[float, ...]:
+        p = self.p
+        return (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x: float) -> "P2Quantile":
+        count = self.count + 1
+        if self.count < EXACT_SAMPLES:
+            heights = list(self.heights)
+            bisect.insort(heights, x)
+            return P2Quantile(self.p, tuple(heights), (), count)
+
+        if self.count == EXACT_SAMPLES:
+            # Seed the markers at the exact quantiles of the buffered samples,
+            # which converges far faster than P²'s usual five-sample start.
+            samples = list(self.heights)
+            bisect.insort(samples, x)
+            ranks = [int(round((count - 1) * inc)) for inc in self._increments()]
+            return P2Quantile(self.p, tuple(samples[r] for r in ranks), tuple(ranks[1:4]), count)
+
+        q = list(self.heights)
+        n = [0, *self.positions, self.count - 1]
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = min(max(bisect.bisect_right(q, x) - 1, 0), 3)
+        for i in range(k + 1, 5):
+            n[i] += 1
+
+        increments = self._increments()
+        for i in (1, 2, 3):
+            d = (count - 1) * increments[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = _sign(d)
+                # Piecewise-parabolic prediction, falling back to linear if it
+                # would break the ordering of the markers.
+                qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+        return P2Quantile(self.p, tuple(q), (n[1], n[2], n[3]), count)
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.heights:
+            return None
+        if self.count > EXACT_SAMPLES:
+            return self.heights[2]
+        # Nearest rank over the buffered samples.
+        return self.heights[int(round(self.p * (len(self.heights) - 1)))]
+
+    def to_list(self) -> List[float]:
+        return [round(h, _PRECISION) for h in self.heights] + list(self.positions)
+
+    @staticmethod
+    def from_list(p: float, data: Any, count: int) -> "P2Quantile":
+        if not isinstance(data, list) or count <= 0:
+            return P2Quantile(p)
+        if count <= EXACT_SAMPLES:
+            if len(data) != count:
+                return P2Quantile(p)
+            return P2Quantile(p, tuple(sorted(float(v) for v in data)), (), count)
+        if len(data) != 8:
+            return P2Quantile(p)
+        return P2Quantile(p, tuple(float(v) for v in data[:5]), tuple(int(v) for v in data[5:]), count)
+
+
+@dataclass(frozen=True)
+class DurationStats:
+    """Completion durations in minutes: Welford mean/variance plus p50/p90 sketches.
+
+    Every completion is an O(1) update with no history kept. Immutable, so
+    tasks can share instances across copy-on-write transactions.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    quantiles: Tuple[P2Quantile, ...] = field(default_factory=lambda: tuple(P2Quantile(p) for p in QUANTILES))
+
+    def add(self, minutes: float) -> "DurationStats":
+        minutes = float(minutes)
+        n = self.n + 1
+        delta = minutes - self.mean
+        mean = self.mean + delta / n
+        m2 = self.m2 + delta * (minutes - mean)
+        return DurationStats(n, mean, m2, tuple(q.add(minutes) for q in self.quantiles))
+
+    @staticmethod
+    def from_legacy(avg_min: int, n: int) -> "DurationStats":
+        """Carry over an old integer running average; quantiles start fresh."""
+        return DurationStats(n=max(0, n), mean=float(avg_min) if n > 0 else 0.0)
+
+    @property
+    def stddev(self) -> Optional[float]:
+        if self.n < 2:
+            return None
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    def quantile(self, p: float) -> Optional[float]:
+        for q in self.quantiles:
+            if q.p == p:
+                return q.value
+        return None
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    @property
+    def p90(self) -> Optional[float]:
+        return self.quantile(0.9)
+
+    def summary(self) -> Dict[str, Any]:
+        """Rounded figures for attributes and service responses."""
+
+        def r(v: Optional[float]) -> Optional[float]:
+            return None if v is None else round(v, 1)
+
+        return {
+            "n": self.n,
+            "mean_min": r(self.mean) if self.n else None,
+            "stddev_min": r(self.stddev),
+            "p50_min": r(self.p50),
+            "p90_min": r(self.p90),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {"n": self.n, "mean": round(self.mean, _PRECISION), "m2": round(self.m2, _PRECISION)}
+        for q in self.quantiles:
+            if q.count:
+                d[f"p{int(q.p * 100)}"] = [q.count, *q.to_list()]
+        return d
+
+    @staticmethod
+    def from_dict(d: Any) -> Optional["DurationStats"]:
+        if not isinstance(d, dict):
+            return None
+        try:
+            quantiles = []
+            for p in QUANTILES:
+                raw = d.get(f"p{int(p * 100)}")
+                if isinstance(raw, list) and raw:
+                    quantiles.append(P2Quantile.from_list(p, raw[1:], int(raw[0])))
+                else:
+                    quantiles.append(P2Quantile(p))
+            return DurationStats(
+                n=int(d.get("n", 0) or 0),
+                mean=float(d.get("mean", 0.0) or 0.0),
+                m2=float(d.get("m2", 0.0) or 0.0),
+                quantiles=tuple(quantiles),
+            )
+        except (TypeError, ValueError):
+            return None
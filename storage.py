@@ -1,16 +1,40 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Optional
+import asyncio
+import copy
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
+from .analytics import CompletionLog
+from .indexes import DueIndex, KeyIndex
+from .locks import KeyedLock
+from .metrics import Metrics
+from .notes import NotesStore, notes_preview
+from .recurrence import RecurrenceRule, due_key, has_schedule, parse_rule, refresh_due
+from .search import SearchIndex
+from .selection import TaskSelection
+from .snapshots import Snapshot
+from .stats import DurationStats
+from .summary import TaskSummary
+
+
+_LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
 STORAGE_KEY_PREFIX = "maintenance_db"
 
+# Tasks handled per event-loop slice during bulk passes before yielding. At 100k
+# tasks a slice of 500 stalls the loop for about 15 ms (tests/bench_reindex.py).
+REINDEX_CHUNK_SIZE = 500
+
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -38,6 +62,13 @@ def _dt_to_iso(dt: Optional[datetime]) -> Optional[str]:
     return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def _rule_from_dict(val: Any) -> Optional[RecurrenceRule]:
+    try:
+        return parse_rule(val)
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass
 class Task:
     id: str
@@ -53,14 +84,29 @@ class Task:
     started_at: Optional[datetime] = None
     accum_sec: int = 0
 
-    notes: str = ""
+    # Full notes live in MaintenanceDB.notes; tasks only carry a preview.
+    notes_preview: str = ""
+    notes_len: int = 0
 
     last_done: Optional[datetime] = None
     last_done_by: Optional[str] = None
     due: Optional[datetime] = None
 
+    recurrence: Optional[RecurrenceRule] = None
+    # Completion durations; avg_min and n mirror its mean and count.
+    stats: Optional[DurationStats] = None
+    # Bumped on every committed change to this task, for compare-and-set updates.
+    rev: int = 0
+    # Inputs `due` was last computed from; runtime cache only, never persisted.
+    due_key: Optional[tuple] = field(default=None, repr=False, compare=False)
+
+    def copy(self) -> "Task":
+        return copy.copy(self)
+
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
+        d = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "due_key"}
+        d["recurrence"] = self.recurrence.to_dict() if self.recurrence else None
+        d["stats"] = self.stats.to_dict() if self.stats else None
         d["started_at"] = _dt_to_iso(self.started_at)
         d["last_done"] = _dt_to_iso(self.last_done)
         d["last_done_by"] = self.last_done_by
@@ -83,26 +129,130 @@ class Task:
             started_at=_dt_from_iso(d.get("started_at")),
             accum_sec=int(d.get("accum_sec", 0) or 0),
 
-            notes=str(d.get("notes", "") or ""),
+            notes_preview=str(d.get("notes_preview", "") or ""),
+            notes_len=int(d.get("notes_len", 0) or 0),
 
             last_done=_dt_from_iso(d.get("last_done")),
             last_done_by=d.get("last_done_by"),
             due=_dt_from_iso(d.get("due")),
+
+            recurrence=_rule_from_dict(d.get("recurrence")),
+            stats=DurationStats.from_dict(d.get("stats")),
+            rev=int(d.get("rev", 0) or 0),
         )
 
 
+class Transaction:
+    """Task changes staged against a MaintenanceDB and applied together on commit.
+
+    get() hands out private working copies, so mutating them never touches the
+    live tasks until the surrounding MaintenanceDB.transaction() block exits
+    cleanly. Only tasks passed to upsert() or delete() are written.
+    """
+
+    def __init__(self, db: "MaintenanceDB") -> None:
+        self._db = db
+        self._copies: Dict[str, Task] = {}
+        self.changes: Dict[str, Optional[Task]] = {}
+        self.zone_durations: list[tuple[str, float]] = []
+        self.completions: list[tuple[Task, Optional[str], float, datetime, Optional[datetime]]] = []
+        self.notes: Dict[str, Optional[str]] = {}
+
+    def get(self, task_id: str) -> Optional[Task]:
+        if task_id in self.changes:
+            return self.changes[task_id]
+        if task_id in self._copies:
+            return self._copies[task_id]
+        t = self._db.get(task_id)
+        if t is None:
+            return None
+        working = t.copy()
+        self._copies[task_id] = working
+        return working
+
+    def upsert(self, task: Task) -> None:
+        self.changes[task.id] = task
+
+    def delete(self, task_id: str) -> None:
+        self.changes[task_id] = None
+
+    def record_zone_duration(self, zone: str, minutes: float) -> None:
+        self.zone_durations.append((zone, minutes))
+
+    def record_completion(
+        self, task: Task, user: Optional[str], minutes: float, done_at: datetime, due: Optional[datetime]
+    ) -> None:
+        """Add a completion to the analytics log once the transaction is saved."""
+        self.completions.append((task, user, minutes, done_at, due))
+
+    def set_notes(self, task: Task, text: str) -> None:
+        """Replace a task's full notes; the task itself must be upserted too."""
+        task.notes_preview = notes_preview(text)
+        task.notes_len = len(text)
+        self.notes[task.id] = text or None
+
+
+def _encode_state(
+    revision: int,
+    tasks: list[Task],
+    user_zones: Dict[str, list[str]],
+    zone_stats: Dict[str, DurationStats],
+    snapshots: list[tuple[str, Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Stored form of a captured state; runs in an executor thread."""
+    data: Dict[str, Any] = {
+        "revision": revision,
+        "tasks": {t.id: t.to_dict() for t in tasks},
+        "user_zones": user_zones,
+        "zone_stats": {zone: st.to_dict() for zone, st in zone_stats.items()},
+    }
+    if snapshots:
+        data["snapshots"] = dict(snapshots)
+    return data
+
+
 class MaintenanceDB:
     """Simple JSON storage for tasks, keyed per config entry."""
 
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+    def __init__(self, hass: HomeAssistant, entry_id: str, *, notify_delay: float = 0.0) -> None:
         self.hass = hass
         self.entry_id = entry_id
+        # Seconds to collect mutations before listeners run; 0 coalesces per loop iteration.
+        self.notify_delay = notify_delay
 
         storage_key = f"{STORAGE_KEY_PREFIX}_{entry_id}"
-        self.store: Store = Store(hass, STORAGE_VERSION, storage_key)
+        # Written from an immutable capture in a worker thread; see async_save().
+        self.store: Store = Store(hass, STORAGE_VERSION, storage_key, atomic_writes=True)
+        self.notes = NotesStore(hass, f"{STORAGE_KEY_PREFIX}_notes_{entry_id}")
+        self.analytics = CompletionLog(hass, f"{STORAGE_KEY_PREFIX}_analytics_{entry_id}")
 
         self.tasks: Dict[str, Task] = {}
+        # Bumped on every persisted mutation so clients can detect changes cheaply.
+        self.revision: int = 0
+        self.search_index = SearchIndex()
+        self.summary = TaskSummary()
+        # Only active tasks are filed: idle ones are the bulk and nobody looks them up.
+        self.by_status = KeyIndex("status", skip=(None, "idle"))
+        self.by_locked_by = KeyIndex("locked_by")
+        self.by_last_done_by = KeyIndex("last_done_by")
+        self.by_zone = KeyIndex("zone")
+        self.by_due = DueIndex()
+        # user -> zones they look after; drives the per-user task slices.
+        self.user_zones: Dict[str, list[str]] = {}
+        self.zone_stats: Dict[str, DurationStats] = {}
+        self.snapshots: Dict[str, Snapshot] = {}
+        # Which task the select, buttons and selected-task sensor act on.
+        self.selection = TaskSelection(self)
+        self.metrics = Metrics()
+        # Serializes read-modify-write cycles per task; see lock().
+        self.task_locks = KeyedLock()
+        # Ids loaded from the store but not yet in the search index.
+        self._search_pending: list[str] = []
         self._listeners: list[Callable[[], None]] = []
+        self._notify_handle: Optional[asyncio.Handle] = None
+        # Callers of the next store write, and whether a writer task is running.
+        self._save_waiter: Optional[asyncio.Future[None]] = None
+        self._save_running = False
 
     def add_listener(self, cb: Callable[[], None]) -> Callable[[], None]:
         self._listeners.append(cb)
@@ -116,6 +266,25 @@ class MaintenanceDB:
         return remove
 
     async def notify(self) -> None:
+        """Schedule a listener dispatch; repeated calls before it runs are coalesced."""
+        self.metrics.inc("notify_requests")
+        if self._notify_handle is not None:
+            return
+        if self.notify_delay > 0:
+            self._notify_handle = self.hass.loop.call_later(self.notify_delay, self._dispatch)
+        else:
+            self._notify_handle = self.hass.loop.call_soon(self._dispatch)
+
+    def flush(self) -> None:
+        """Run a pending dispatch now, for callers that need read-after-write state."""
+        if self._notify_handle is None:
+            return
+        self._notify_handle.cancel()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        self._notify_handle = None
+        self.metrics.inc("notifies")
         for cb in list(self._listeners):
             try:
                 cb()
@@ -123,26 +292,220 @@ class MaintenanceDB:
                 # don't crash HA for a bad UI callback
                 pass
 
+    @property
+    def time_zone(self) -> tzinfo:
+        """The instance's current time zone; read live so config changes apply."""
+        return dt_util.get_time_zone(self.hass.config.time_zone) or dt_util.DEFAULT_TIME_ZONE
+
     def get(self, task_id: str) -> Optional[Task]:
         return self.tasks.get(task_id)
 
     def upsert(self, task: Task) -> None:
         self.tasks[task.id] = task
+        self.search_index.index(task, self.notes.peek(task.id))
+        self.summary.update(task)
+        self.by_status.update(task)
+        self.by_locked_by.update(task)
+        self.by_last_done_by.update(task)
+        self.by_zone.update(task)
+        self.by_due.update(task)
 
     def delete(self, task_id: str) -> None:
         self.tasks.pop(task_id, None)
+        self.search_index.remove(task_id)
+        self.summary.remove(task_id)
+        self.by_status.remove(task_id)
+        self.by_locked_by.remove(task_id)
+        self.by_last_done_by.remove(task_id)
+        self.by_zone.remove(task_id)
+        self.by_due.remove(task_id)
+
+    def tasks_with_status(self, status: str) -> list[Task]:
+        """Tasks in a non-idle status, found without scanning the database."""
+        return [self.tasks[tid] for tid in self.by_status.ids(status) if tid in self.tasks]
+
+    def user_slice(self, user: str, *, done_since: datetime) -> Dict[str, list[str]]:
+        """Ids of the tasks relevant to one user, each with why it matched.
+
+        A task matches if the user holds its lock, completed it since
+        done_since, or it sits in one of the user's zones. Only the matching
+        index buckets are visited.
+        """
+
+        reasons: Dict[str, list[str]] = {}
+        for tid in self.by_locked_by.ids(user):
+            reasons.setdefault(tid, []).append("locked")
+        for tid in self.by_last_done_by.ids(user):
+            t = self.tasks.get(tid)
+            if t is not None and t.last_done is not None and t.last_done >= done_since:
+                reasons.setdefault(tid, []).append("recent")
+        for zone in self.user_zones.get(user, ()):
+            for tid in self.by_zone.ids(zone):
+                reasons.setdefault(tid, []).append("zone")
+        return reasons
+
+    async def async_set_user_zones(self, user: str, zones: list[str]) -> None:
+        previous = self.user_zones.get(user)
+        if zones:
+            self.user_zones[user] = list(dict.fromkeys(zones))
+        else:
+            self.user_zones.pop(user, None)
+        try:
+            await self.async_save()
+        except Exception:
+            if previous is None:
+                self.user_zones.pop(user, None)
+            else:
+                self.user_zones[user] = previous
+            raise
+        await self.notify()
+
+    def local_day_bounds(self) -> tuple[datetime, datetime]:
+        """UTC start of the current local day and of the next one."""
+        tz = self.time_zone
+        today = utcnow().astimezone(tz).date()
+        today_start = datetime.combine(today, time.min, tzinfo=tz).astimezone(timezone.utc)
+        tomorrow_start = datetime.combine(today + timedelta(days=1), time.min, tzinfo=tz).astimezone(timezone.utc)
+        return today_start, tomorrow_start
+
+    def refresh_summary(self) -> None:
+        """Re-bucket every task against the current local day; run at each local midnight."""
+        today_start, tomorrow_start = self.local_day_bounds()
+        self.summary.rebuild(self.tasks.values(), today_start, tomorrow_start)
+
+    def lock(self, *task_ids: str):
+        """Hold these tasks against other lock() holders, e.g. around a transaction.
+
+        A transaction's own commit does not yield between reading and applying,
+        but its save does. Holding the lock across the whole handler keeps a
+        second caller from reading a task while a change to it is in flight,
+        or from being rolled back over by a failed save.
+        """
+        return self.task_locks.hold(*task_ids)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """Stage task changes and commit them with one save and one notify.
+
+        If the block raises, nothing staged is applied. If the save fails, the
+        in-memory tasks are restored to their state before the commit.
+        """
+
+        tx = Transaction(self)
+        yield tx
+        if not tx.changes and not tx.zone_durations:
+            return
+
+        note_changes = dict(tx.notes)
+        for tid, t in tx.changes.items():
+            current = self.tasks.get(tid)
+            if t is None and current is not None and current.notes_len:
+                note_changes[tid] = None
+
+        previous = {tid: self.tasks.get(tid) for tid in tx.changes}
+        for tid, t in tx.changes.items():
+            if t is not None:
+                # Re-created tasks (e.g. from a snapshot) continue from their own rev.
+                t.rev = (previous[tid].rev if previous[tid] else t.rev) + 1
+        previous_zones = {zone: self.zone_stats.get(zone) for zone, _ in tx.zone_durations}
+        for snap in self.snapshots.values():
+            for tid in note_changes:
+                snap.record_notes(tid, self.notes.peek(tid) or "")
+        # Notes first, so the search index sees the new text when tasks are applied.
+        previous_notes = self.notes.stage(note_changes)
+        self._apply(tx.changes)
+        for zone, minutes in tx.zone_durations:
+            self.zone_stats[zone] = self.zone_stats.get(zone, DurationStats()).add(minutes)
+        try:
+            await self.async_save()
+        except Exception:
+            self.notes.unstage(previous_notes)
+            self._apply(previous)
+            for zone, stats in previous_zones.items():
+                if stats is None:
+                    self.zone_stats.pop(zone, None)
+                else:
+                    self.zone_stats[zone] = stats
+            # Readers may have cached the unsaved state under the revision this
+            # save took; move past it so the restored state is read again.
+            self.revision += 1
+            await self.notify()
+            raise
+        tz = self.time_zone
+        for t, user, minutes, done_at, due in tx.completions:
+            late = (done_at.astimezone(tz).date() - due.astimezone(tz).date()).days if due else 0
+            self.analytics.record(t.id, t.zone, user, done_at.timestamp(), minutes, late)
+        await self.notify()
+        # The tasks are committed, so a failed notes write must not fail the
+        # caller: the notes stay staged and the next commit writes them again.
+        if note_changes or self.notes.dirty:
+            try:
+                await self.notes.async_save()
+            except Exception:
+                _LOGGER.exception("Failed to save task notes; will retry with the next change")
+
+    def _apply(self, changes: Dict[str, Optional[Task]]) -> None:
+        for snap in self.snapshots.values():
+            for tid in changes:
+                snap.record(tid, self.tasks.get(tid))
+        for tid, t in changes.items():
+            if t is None:
+                self.delete(tid)
+            else:
+                self.upsert(t)
+        self.selection.tasks_changed()
+
+    def _index_pending(self, count: Optional[int] = None) -> None:
+        # Tasks changed since loading were indexed by upsert already; indexing
+        # the current version again is harmless, deleted ones are skipped.
+        batch = self._search_pending if count is None else self._search_pending[:count]
+        for tid in batch:
+            t = self.tasks.get(tid)
+            if t is not None:
+                self.search_index.index(t, self.notes.peek(tid))
+        del self._search_pending[: len(batch)]
+
+    async def async_warm(self) -> None:
+        """Build the deferred search index in slices, yielding to the event loop.
+
+        Loads the notes store first so notes are indexed in full, not by preview,
+        and the completion log, whose file is only needed for reports.
+        """
+        await self.analytics.async_load()
+        if self._search_pending:
+            await self.notes.async_load()
+        while self._search_pending:
+            self._index_pending(REINDEX_CHUNK_SIZE)
+            await asyncio.sleep(0)
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[Task, float]]:
+        if self._search_pending:
+            self._index_pending()
+        out: list[tuple[Task, float]] = []
+        for tid, score in self.search_index.search(query, limit):
+            t = self.tasks.get(tid)
+            if t:
+                out.append((t, score))
+        return out
 
     async def async_load(self) -> None:
         data = await self.store.async_load() or {}
         raw_tasks = data.get("tasks", {})
 
         tasks: Dict[str, Task] = {}
+        # Notes stored inline by older versions, to be moved to the notes store.
+        inline_notes: Dict[str, str] = {}
         if isinstance(raw_tasks, dict):
             for tid, td in raw_tasks.items():
                 if isinstance(td, dict):
                     td = dict(td)
                     td.setdefault("id", tid)
                     t = Task.from_dict(td)
+                    legacy = str(td.get("notes", "") or "")
+                    if legacy and t.id:
+                        inline_notes[t.id] = legacy
+                        t.notes_preview = notes_preview(legacy)
+                        t.notes_len = len(legacy)
                     # Preserve runtime state across HA restarts so running timers keep accruing
                     # wall time. If the start timestamp is missing, fall back to a paused state
                     # to avoid runaway counters with an unknown origin.
@@ -154,10 +517,205 @@ class MaintenanceDB:
                     if t.id:
                         tasks[t.id] = t
 
-        self.tasks = tasks
+        # Stored due dates were computed from the stored inputs; remember those so
+        # they are only recomputed once the schedule or the time zone changes.
+        tz = self.time_zone
+        for t in tasks.values():
+            t.due_key = due_key(t, tz)
 
-    async def async_save(self) -> None:
-        data = {"tasks": {tid: t.to_dict() for tid, t in self.tasks.items()}}
-        await self.store.async_save(data)
+        self.tasks = tasks
+        # Text indexing is the slowest part of loading and only search needs it;
+        # async_warm() fills it in after startup, search() finishes it on demand.
+        self.search_index.clear()
+        self._search_pending = list(tasks)
+        self.by_status.rebuild(tasks.values())
+        self.by_locked_by.rebuild(tasks.values())
+        self.by_last_done_by.rebuild(tasks.values())
+        self.by_zone.rebuild(tasks.values())
+        self.by_due.rebuild(tasks.values())
+        self.refresh_summary()
+        self.selection.tasks_changed()
+        self.revision = int(data.get("revision", 0) or 0)
+
+        raw_zones = data.get("user_zones", {})
+        self.user_zones = {
+            str(user): [str(z) for z in zones]
+            for user, zones in (raw_zones.items() if isinstance(raw_zones, dict) else ())
+            if isinstance(zones, list) and zones
+        }
+
+        raw_stats = data.get("zone_stats", {})
+        self.zone_stats = {}
+        if isinstance(raw_stats, dict):
+            for zone, sd in raw_stats.items():
+                stats = DurationStats.from_dict(sd)
+                if stats is not None:
+                    self.zone_stats[str(zone)] = stats
+
+        raw_snapshots = data.get("snapshots", {})
+        self.snapshots = {}
+        if isinstance(raw_snapshots, dict):
+            for name, sd in raw_snapshots.items():
+                snap = Snapshot.from_dict(str(name), sd, Task.from_dict)
+                if snap is not None:
+                    self.snapshots[snap.name] = snap
+        if self.snapshots:
+            # Snapshots record notes before they change, so those must be readable.
+            await self.notes.async_load()
+
+        if inline_notes:
+            # Write the notes store before dropping them from the task store, so an
+            # interruption in between just repeats the migration next time.
+            self.notes.stage(inline_notes)
+            await self.notes.async_save()
+            await self.async_save()
+
+    def snapshot_changes(self, snap: Snapshot) -> list[str]:
+        """Ids of the tasks (or their notes) that differ from the snapshot."""
+        return [
+            tid
+            for tid in snap.tasks
+            if not snap.task_unchanged(tid, self.tasks.get(tid))
+            or (tid in snap.notes and (self.notes.peek(tid) or "") != snap.notes[tid])
+        ]
+
+    async def async_create_snapshot(self, name: str) -> Snapshot:
+        """Start a named snapshot of the current tasks; O(1) until tasks change."""
+        await self.notes.async_load()
+        snap = Snapshot(name, utcnow(), self.revision)
+        self.snapshots[name] = snap
+        try:
+            await self.async_save()
+        except Exception:
+            del self.snapshots[name]
+            raise
+        await self.notify()
+        return snap
 
+    async def async_delete_snapshot(self, name: str) -> None:
+        snap = self.snapshots.pop(name)
+        try:
+            await self.async_save()
+        except Exception:
+            self.snapshots[name] = snap
+            raise
+        await self.notify()
+
+    async def async_restore_snapshot(self, name: str) -> int:
+        """Put every task changed since the snapshot back; returns how many changed.
+
+        Zone statistics and the completion log are history, not state, and are
+        left as they are.
+        """
+        snap = self.snapshots[name]
+        async with self.lock(*snap.tasks), self.transaction() as tx:
+            for tid in self.snapshot_changes(snap):
+                before = snap.tasks[tid]
+                if before is None:
+                    tx.delete(tid)
+                    continue
+                t = before.copy()
+                if tid in snap.notes:
+                    tx.set_notes(t, snap.notes[tid])
+                tx.upsert(t)
+            restored = len(tx.changes)
+        return restored
 
+    async def async_save(self) -> None:
+        """Persist the current state; returns once a write that includes it is on disk.
+
+        At most one write runs at a time and at most one more waits behind it.
+        Callers arriving while one is waiting join it, so a burst of changes
+        shares a few writes instead of one each. On the loop only the references
+        are captured (live tasks are immutable); building the stored form,
+        encoding and the atomic file write all happen in worker threads.
+        """
+        self.revision += 1
+        if self._save_waiter is None:
+            self._save_waiter = self.hass.loop.create_future()
+        waiter = self._save_waiter
+        # Set before the writer is created: it starts eagerly and runs up to its
+        # first await before async_create_task returns.
+        if not self._save_running:
+            self._save_running = True
+            self.hass.async_create_task(self._async_write_queued())
+        # Shielded so a cancelled caller does not abort a write others wait on.
+        await asyncio.shield(waiter)
+
+    async def _async_write_queued(self) -> None:
+        """Write until no caller is waiting; the only task that writes the store."""
+        try:
+            while (waiter := self._save_waiter) is not None:
+                self._save_waiter = None
+                try:
+                    await self._async_write()
+                except Exception as err:
+                    waiter.set_exception(err)
+                except BaseException:
+                    waiter.cancel()
+                    raise
+                else:
+                    waiter.set_result(None)
+        finally:
+            self._save_running = False
+
+    async def _async_write(self) -> None:
+        start = perf_counter()
+        state = (
+            self.revision,
+            list(self.tasks.values()),
+            dict(self.user_zones),
+            dict(self.zone_stats),
+            [(name, snap.to_dict()) for name, snap in self.snapshots.items()],
+        )
+        self.metrics.observe("save_capture", perf_counter() - start)
+        try:
+            data = await self.hass.async_add_executor_job(_encode_state, *state)
+            await self.store.async_save(data)
+        except Exception:
+            self.metrics.inc("save_errors")
+            raise
+        self.metrics.inc("saves")
+        self.metrics.observe("save", perf_counter() - start)
+
+    async def async_reindex_due(self) -> int:
+        """Recompute every scheduled task's due date in one pass with a single save and notify.
+
+        Yields to the event loop between chunks so large databases do not stall
+        other integrations. Returns the number of tasks whose due date changed.
+        """
+
+        tz = self.time_zone
+        tasks = list(self.tasks.values())
+        staged: list[tuple[Task, Task]] = []
+        for start in range(0, len(tasks), REINDEX_CHUNK_SIZE):
+            for t in tasks[start : start + REINDEX_CHUNK_SIZE]:
+                if not has_schedule(t):
+                    # Nothing to derive a date from; a due date here was set by hand.
+                    continue
+                working = t.copy()
+                if not refresh_due(working, tz):
+                    continue
+                if working.due == t.due:
+                    # Same date under the new inputs: only the runtime cache key moves.
+                    t.due_key = working.due_key
+                else:
+                    staged.append((t, working))
+            await asyncio.sleep(0)
+
+        # Commit without yielding; tasks replaced while we were yielding are
+        # recomputed from their current version instead of being overwritten.
+        async with self.transaction() as tx:
+            for base, working in staged:
+                current = self.tasks.get(base.id)
+                if current is None:
+                    continue
+                if current is not base:
+                    if not has_schedule(current):
+                        continue
+                    working = current.copy()
+                    if not refresh_due(working, tz) or working.due == current.due:
+                        continue
+                tx.upsert(working)
+            changed = len(tx.changes)
+        return changed
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+BUCKET_OVERDUE = "overdue"
+BUCKET_TODAY = "today"
+BUCKET_LATER = "later"
+
+SUMMARY_OVERDUE = "overdue"
+SUMMARY_DUE_TODAY = "due_today"
+SUMMARY_RUNNING = "running"
+SUMMARY_PAUSED = "paused"
+SUMMARY_BACKLOG_MIN = "backlog_min"
+
+
+def estimated_minutes(task: Any) -> int:
+    """Best duration guess for a task: its running average once it has history."""
+    if int(task.n or 0) > 0:
+        return int(task.avg_min or 0)
+    return int(task.est_min or 0)
+
+
+class TaskSummary:
+    """Counters over all tasks, adjusted in O(1) per task change.
+
+    Each task's contribution is remembered so an update can subtract the old
+    one before adding the new. Due buckets are relative to the local day set
+    by rebuild(), which runs again at every local midnight.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[Optional[str], str, int]] = {}
+        self._today_start: Optional[datetime] = None
+        self._tomorrow_start: Optional[datetime] = None
+
+        self.overdue = 0
+        self.due_today = 0
+        self.running = 0
+        self.paused = 0
+        self.backlog_min = 0
+
+    def _bucket(self, due: Optional[datetime]) -> Optional[str]:
+        if due is None or self._today_start is None or self._tomorrow_start is None:
+            return None
+        if due < self._today_start:
+            return BUCKET_OVERDUE
+        if due < self._tomorrow_start:
+            return BUCKET_TODAY
+        return BUCKET_LATER
+
+    def _add(self, entry: Tuple[Optional[str], str, int], sign: int) -> None:
+        bucket, status, minutes = entry
+        if bucket == BUCKET_OVERDUE:
+            self.overdue += sign
+        elif bucket == BUCKET_TODAY:
+            self.due_today += sign
+        if bucket in (BUCKET_OVERDUE, BUCKET_TODAY):
+            self.backlog_min += sign * minutes
+        if status == "running":
+            self.running += sign
+        elif status == "paused":
+            self.paused += sign
+
+    def update(self, task: Any) -> None:
+        self.remove(task.id)
+        entry = (self._bucket(task.due), task.status, estimated_minutes(task))
+        self._entries[task.id] = entry
+        self._add(entry, 1)
+
+    def remove(self, task_id: str) -> None:
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self._add(entry, -1)
+
+    def rebuild(self, tasks: Iterable[Any], today_start: datetime, tomorrow_start: datetime) -> None:
+        self._today_start = today_start
+        self._tomorrow_start = tomorrow_start
+        self._entries.clear()
+        self.overdue = self.due_today = self.running = self.paused = self.backlog_min = 0
+        for t in tasks:
+            self.update(t)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            SUMMARY_OVERDUE: self.overdue,
+            SUMMARY_DUE_TODAY: self.due_today,
+            SUMMARY_RUNNING: self.running,
+            SUMMARY_PAUSED: self.paused,
+            SUMMARY_BACKLOG_MIN: self.backlog_min,
+        }
@@ -0,0 +1,61 @@
+"""plan_session latency with 10k due candidates.
+
+Run with `python tests/bench_planner.py [task counts...]`. Half of the tasks
+are due, spread over the last month; the rest are due later and should not
+be visited.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import conftest  # noqa: F401  maps the repository root onto the package
+
+from common import async_test_home_assistant
+
+from maintenance.planner import due_candidates, plan_session
+from maintenance.storage import MaintenanceDB, Task, _dt_to_iso, utcnow
+
+RUNS = 20
+
+
+async def bench(count: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir) as hass:
+            now = utcnow()
+            tasks = {}
+            for i in range(count):
+                offset = timedelta(hours=-(i % 720)) if i % 2 else timedelta(days=1 + i % 60)
+                t = Task(id=str(i), title=f"Task {i}", zone=f"Zone {i % 20}", freq_days=1 + i % 90, est_min=5 + i % 40)
+                tasks[t.id] = {**t.to_dict(), "due": _dt_to_iso(now + offset)}
+            seed = MaintenanceDB(hass, "bench")
+            await seed.store.async_save({"revision": 0, "tasks": tasks})
+
+            db = MaintenanceDB(hass, "bench")
+            await db.async_load()
+            _, tomorrow_start = db.local_day_bounds()
+
+            timings = []
+            for _ in range(RUNS):
+                start = time.perf_counter()
+                plan = plan_session(due_candidates(db, tomorrow_start, None, None), 480, now=now, due_before=tomorrow_start)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"{count:>7} tasks: plan_session median {statistics.median(timings) * 1000:.1f} ms, "
+                f"max {max(timings) * 1000:.1f} ms ({len(plan.tasks)} planned, {plan.skipped} skipped)"
+            )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [20_000]
+    for count in counts:
+        asyncio.run(bench(count))
+
+
+if __name__ == "__main__":
+    main()
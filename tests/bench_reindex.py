@@ -0,0 +1,102 @@
+"""Event-loop stalls of the chunked due-date reindex at 100k tasks.
+
+Run with `python tests/bench_reindex.py [task counts...]`. Changes the time
+zone, so every scheduled task is recomputed, and reindexes once per chunk size.
+Reports the whole pass, the typical and longest stall a 1 ms heartbeat saw
+between chunks, and the stall of the single commit at the end. Collector pauses
+land on whichever chunk triggers them, so the longest stall barely depends on
+the chunk size; the typical one does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import conftest  # noqa: F401  maps the repository root onto the package
+
+from common import async_test_home_assistant
+
+from maintenance import storage
+from maintenance.storage import MaintenanceDB, Task
+
+CHUNK_SIZES = (500, 2000, 10_000)
+
+
+async def bench(count: int, chunk_size: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir) as hass:
+            seed = MaintenanceDB(hass, "bench")
+            base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            tasks = {
+                str(i): Task(
+                    id=str(i),
+                    title=f"Clean gutter {i}",
+                    zone=f"Zone {i % 20}",
+                    freq_days=7 + i % 60,
+                    last_done=base + timedelta(minutes=37 * i),
+                ).to_dict()
+                for i in range(count)
+            }
+            await seed.store.async_save({"revision": 0, "tasks": tasks})
+
+            db = MaintenanceDB(hass, "bench")
+            await db.async_load()
+            await hass.config.async_set_time_zone("America/New_York")
+
+            # The commit starts when the transaction is entered; gaps ending
+            # before that were spent on chunks.
+            commit_started = 0.0
+            transaction = db.transaction
+
+            def timed_transaction():
+                nonlocal commit_started
+                commit_started = time.perf_counter()
+                return transaction()
+
+            db.transaction = timed_transaction
+
+            stalls: list[tuple[float, float]] = []
+            running = True
+
+            async def heartbeat() -> None:
+                last = time.perf_counter()
+                while running:
+                    await asyncio.sleep(0.001)
+                    now = time.perf_counter()
+                    stalls.append((now, now - last - 0.001))
+                    last = now
+
+            storage.REINDEX_CHUNK_SIZE = chunk_size
+            beat = asyncio.create_task(heartbeat())
+            await asyncio.sleep(0.01)
+            start = time.perf_counter()
+            changed = await db.async_reindex_due()
+            elapsed = time.perf_counter() - start
+            await asyncio.sleep(0.01)
+            running = False
+            await beat
+
+            # Gaps under 1 ms are heartbeats with no chunk between them.
+            chunk_stalls = [gap for at, gap in stalls if at < commit_started and gap > 0.001] or [0.0]
+            commit_stall = max((gap for at, gap in stalls if at >= commit_started), default=0.0)
+            print(
+                f"{count:>7} tasks, chunk {chunk_size:>6}: {changed} changed in {elapsed * 1000:.0f} ms, "
+                f"stall between chunks p50 {statistics.median(chunk_stalls) * 1000:.1f} ms / "
+                f"max {max(chunk_stalls) * 1000:.1f} ms, commit stall {commit_stall * 1000:.1f} ms"
+            )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000]
+    for count in counts:
+        for chunk_size in CHUNK_SIZES:
+            asyncio.run(bench(count, chunk_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Event-loop blocking per store save at 10k and 100k tasks.
+
+Run with `python tests/bench_save.py [task counts...]`. Reports the time each
+save spends capturing state on the loop, the end-to-end save time and the
+longest stall a 1 ms heartbeat saw while the saves ran.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  maps the repository root onto the package
+
+from common import async_test_home_assistant
+
+from maintenance.storage import MaintenanceDB, Task
+
+SAVES = 5
+
+
+async def bench(count: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir) as hass:
+            seed = MaintenanceDB(hass, "bench")
+            tasks = {
+                str(i): Task(id=str(i), title=f"Clean gutter {i}", zone=f"Zone {i % 20}", freq_days=30).to_dict()
+                for i in range(count)
+            }
+            await seed.store.async_save({"revision": 0, "tasks": tasks})
+
+            db = MaintenanceDB(hass, "bench")
+            await db.async_load()
+
+            stalls: list[float] = []
+            running = True
+
+            async def heartbeat() -> None:
+                last = time.perf_counter()
+                while running:
+                    await asyncio.sleep(0.001)
+                    now = time.perf_counter()
+                    stalls.append(now - last - 0.001)
+                    last = now
+
+            beat = asyncio.create_task(heartbeat())
+            for _ in range(SAVES):
+                await db.async_save()
+            running = False
+            await beat
+
+            latency = db.metrics.as_dict()["latency"]
+            print(
+                f"{count:>7} tasks: capture p50 {latency['save_capture']['p50_ms']:.2f} ms, "
+                f"save p50 {latency['save']['p50_ms']:.0f} ms, "
+                f"longest loop stall {max(stalls) * 1000:.1f} ms"
+            )
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for count in counts:
+        asyncio.run(bench(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Integration setup time for empty, 10k and 100k-task stores.
+
+Run with `python tests/bench_setup.py [task counts...]`. Times the phases
+async_setup_entry runs before Home Assistant has started (loading the store
+and registering services) and the index warm-up it defers until after.
+Platform forwarding, the HTTP view and panel registration are left out:
+they need a full frontend/http setup and do not depend on the task count.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+
+import conftest  # noqa: F401  maps the repository root onto the package
+
+from common import async_test_home_assistant
+
+from maintenance.services import async_setup_services
+from maintenance.storage import MaintenanceDB, Task
+
+RUNS = 3
+
+
+async def bench(count: int) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir) as hass:
+            tasks = {
+                str(i): Task(id=str(i), title=f"Clean gutter {i}", zone=f"Zone {i % 20}", freq_days=30).to_dict()
+                for i in range(count)
+            }
+            await MaintenanceDB(hass, "bench").store.async_save({"revision": 0, "tasks": tasks})
+
+            phases: dict[str, list[float]] = {"load": [], "services": [], "warm (deferred)": []}
+            for _ in range(RUNS):
+                db = MaintenanceDB(hass, "bench")
+                start = time.perf_counter()
+                await db.async_load()
+                phases["load"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                await async_setup_services(hass, db)
+                phases["services"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                await db.async_warm()
+                phases["warm (deferred)"].append(time.perf_counter() - start)
+
+            critical = statistics.median(phases["load"]) + statistics.median(phases["services"])
+            detail = ", ".join(f"{name} {statistics.median(t) * 1000:.0f} ms" for name, t in phases.items())
+            print(f"{count:>7} tasks: before start {critical * 1000:.0f} ms ({detail})")
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [0, 10_000, 100_000]
+    for count in counts:
+        asyncio.run(bench(count))
+
+
+if __name__ == "__main__":
+    main()
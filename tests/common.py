@@ -0,0 +1,24 @@
+"""Helpers shared by the tests."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+
+@asynccontextmanager
+async def async_test_home_assistant(config_dir: str, time_zone: str = "Europe/Berlin") -> AsyncIterator[HomeAssistant]:
+    """A bare Home Assistant instance with its storage under config_dir."""
+    hass = HomeAssistant(config_dir)
+    await hass.config.async_set_time_zone(time_zone)
+    try:
+        yield hass
+    finally:
+        await hass.async_stop(force=True)
+
+
+def run(test: Callable[[], Awaitable[None]]) -> None:
+    asyncio.run(test())
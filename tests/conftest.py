@@ -0,0 +1,19 @@
+"""Make the integration importable as the `maintenance` package.
+
+The repository root is the integration directory itself, so it is mapped onto
+the package name here instead of being installed under custom_components.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if "maintenance" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "maintenance", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["maintenance"] = package
+    spec.loader.exec_module(package)
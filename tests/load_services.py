@@ -0,0 +1,108 @@
+"""Concurrent multi-user load harness for the task services.
+
+Simulated users (one Home Assistant user each, so lock ownership is real)
+pick tasks at random and call start_task, then pause_task or complete_task,
+with the calls of all users interleaved on one event loop. The store is a
+Home Assistant Store in a temporary config directory.
+
+    python tests/load_services.py --tasks 10000 --users 12 --rounds 200
+
+Reports throughput, p50/p95/p99 latency per service, the share of calls
+refused by the locked_by checks, and saves and notifies per second. Use a
+small --hot pool to make the users fight over the same tasks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+import conftest  # noqa: F401  maps the repository root onto the package
+
+from common import async_test_home_assistant
+from homeassistant import auth
+from homeassistant.core import Context
+from homeassistant.exceptions import HomeAssistantError
+
+from maintenance.const import DOMAIN
+from maintenance.services import async_setup_services
+from maintenance.storage import MaintenanceDB, Task
+
+SERVICES = ("start_task", "pause_task", "complete_task")
+
+
+async def run_scenario(tasks: int, users: int, rounds: int, hot: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir) as hass:
+            hass.auth = await auth.auth_manager_from_config(hass, [], [])
+            seed_db = MaintenanceDB(hass, "load")
+            stored = {
+                str(i): Task(id=str(i), title=f"Task {i}", zone=f"Zone {i % 20}", freq_days=7, est_min=15).to_dict()
+                for i in range(tasks)
+            }
+            await seed_db.store.async_save({"revision": 0, "tasks": stored})
+
+            db = MaintenanceDB(hass, "load")
+            await db.async_load()
+            await async_setup_services(hass, db)
+            pool = [str(i) for i in rng.sample(range(tasks), min(hot, tasks))]
+            contexts = [Context(user_id=(await hass.auth.async_create_user(f"Tablet {n}")).id) for n in range(users)]
+
+            async def user(context: Context, user_rng: random.Random) -> None:
+                for _ in range(rounds):
+                    task_id = user_rng.choice(pool)
+                    finish = "complete_task" if user_rng.random() < 0.3 else "pause_task"
+                    for service in ("start_task", finish):
+                        try:
+                            await hass.services.async_call(
+                                DOMAIN, service, {"task_id": task_id}, blocking=True, context=context
+                            )
+                        except HomeAssistantError:
+                            # Refused by a lock check; counted in the metrics.
+                            break
+                        await asyncio.sleep(0)
+
+            await hass.services.async_call(DOMAIN, "get_metrics", {"reset": True}, blocking=True, return_response=True)
+            start = time.perf_counter()
+            await asyncio.gather(*(user(ctx, random.Random(rng.random())) for ctx in contexts))
+            elapsed = time.perf_counter() - start
+            metrics = await hass.services.async_call(DOMAIN, "get_metrics", {}, blocking=True, return_response=True)
+
+    counters = metrics["counters"]
+    calls = sum(counters.get(f"{service}_calls", 0) for service in SERVICES)
+    print(f"tasks={tasks} users={users} rounds={rounds} hot={len(pool)}")
+    print(f"  {calls} calls in {elapsed:.2f} s: {calls / elapsed:.0f} calls/s")
+    for service in SERVICES:
+        lat = metrics["latency"].get(service)
+        if lat:
+            print(
+                f"  {service:<14} {counters.get(f'{service}_calls', 0):>6} calls, "
+                f"{counters.get(f'{service}_errors', 0):>5} refused, "
+                f"p50 {lat['p50_ms']:.2f} ms  p95 {lat['p95_ms']:.2f} ms  p99 {lat['p99_ms']:.2f} ms"
+            )
+    conflicts = counters.get("lock_conflicts", 0)
+    print(f"  lock conflicts {conflicts} ({conflicts / max(calls, 1):.1%} of calls)")
+    print(
+        f"  saves {counters.get('saves', 0) / elapsed:.1f}/s, "
+        f"notifies {counters.get('notifies', 0) / elapsed:.1f}/s "
+        f"(requested {counters.get('notify_requests', 0) / elapsed:.1f}/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=100, help="start/finish cycles per user")
+    parser.add_argument("--hot", type=int, default=50, help="size of the task pool users pick from")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run_scenario(args.tasks, args.users, args.rounds, args.hot, args.seed))
+
+
+if __name__ == "__main__":
+    main()
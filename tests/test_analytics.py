@@ -0,0 +1,84 @@
+"""Tests for the completion analytics report."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+
+from maintenance.analytics import COLUMNS, LogSnapshot, build_report
+
+
+def _at(day: int, hour: int) -> float:
+    return datetime(2026, 3, day, hour, tzinfo=timezone.utc).timestamp()
+
+
+# zone, user, ts, minutes, days_late
+ROWS = [
+    ("Garden", "Alex", _at(2, 10), 30, 0),
+    ("Kitchen", "Sam", _at(2, 18), 10, 2),
+    ("Garden", "Sam", _at(3, 9), 20, -1),
+    ("Garden", "Alex", _at(5, 12), 40, 3),
+    ("Kitchen", "Alex", _at(9, 8), 50, 0),  # after the report's end
+]
+ZONES = ("Garden", "Kitchen")
+USERS = ("Alex", "Sam")
+
+
+def _snapshot() -> LogSnapshot:
+    values = {
+        "task": [0] * len(ROWS),
+        "zone": [ZONES.index(r[0]) for r in ROWS],
+        "user": [USERS.index(r[1]) for r in ROWS],
+        "ts": [r[2] for r in ROWS],
+        "minutes": [r[3] for r in ROWS],
+        "days_late": [r[4] for r in ROWS],
+    }
+    return LogSnapshot({name: array(code, values[name]) for name, code in COLUMNS.items()}, ("t",), ZONES, USERS)
+
+
+def _summary(completions: int, minutes: float, mean_min, on_time_rate, mean_days_late) -> dict:
+    return {
+        "completions": completions,
+        "minutes": minutes,
+        "mean_min": mean_min,
+        "on_time_rate": on_time_rate,
+        "mean_days_late": mean_days_late,
+    }
+
+
+def _report(**kwargs) -> dict:
+    start = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    end = datetime(2026, 3, 6, tzinfo=timezone.utc)
+    return build_report(_snapshot(), start, end, tz=timezone.utc, bucket="day", **kwargs)
+
+
+def test_report_totals_match_hand_counted_log() -> None:
+    report = _report()
+
+    assert report["total"] == _summary(4, 100.0, 25.0, 0.5, 1.25)
+    assert report["by_zone"] == {
+        "Garden": _summary(3, 90.0, 30.0, 0.667, 1.0),
+        "Kitchen": _summary(1, 10.0, 10.0, 0.0, 2.0),
+    }
+    assert report["by_user"] == {
+        "Alex": _summary(2, 70.0, 35.0, 0.5, 1.5),
+        "Sam": _summary(2, 30.0, 15.0, 0.5, 1.0),
+    }
+    assert report["trend"] == [
+        {"period": "2026-03-02", **_summary(2, 40.0, 20.0, 0.5, 1.0)},
+        {"period": "2026-03-03", **_summary(1, 20.0, 20.0, 1.0, 0.0)},
+        {"period": "2026-03-04", **_summary(0, 0.0, None, None, None)},
+        {"period": "2026-03-05", **_summary(1, 40.0, 40.0, 0.0, 3.0)},
+    ]
+
+
+def test_report_filters_by_zone_and_user() -> None:
+    report = _report(zone="Garden", user="Alex")
+
+    assert report["total"] == _summary(2, 70.0, 35.0, 0.5, 1.5)
+    assert list(report["by_zone"]) == ["Garden"]
+    assert list(report["by_user"]) == ["Alex"]
+    assert [t["completions"] for t in report["trend"]] == [1, 0, 0, 1]
+
+    assert _report(zone="Attic")["total"] == _summary(0, 0.0, None, None, None)
+    assert _report(user="Sam")["total"] == _summary(2, 30.0, 15.0, 0.5, 1.0)
@@ -0,0 +1,43 @@
+"""Tests for the task snapshot view."""
+
+from __future__ import annotations
+
+import json
+
+from aiohttp.test_utils import make_mocked_request
+from common import async_test_home_assistant, run
+
+from maintenance.const import DOMAIN
+from maintenance.http import MaintenanceTasksView
+from maintenance.storage import MaintenanceDB, Task
+
+
+def test_user_parameter_serves_that_users_slice(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            async with db.transaction() as tx:
+                tx.upsert(Task(id="hedge", title="Trim hedge", zone="Garden"))
+                tx.upsert(Task(id="oven", title="Clean oven", zone="Kitchen"))
+                tx.upsert(Task(id="filter", title="Hood filter", zone="Kitchen", locked_by="Alex"))
+            await db.async_set_user_zones("Alex", ["Garden"])
+            hass.data[DOMAIN] = {"entry": {"db": db}}
+            view = MaintenanceTasksView(hass)
+
+            async def get(query: str) -> tuple[str, dict]:
+                response = await view.get(make_mocked_request("GET", f"/api/maintenance/tasks?{query}"))
+                return response.headers["ETag"], json.loads(response.body)
+
+            everyone_etag, everyone = await get("")
+            alex_etag, alex = await get("user=Alex")
+            sam_etag, sam = await get("user=Sam")
+
+            assert sorted(t["id"] for t in everyone["tasks"]) == ["filter", "hedge", "oven"]
+            assert {t["id"]: t["match"] for t in alex["tasks"]} == {"filter": ["locked"], "hedge": ["zone"]}
+            assert (alex["user"], alex["user_zones"]) == ("Alex", ["Garden"])
+            assert sam["tasks"] == []
+            assert len({everyone_etag, alex_etag, sam_etag}) == 3
+            assert [t["id"] for t in (await get("user=Alex&zone=Kitchen"))[1]["tasks"]] == ["filter"]
+
+    run(test)
@@ -0,0 +1,39 @@
+"""Tests for setting up and unloading the integration."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from common import async_test_home_assistant, run
+
+from maintenance import async_unload_entry
+from maintenance.const import DOMAIN
+from maintenance.storage import MaintenanceDB, Task
+
+
+def test_unload_delivers_pending_notify_to_entities(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry", notify_delay=60)
+            await db.async_load()
+            seen = []
+            remove_listener = db.add_listener(lambda: seen.append(db.get("a")))
+
+            async def unload_platforms(entry, platforms) -> bool:
+                remove_listener()  # what removing the entities does
+                return True
+
+            hass.config_entries = SimpleNamespace(
+                async_unload_platforms=unload_platforms, async_entries=lambda domain: []
+            )
+            hass.data[DOMAIN] = {"entry": {"db": db}}
+
+            async with db.transaction() as tx:
+                tx.upsert(Task(id="a", title="Task", zone="Kitchen"))
+            assert seen == []
+
+            assert await async_unload_entry(hass, SimpleNamespace(entry_id="entry"))
+            assert [t.id for t in seen] == ["a"]
+            assert "entry" not in hass.data[DOMAIN]
+
+    run(test)
@@ -0,0 +1,39 @@
+"""Tests for the task selection window."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from common import async_test_home_assistant, run
+
+from maintenance.storage import MaintenanceDB, Task
+
+
+def test_selection_follows_task_changes_and_options_only_read(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            selection = db.selection
+            assert (selection.current, selection.options()) == (None, [])
+
+            async with db.transaction() as tx:
+                for i, tid in enumerate(("soon", "later", "spare")):
+                    tx.upsert(Task(id=tid, title=tid, zone="House", due=datetime(2026, 5, 1 + i, tzinfo=timezone.utc)))
+            assert selection.current == "soon"
+
+            selection.select("later")
+            selection.set_search_results(["spare", "later"])
+            window = (selection.current, list(selection.recent), list(selection.search_results))
+            assert selection.options() == ["later", "spare", "soon"]
+            assert (selection.current, selection.recent, selection.search_results) == window
+
+            async with db.transaction() as tx:
+                tx.delete("later")
+            assert (selection.current, selection.recent, selection.search_results) == ("spare", [], ["spare"])
+
+            selection.current = None
+            assert selection.options() == ["spare", "soon"]
+            assert selection.current is None
+
+    run(test)
@@ -0,0 +1,199 @@
+"""Tests for the maintenance services."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from common import async_test_home_assistant, run
+from homeassistant import auth
+from homeassistant.core import Context
+from homeassistant.exceptions import HomeAssistantError, Unauthorized
+
+from maintenance import services
+from maintenance.const import DOMAIN
+from maintenance.storage import MaintenanceDB
+
+
+def test_import_reports_rows_clashing_with_tasks_added_meanwhile(tmp_path, monkeypatch) -> None:
+    rows = [{"task_id": f"row{i}", "title": f"Row {i}", "zone": "Shed"} for i in range(5)]
+    (tmp_path / "maintenance").mkdir()
+    (tmp_path / "maintenance" / "tasks.json").write_text(json.dumps(rows))
+
+    # Keep the import between staging and commit long enough for other adds to land.
+    close = services.TaskFileReader.close
+
+    def slow_close(reader) -> None:
+        time.sleep(0.2)
+        close(reader)
+
+    monkeypatch.setattr(services.TaskFileReader, "close", slow_close)
+
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            await services.async_setup_services(hass, db)
+
+            importing = asyncio.create_task(
+                hass.services.async_call(
+                    DOMAIN, "import_tasks", {"path": "maintenance/tasks.json"}, blocking=True, return_response=True
+                )
+            )
+            await asyncio.sleep(0.05)
+            await hass.services.async_call(
+                DOMAIN, "add_task", {"task_id": "row1", "title": "Other", "zone": "House"}, blocking=True
+            )
+            await hass.services.async_call(
+                DOMAIN, "add_task", {"task_id": "other", "title": "Row 3", "zone": "Shed"}, blocking=True
+            )
+            result = await importing
+
+            assert result["imported"] == 3
+            assert [e["row"] for e in result["errors"]] == [2, 4]
+            assert db.get("row1").title == "Other"
+            assert sorted(t.id for t in db.tasks.values() if t.title == "Row 3") == ["other"]
+
+    run(test)
+
+
+def test_transfers_are_confined_to_their_folder(tmp_path) -> None:
+    (tmp_path / "secrets.yaml").write_text("api_key: hunter2\n")
+
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            hass.auth = await auth.auth_manager_from_config(hass, [], [])
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            await services.async_setup_services(hass, db)
+
+            for path in (
+                "secrets.yaml",
+                "configuration.yaml",
+                ".storage/core.config",
+                "maintenance/../secrets.yaml",
+                "maintenance/tasks.yaml",
+            ):
+                for service in ("import_tasks", "export_tasks"):
+                    with pytest.raises(HomeAssistantError):
+                        await hass.services.async_call(
+                            DOMAIN, service, {"path": path}, blocking=True, return_response=True
+                        )
+            assert (tmp_path / "secrets.yaml").read_text() == "api_key: hunter2\n"
+
+            result = await hass.services.async_call(
+                DOMAIN, "export_tasks", {"path": "maintenance/out/tasks.csv"}, blocking=True, return_response=True
+            )
+            assert result["exported"] == 0
+            assert (tmp_path / "maintenance" / "out" / "tasks.csv").exists()
+
+            await hass.auth.async_create_user("Owner")  # the first user becomes the owner
+            user = await hass.auth.async_create_user("Tablet", group_ids=["system-users"])
+            with pytest.raises(Unauthorized):
+                await hass.services.async_call(
+                    DOMAIN,
+                    "export_tasks",
+                    {"path": "maintenance/tasks.csv"},
+                    blocking=True,
+                    return_response=True,
+                    context=Context(user_id=user.id),
+                )
+
+    run(test)
+
+
+def test_concurrent_calls_on_one_task_lose_no_update(tmp_path, monkeypatch) -> None:
+    # Every successful start, pause and complete reads the clock exactly once,
+    # so the reads line up with the commits that use them.
+    reads: list[datetime] = []
+
+    def clock() -> datetime:
+        reads.append(datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=7 * len(reads)))
+        return reads[-1]
+
+    monkeypatch.setattr(services, "utcnow", clock)
+
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            await services.async_setup_services(hass, db)
+            await hass.services.async_call(
+                DOMAIN, "add_task", {"task_id": "gutters", "title": "Gutters", "zone": "House"}, blocking=True
+            )
+            first = db.get("gutters")
+
+            committed = []
+            apply = db._apply
+
+            def record(changes) -> None:
+                committed.append(changes["gutters"])
+                apply(changes)
+
+            monkeypatch.setattr(db, "_apply", record)
+
+            def call(service: str, **data):
+                return hass.services.async_call(DOMAIN, service, {"task_id": "gutters", **data}, blocking=True)
+
+            calls = []
+            for i in range(60):
+                calls += [("start", {}), ("pause", {}), ("update", {"title": f"Gutters {i}"})]
+                if i % 4 == 3:
+                    calls.append(("complete", {}))
+            results = await asyncio.gather(
+                *(call(f"{name}_task", **data) for name, data in calls), return_exceptions=True
+            )
+            for result in results:
+                assert result is None or isinstance(result, HomeAssistantError)
+            ok = [name for (name, _), result in zip(calls, results) if result is None]
+
+            # Replay the commits in order: each must build on the one before it.
+            prev, read, spent = first, 0, []
+            for t in committed:
+                assert t.rev == prev.rev + 1
+                if t.title != prev.title:
+                    assert (t.status, t.accum_sec, t.started_at, t.n) == (
+                        prev.status, prev.accum_sec, prev.started_at, prev.n
+                    )
+                    prev = t
+                    continue
+                now, read = reads[read], read + 1
+                elapsed = int((now - prev.started_at).total_seconds()) if prev.started_at else 0
+                if t.n == prev.n + 1:
+                    spent.append(prev.accum_sec + elapsed)
+                    assert (t.status, t.accum_sec, t.started_at, t.locked_by) == ("idle", 0, None, None)
+                elif t.status == "paused":
+                    assert (t.accum_sec, t.started_at) == (prev.accum_sec + elapsed, None)
+                else:
+                    assert t.status == "running"
+                    assert t.accum_sec == prev.accum_sec
+                    assert t.started_at == (prev.started_at or now)
+                prev = t
+            assert read == len(reads)
+
+            task = db.get("gutters")
+            assert task is committed[-1]
+            assert len(committed) == len(ok)
+            assert task.rev == first.rev + len(ok)
+            assert task.n == first.n + ok.count("complete") == len(spent)
+            assert task.stats.mean * task.n == pytest.approx(sum(spent) / 60)
+            assert ok.count("start") and ok.count("pause") and sum(spent)
+
+            # Compare-and-set: of many writers holding the same revision exactly one
+            # wins, and every writer holding an older one is refused.
+            conflicts = db.metrics.counters.get("revision_conflicts", 0)
+            results = await asyncio.gather(
+                *(call("update_task", title=f"Fresh {i}", expected_revision=task.rev) for i in range(20)),
+                *(call("update_task", title=f"Stale {i}", expected_revision=first.rev) for i in range(20)),
+                return_exceptions=True,
+            )
+            assert sum(result is None for result in results[:20]) == 1
+            assert all(isinstance(result, HomeAssistantError) for result in results[20:])
+            assert db.metrics.counters["revision_conflicts"] == conflicts + 39
+            assert db.get("gutters").rev == task.rev + 1
+            assert db.get("gutters").title.startswith("Fresh ")
+
+    run(test)
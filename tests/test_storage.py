@@ -0,0 +1,114 @@
+"""Tests for MaintenanceDB persistence."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from common import async_test_home_assistant, run
+
+from maintenance.storage import MaintenanceDB, Task
+
+
+def _stored_tasks(db: MaintenanceDB) -> dict:
+    with open(db.store.path, encoding="utf-8") as f:
+        return json.load(f)["data"]["tasks"]
+
+
+def test_sequential_saves_all_reach_store(tmp_path) -> None:
+    """hass.async_create_task starts the writer eagerly; every save must still be written."""
+
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            for i in range(5):
+                async with db.transaction() as tx:
+                    tx.upsert(Task(id=str(i), title=f"Task {i}", zone="Kitchen"))
+                assert sorted(_stored_tasks(db)) == [str(n) for n in range(i + 1)]
+            assert db.metrics.counters["saves"] == 5
+
+    run(test)
+
+
+def test_concurrent_saves_are_coalesced(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+
+            async def add(i: int) -> None:
+                async with db.transaction() as tx:
+                    tx.upsert(Task(id=str(i), title=f"Task {i}", zone="Kitchen"))
+
+            await asyncio.gather(*(add(i) for i in range(50)))
+            assert len(_stored_tasks(db)) == 50
+            assert db.metrics.counters["saves"] < 50
+
+            reloaded = MaintenanceDB(hass, "entry")
+            await reloaded.async_load()
+            assert reloaded.revision == db.revision == 50
+            assert len(reloaded.tasks) == 50
+
+    run(test)
+
+
+def test_failed_save_rolls_back(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            seen = []
+
+            async def fail(data: dict) -> None:
+                # What a reader caching by revision sees while the write runs.
+                seen.append((db.revision, db.get("a")))
+                raise OSError("disk full")
+
+            db.store.async_save = fail
+            try:
+                async with db.transaction() as tx:
+                    tx.upsert(Task(id="a", title="Task", zone="Kitchen"))
+            except OSError:
+                pass
+            else:
+                raise AssertionError("save error was swallowed")
+            assert db.get("a") is None
+            assert db.metrics.counters["save_errors"] == 1
+
+            [(revision, task)] = seen
+            assert task is not None
+            assert db.revision > revision
+            notified = []
+            db.add_listener(lambda: notified.append(db.get("a")))
+            db.flush()
+            assert notified == [None]
+
+    run(test)
+
+
+def test_failed_notes_save_keeps_commit_and_retries(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            notes_save = db.notes.store.async_save
+
+            async def fail(data: dict) -> None:
+                raise OSError("disk full")
+
+            db.notes.store.async_save = fail
+            async with db.transaction() as tx:
+                t = Task(id="a", title="Task", zone="Kitchen")
+                tx.set_notes(t, "Use the long ladder.")
+                tx.upsert(t)
+            assert db.get("a") is not None
+            assert db.notes.dirty
+
+            db.notes.store.async_save = notes_save
+            async with db.transaction() as tx:
+                tx.upsert(Task(id="b", title="Other", zone="Kitchen"))
+            assert not db.notes.dirty
+            assert await db.notes.async_get("a") == "Use the long ladder."
+
+    run(test)
@@ -0,0 +1,63 @@
+"""Tests for the todo list entity."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from common import async_test_home_assistant, run
+from homeassistant.components.todo import TodoItem
+from homeassistant.exceptions import HomeAssistantError
+
+from maintenance.recurrence import refresh_due
+from maintenance.storage import MaintenanceDB, Task
+from maintenance.todo import MaintenanceTodoEntity
+
+DUE = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+
+def test_due_set_by_hand_survives_reindex(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            entity = MaintenanceTodoEntity(db, "Maintenance", "entry_todo")
+            entity.hass = hass
+
+            await entity.async_create_todo_item(TodoItem(summary="[Garden] Trim hedge", uid="hedge", due=DUE))
+            assert await db.async_reindex_due() == 0
+            assert db.get("hedge").due == DUE
+
+            edited = datetime(2026, 12, 1, tzinfo=timezone.utc)
+            await entity.async_update_todo_item(TodoItem(summary="[Garden] Trim hedge", uid="hedge", due=edited))
+            assert await db.async_reindex_due() == 0
+            assert db.get("hedge").due == edited
+
+            weekly = Task(id="gutter", title="Clean gutter", zone="House", freq_days=7, last_done=DUE)
+            refresh_due(weekly, db.time_zone)
+            async with db.transaction() as tx:
+                tx.upsert(weekly)
+
+            # A time zone change recomputes scheduled tasks only.
+            await hass.config.async_set_time_zone("America/New_York")
+            assert await db.async_reindex_due() == 1
+            assert db.get("hedge").due == edited
+            assert db.get("gutter").due != weekly.due
+
+    run(test)
+
+
+def test_create_rejects_existing_id(tmp_path) -> None:
+    async def test() -> None:
+        async with async_test_home_assistant(str(tmp_path)) as hass:
+            db = MaintenanceDB(hass, "entry")
+            await db.async_load()
+            entity = MaintenanceTodoEntity(db, "Maintenance", "entry_todo")
+            entity.hass = hass
+
+            await entity.async_create_todo_item(TodoItem(summary="[Garden] Trim hedge", uid="hedge"))
+            with pytest.raises(HomeAssistantError):
+                await entity.async_create_todo_item(TodoItem(summary="[House] Other", uid="hedge"))
+            assert db.get("hedge").title == "Trim hedge"
+
+    run(test)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 from homeassistant.components.todo import (
     TodoItem,
@@ -12,8 +12,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
-from .storage import MaintenanceDB, Task, utcnow
+from .const import (
+    DOMAIN,
+    EVENT_TASK_COMPLETED,
+    EVENT_TASK_CREATED,
+    EVENT_TASK_DELETED,
+    EVENT_TASK_UPDATED,
+)
+from .events import changed_fields, fire_task_event
+from .recurrence import due_key, refresh_due
+from .storage import MaintenanceDB, Task, _dt_to_iso, utcnow
 
 
 class MaintenanceTodoEntity(TodoListEntity):
@@ -82,7 +90,7 @@ class MaintenanceTodoEntity(TodoListEntity):
                     "description": it.description,
                 }
             )
-        return {"items": out}
+        return {"revision": self._db.revision, "items": out}
 
     def _description_for_task(self, t: Task) -> str:
         def iso(dt: datetime | None) -> str | None:
@@ -102,8 +110,8 @@ class MaintenanceTodoEntity(TodoListEntity):
             f"avg_min={t.avg_min}",
             f"n={t.n}",
         ]
-        if t.notes:
-            lines += ["", "notes:", t.notes]
+        if t.notes_preview:
+            lines += ["", "notes:", t.notes_preview]
         return "\n".join(lines)
 
     async def async_create_todo_item(self, item: TodoItem) -> None:
@@ -133,72 +141,101 @@ class MaintenanceTodoEntity(TodoListEntity):
             zone=zone,
             freq_days=0,
             due=item.due,
-            notes=item.description or "",
         )
-        self._db.upsert(t)
-        await self._db.async_save()
-        await self._db.notify()
+        # Set by hand: mark it current so a reindex does not derive it from freq_days=0.
+        t.due_key = due_key(t, self._db.time_zone)
+        async with self._db.lock(tid), self._db.transaction() as tx:
+            if tx.get(tid) is not None:
+                raise HomeAssistantError(f"Task id already exists: {tid}")
+            if item.description:
+                tx.set_notes(t, item.description)
+            tx.upsert(t)
+
+        fire_task_event(self.hass, EVENT_TASK_CREATED, t.id, context=self._context, title=t.title, zone=t.zone)
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
         tid = item.uid
         if not tid:
             raise HomeAssistantError("Todo item missing uid")
 
-        t = self._db.get(tid)
-        if not t:
-            raise HomeAssistantError(f"Unknown task id: {tid}")
-
-        # If user checks the box in the UI: treat as "complete now"
-        if item.status == TodoItemStatus.COMPLETED:
-            if t.locked_by is not None:
-                raise HomeAssistantError(f"Task is locked by {t.locked_by}")
-
-            now = utcnow()
-
-            # Mark completion
-            t.last_done = now
-            if int(t.freq_days) > 0:
-                t.due = now + timedelta(days=int(t.freq_days))
-
-            # Clear runtime state
-            t.locked_by = None
-            t.started_at = None
-            t.accum_sec = 0
-            t.status = "idle"
-
-            self._db.upsert(t)
-            await self._db.async_save()
-            await self._db.notify()
+        completed = item.status == TodoItemStatus.COMPLETED
+        async with self._db.lock(tid), self._db.transaction() as tx:
+            t = tx.get(tid)
+            if not t:
+                raise HomeAssistantError(f"Unknown task id: {tid}")
+            before = self._db.get(tid)
+
+            # If user checks the box in the UI: treat as "complete now"
+            if completed:
+                if t.locked_by is not None:
+                    self._db.metrics.inc("lock_conflicts")
+                    raise HomeAssistantError(f"Task is locked by {t.locked_by}")
+
+                now = utcnow()
+                tx.record_completion(t, None, max(0, int(t.accum_sec or 0)) / 60, now, t.due)
+
+                # Mark completion
+                t.last_done = now
+                refresh_due(t, self._db.time_zone)
+
+                # Clear runtime state
+                t.locked_by = None
+                t.started_at = None
+                t.accum_sec = 0
+                t.status = "idle"
+
+                tx.upsert(t)
+            else:
+                # Otherwise treat it as an edit (summary/due/description)
+                generated = self._description_for_task(t)
+                title = item.summary or t.title
+                zone = t.zone
+
+                if title.startswith("[") and "]" in title:
+                    z = title[1 : title.index("]")]
+                    rest = title[title.index("]") + 1 :].strip()
+                    if z.strip():
+                        zone = z.strip()
+                    if rest:
+                        title = rest
+
+                t.title = title
+                t.zone = zone
+                t.due = item.due
+                if t.due != before.due:
+                    # A date picked by hand stands until the schedule inputs change.
+                    t.due_key = due_key(t, self._db.time_zone)
+
+                # The UI sends back the description we generated (with only a notes
+                # preview); treat it as new notes only if the user actually edited it.
+                if item.description is not None and item.description != generated:
+                    tx.set_notes(t, item.description)
+
+                tx.upsert(t)
+
+        if completed:
+            fire_task_event(
+                self.hass,
+                EVENT_TASK_COMPLETED,
+                t.id,
+                context=self._context,
+                minutes=None,
+                last_done=_dt_to_iso(t.last_done),
+                due=_dt_to_iso(t.due),
+            )
             return
-
-        # Otherwise treat it as an edit (summary/due/description)
-        title = item.summary or t.title
-        zone = t.zone
-
-        if title.startswith("[") and "]" in title:
-            z = title[1 : title.index("]")]
-            rest = title[title.index("]") + 1 :].strip()
-            if z.strip():
-                zone = z.strip()
-            if rest:
-                title = rest
-
-        t.title = title
-        t.zone = zone
-        t.due = item.due
-
-        if item.description is not None:
-            t.notes = item.description
-
-        self._db.upsert(t)
-        await self._db.async_save()
-        await self._db.notify()
+        changed = changed_fields(before, t)
+        if changed:
+            fire_task_event(self.hass, EVENT_TASK_UPDATED, t.id, context=self._context, changed=changed)
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
-        for tid in uids:
-            self._db.delete(tid)
-        await self._db.async_save()
-        await self._db.notify()
+        async with self._db.lock(*uids), self._db.transaction() as tx:
+            deleted = [t for t in map(self._db.get, uids) if t is not None]
+            for tid in uids:
+                tx.delete(tid)
+
+        for t in deleted:
+            fire_task_event(self.hass, EVENT_TASK_DELETED, t.id, context=self._context, title=t.title, zone=t.zone)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
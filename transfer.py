@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+FORMATS = (FORMAT_CSV, FORMAT_JSON)
+
+# Directory under the config dir that import and export are confined to.
+TRANSFER_DIR = "maintenance"
+TRANSFER_SUFFIXES = (".csv", ".json")
+
+# Columns accepted on import; everything else in a row is ignored so exported
+# files (which also carry stats and due dates) can be imported again.
+IMPORT_FIELDS = ("task_id", "title", "zone", "freq_days", "est_min", "notes", "last_done", "recurrence")
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "zone",
+    "freq_days",
+    "est_min",
+    "avg_min",
+    "n",
+    "notes",
+    "last_done",
+    "last_done_by",
+    "due",
+    "recurrence",
+)
+
+_READ_CHUNK = 64 * 1024
+_JSON_WS = " \t\r\n"
+
+
+def guess_format(path: Path) -> str:
+    return FORMAT_JSON if path.suffix.lower() == ".json" else FORMAT_CSV
+
+
+def row_to_call_data(row: Dict[Any, Any]) -> Dict[str, Any]:
+    """Map an imported row onto add_task service data."""
+
+    data: Dict[str, Any] = {}
+    for key, val in row.items():
+        if not isinstance(key, str):
+            continue  # csv puts surplus cells under a None key
+        key = key.strip()
+        if key == "id":
+            key = "task_id"
+        if key not in IMPORT_FIELDS:
+            continue
+        if val is None or (isinstance(val, str) and not val.strip()):
+            continue
+        if key == "recurrence" and isinstance(val, str):
+            val = json.loads(val)
+        data[key] = val
+    return data
+
+
+class _JsonArrayReader:
+    """Incrementally decode the objects of a top-level JSON array."""
+
+    def __init__(self, fh: IO[str]) -> None:
+        self._fh = fh
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+
+    def _fill(self) -> bool:
+        chunk = self._fh.read(_READ_CHUNK)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _skip(self, chars: str) -> bool:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in chars:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return True
+            if not self._fill():
+                return False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        if self._done:
+            raise StopIteration
+
+        if not self._started:
+            if not self._skip(_JSON_WS) or self._buf[self._pos] != "[":
+                raise ValueError("Expected a JSON array of tasks")
+            self._pos += 1
+            self._started = True
+
+        if not self._skip(_JSON_WS + ","):
+            raise ValueError("Unterminated JSON array")
+        if self._buf[self._pos] == "]":
+            self._done = True
+            raise StopIteration
+
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as err:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid JSON: {err}") from err
+            self._pos = end
+            return obj
+
+
+class TaskFileReader:
+    """Read task rows from a CSV or JSON file in bounded-size batches.
+
+    All methods do blocking I/O and are meant to run in an executor.
+    """
+
+    def __init__(self, path: Path, fmt: str) -> None:
+        self.path = path
+        self.format = fmt
+        self._fh: Optional[IO[str]] = None
+        self._rows: Optional[Iterator[Any]] = None
+        self._row_no = 0
+
+    def open(self) -> None:
+        self._fh = open(self.path, encoding="utf-8-sig", newline="")
+        if self.format == FORMAT_CSV:
+            self._rows = iter(csv.DictReader(self._fh))
+        else:
+            self._rows = _JsonArrayReader(self._fh)
+
+    def read_batch(self, size: int) -> List[Tuple[int, Any]]:
+        assert self._rows is not None
+        batch: List[Tuple[int, Any]] = []
+        for row in self._rows:
+            self._row_no += 1
+            batch.append((self._row_no, row))
+            if len(batch) >= size:
+                break
+        return batch
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def _export_row(task: Any, notes: Dict[str, str]) -> Dict[str, Any]:
+    d = task.to_dict()
+    d["notes"] = notes.get(task.id, "")
+    return {key: d.get(key) for key in EXPORT_FIELDS}
+
+
+def write_tasks(path: Path, fmt: str, tasks: Iterable[Any], notes: Dict[str, str]) -> int:
+    """Stream tasks to path row by row, replacing it atomically. Blocking."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    count = 0
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as fh:
+            if fmt == FORMAT_CSV:
+                writer = csv.DictWriter(fh, fieldnames=EXPORT_FIELDS)
+                writer.writeheader()
+                for task in tasks:
+                    row = _export_row(task, notes)
+                    if row["recurrence"] is not None:
+                        row["recurrence"] = json.dumps(row["recurrence"], separators=(",", ":"))
+                    writer.writerow(row)
+                    count += 1
+            else:
+                fh.write("[")
+                for task in tasks:
+                    fh.write(",\n" if count else "\n")
+                    fh.write(json.dumps(_export_row(task, notes), ensure_ascii=False))
+                    count += 1
+                fh.write("\n]\n")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
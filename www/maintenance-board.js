@@ -1,12 +1,33 @@
+// Lists longer than this render only the cards inside the scroll viewport.
+const VIRTUALIZE_THRESHOLD = 60;
+const VIRTUAL_OVERSCAN_ROWS = 4;
+const DEFAULT_ROW_HEIGHT = 168;
+const CARD_GAP = 12;
+
 class MaintenanceBoardCard extends HTMLElement {
   setConfig(config) {
     if (!config || !config.entity) throw new Error("maintenance-board: entity is required");
+    // The panel re-applies its config on every hass update; keep render caches
+    // unless the configuration actually changed.
+    const configKey = JSON.stringify(config);
+    if (this._configKey === configKey) return;
+    this._configKey = configKey;
+
     this._config = config;
     this._lastRender = 0;
     this._editing = null;
     this._modalOpen = false;
     this._renderedKey = null;
-    this._durationEls = new Map();
+    this._tasks = [];
+    this._user = null;
+    this._byId = new Map();
+    this._cards = new Map();
+    this._visibleRunning = [];
+    this._heights = new Map();
+    this._heightSum = 0;
+    this._heightCount = 0;
+    this._offsets = null;
+    this._virtual = false;
 
     if (!this._root) {
       this._root = this.attachShadow({ mode: "open" });
@@ -138,6 +159,22 @@ class MaintenanceBoardCard extends HTMLElement {
             border-radius: 50%;
             border: 1px solid var(--divider-color);
           }
+          #list.virtual {
+            position: relative;
+            overflow-y: auto;
+            max-height: var(--maintenance-board-max-height, 75vh);
+            overscroll-behavior: contain;
+          }
+          .list-spacer {
+            position: relative;
+          }
+          #list.virtual .list-items {
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            will-change: transform;
+          }
           .empty-state {
             text-align: center;
             color: var(--secondary-text-color);
@@ -210,7 +247,11 @@ class MaintenanceBoardCard extends HTMLElement {
             </div>
             <mwc-button raised dense id="addBtn">➕ Add Task</mwc-button>
           </div>
-          <div id="list"></div>
+          <div id="list">
+            <div class="list-spacer" id="spacer">
+              <div class="list-items" id="items"></div>
+            </div>
+          </div>
         </div>
 
         <ha-dialog id="taskDialog" scrimClickAction="close" escapeKeyAction="close">
@@ -267,6 +308,9 @@ class MaintenanceBoardCard extends HTMLElement {
     this._root.getElementById("cancelBtn").onclick = () => this._closeModal();
     this._root.getElementById("saveBtn").onclick = () => this._saveTask();
     this._root.getElementById("f_zone").onchange = () => this._onZoneChange();
+    const listEl = this._root.getElementById("list");
+    listEl.onclick = (e) => this._onListClick(e);
+    listEl.onscroll = () => this._onScroll();
     this._dialog = this._root.getElementById("taskDialog");
     this._dialog.addEventListener("closed", () => {
       this._modalOpen = false;
@@ -281,12 +325,16 @@ class MaintenanceBoardCard extends HTMLElement {
   }
 
   connectedCallback() {
-    this._tick = setInterval(() => this._scheduleRender(true), 1000);
+    this._tick = setInterval(() => this._tickDurations(), 1000);
     window.addEventListener("keydown", this._onKeyDown);
   }
 
   disconnectedCallback() {
     clearInterval(this._tick);
+    clearTimeout(this._pendingRender);
+    this._pendingRender = null;
+    if (this._scrollFrame) cancelAnimationFrame(this._scrollFrame);
+    this._scrollFrame = null;
     window.removeEventListener("keydown", this._onKeyDown);
   }
 
@@ -296,7 +344,17 @@ class MaintenanceBoardCard extends HTMLElement {
 
   _scheduleRender(force = false) {
     const now = Date.now();
-    if (!force && now - this._lastRender < 200) return;
+    const wait = 200 - (now - this._lastRender);
+    if (!force && wait > 0) {
+      // Throttled: make sure the latest state still lands on the trailing edge.
+      if (!this._pendingRender) {
+        this._pendingRender = setTimeout(() => {
+          this._pendingRender = null;
+          this._scheduleRender(true);
+        }, wait);
+      }
+      return;
+    }
     this._lastRender = now;
     this._render();
   }
@@ -440,7 +498,7 @@ class MaintenanceBoardCard extends HTMLElement {
     this._root.getElementById("f_title").value = t ? (t.title || "") : "";
     this._root.getElementById("f_freq").value = t ? (t.freq_days ?? "") : "";
     this._root.getElementById("f_est").value = t ? (t.est_min ?? "") : "";
-    this._root.getElementById("f_notes").value = t ? (t.notes || "") : "";
+    this._loadNotes(t);
 
     const defaultZone = t?.zone || "House";
     if (opts.includes(defaultZone)) zoneSel.value = defaultZone;
@@ -524,6 +582,35 @@ class MaintenanceBoardCard extends HTMLElement {
     return { title, zone, freq_days, est_min, notes, last_done };
   }
 
+  async _loadNotes(task) {
+    const field = this._root.getElementById("f_notes");
+    // Only the preview ships with the task; the full text is fetched on demand.
+    this._notesLoaded = !task || !task.notes_len;
+    field.value = task ? (task.notes_preview || "") : "";
+    field.disabled = !this._notesLoaded;
+    if (this._notesLoaded) return;
+
+    let notes;
+    try {
+      const res = await this._hass.callWS({
+        type: "call_service",
+        domain: "maintenance",
+        service: "get_task_notes",
+        service_data: { task_id: task.id },
+        return_response: true,
+      });
+      notes = res?.response?.notes ?? "";
+    } catch (e) {
+      this._setModalError(`Could not load notes: ${e?.message || e}`);
+      return;
+    }
+    // The dialog may have been closed or reopened for another task meanwhile.
+    if (!this._modalOpen || this._editing !== task) return;
+    field.value = notes;
+    field.disabled = false;
+    this._notesLoaded = true;
+  }
+
   async _saveTask() {
     const { title, zone, freq_days, est_min, notes, last_done } = this._readModalForm();
     const isEdit = !!this._editing;
@@ -538,8 +625,9 @@ class MaintenanceBoardCard extends HTMLElement {
       zone,
       freq_days: Math.floor(freq_days),
       est_min: Math.floor(est_min),
-      notes,
     };
+    // Never write the preview back over notes that have not been loaded.
+    if (this._notesLoaded) payload.notes = notes;
     if (last_done) payload.last_done = last_done;
 
     if (!isEdit) {
@@ -552,6 +640,8 @@ class MaintenanceBoardCard extends HTMLElement {
     }
 
     payload.task_id = this._editing.id;
+    // Refuse to overwrite changes someone else saved while the dialog was open.
+    if (Number.isInteger(this._editing.rev)) payload.expected_revision = this._editing.rev;
     const res = await this._call("maintenance", "update_task", payload, { onError: (msg) => this._setModalError(msg) });
     if (!res?.ok) return;
     this._setModalError("");
@@ -608,15 +698,6 @@ class MaintenanceBoardCard extends HTMLElement {
     await this._call("maintenance", "complete_task", { task_id: task.id });
   }
 
-  _updateLiveDurations(tasks) {
-    if (!this._durationEls || this._durationEls.size === 0) return;
-    tasks.forEach((t) => {
-      const key = this._escape(t.id);
-      const el = this._durationEls.get(key);
-      if (el) el.textContent = this._fmtDuration(this._liveTotalSec(t));
-    });
-  }
-
   _buildChip(label, extraClass = "") {
     return `<span class="chip ${extraClass}">${label}</span>`;
   }
@@ -627,163 +708,327 @@ class MaintenanceBoardCard extends HTMLElement {
     const { st, tasks } = this._getTasksState();
     const countEl = this._root.getElementById("count");
     const filterEl = this._root.getElementById("filter");
-    const listEl = this._root.getElementById("list");
 
     if (!st) {
       countEl.textContent = `Missing entity: ${this._config.entity}`;
       filterEl.textContent = "";
-      listEl.innerHTML = "";
-      this._durationEls = new Map();
+      this._setTasks([], null);
       this._renderedKey = null;
       return;
     }
 
     const user = this._getUser();
-    countEl.textContent = `${tasks.length} task(s)`;
-    filterEl.textContent = `User: ${user}`;
+    // view: "mine" asks the integration for this user's slice instead of
+    // filtering the full task list here.
+    const mine = this._config.view === "mine";
+    if (!mine) countEl.textContent = `${tasks.length} task(s)`;
+    filterEl.textContent = mine ? `My tasks: ${user}` : `User: ${user}`;
+
+    // Prefer the integer revision published by the integration; fall back to a
+    // full serialization only for older backends that do not expose it.
+    // Days left, overdue chips and the sort order are relative to today, so the
+    // local date is part of the key and cards re-render after midnight.
+    const revision = st.attributes?.revision;
+    const today = new Date().toDateString();
+    this._renderedDay = today;
+    const stateKey = (revision === undefined || revision === null)
+      ? `${today}|${JSON.stringify(tasks || [])}`
+      : `${revision}|${user}|${today}`;
+    if (this._renderedKey === stateKey) {
+      this._tickDurations();
+      return;
+    }
 
-    const stateKey = JSON.stringify(tasks || []);
-    const canReuse = this._renderedKey === stateKey && this._durationEls.size > 0;
-    if (canReuse) {
-      this._updateLiveDurations(tasks);
+    this._renderedKey = stateKey;
+    if (mine) {
+      this._fetchUserTasks(stateKey, user, tasks.length);
       return;
     }
+    this._setTasks(tasks, user);
+  }
 
-    const html = (tasks.length === 0)
-      ? `<div class="task-card empty-state">No tasks yet. Click Add Task.</div>`
-      : tasks.map((t) => {
-        const daysLeft = t.days_left;
-        const dueTxt = (daysLeft === null || daysLeft === undefined)
-          ? "No due date"
-          : (daysLeft < 0 ? `${Math.abs(daysLeft)}d overdue` : `${daysLeft}d left`);
-
-        const locked = t.locked_by;
-        const status = t.status || "idle";
-        const isLockedByOther = locked && locked !== user;
-
-        const canStartPause = (!locked || locked === user);
-        const startPauseLabel = (status === "running") ? "Pause" : (status === "paused" ? "Resume" : "Start");
-        const totalSec = this._liveTotalSec(t);
-        const durTxt = this._fmtDuration(totalSec);
-        const lastDone = this._fmtDate(t.last_done) || "never";
-        const lastDoneBy = (t.last_done_by || "").trim();
-        const lastDoneLabel = lastDone === "never"
-          ? "Last done: never"
-          : (lastDoneBy ? `Last done: ${lastDone} by ${lastDoneBy}` : `Last done: ${lastDone}`);
-        const startedAt = (status === "running" && t.started_at) ? this._fmtDateTimeLocal(t.started_at) : "";
-
-        const dueClass = (daysLeft !== null && daysLeft !== undefined && daysLeft < 0) ? "overdue" : "";
-        const statusClass = status === "running" ? "running" : "";
-
-        const freq = t.freq_days ? `Every ${t.freq_days}d` : "";
-        const est = t.est_min ? `${t.est_min}m est` : "";
-        const hasAvg = t.avg_min !== undefined && t.avg_min !== null;
-        const avg = hasAvg ? `${t.avg_min}m avg` : "";
-        const note = (t.notes || "").trim();
-
-        const zoneChip = t.zone ? this._buildChip(this._escape(t.zone)) : "";
-        const statusChip = this._buildChip(this._escape(status === "idle" ? "Idle" : status.charAt(0).toUpperCase() + status.slice(1)), statusClass);
-        const dueChip = this._buildChip(this._escape(dueTxt), dueClass);
-        const lockChip = locked ? this._buildChip(`Locked by ${this._escape(locked)}`, "overdue") : "";
-        const lastDoneChip = this._buildChip(this._escape(lastDoneLabel));
-        const freqChip = freq ? this._buildChip(this._escape(freq)) : "";
-        const estChip = est ? this._buildChip(this._escape(est)) : "";
-        const avgChip = avg ? this._buildChip(this._escape(avg)) : "";
-
-        const disableAll = isLockedByOther;
-
-        return `
-          <div class="task-card">
-            <div class="task-header">
-              <div>
-                <div class="task-title">${this._escape(t.title)}</div>
-                <div class="task-meta">
-                  ${zoneChip}
-                  ${statusChip}
-                  ${dueChip}
-                  ${lockChip}
-                  ${lastDoneChip}
-                  ${freqChip}
-                  ${estChip}
-                  ${avgChip}
-                </div>
-                ${note ? `<div class="task-note">${this._escape(note)}</div>` : ""}
-              </div>
-              <div class="task-actions">
-                <div class="inline-actions">
-                  <ha-icon-button icon="mdi:pencil" aria-label="Edit" data-edit="${this._escape(t.id)}" ${disableAll ? "disabled" : ""}></ha-icon-button>
-                  <ha-icon-button icon="mdi:backup-restore" aria-label="Reset" data-reset="${this._escape(t.id)}" ${disableAll ? "disabled" : ""}></ha-icon-button>
-                  <ha-icon-button icon="mdi:delete" aria-label="Delete" data-del="${this._escape(t.id)}" ${disableAll ? "disabled" : ""}></ha-icon-button>
-                </div>
-              </div>
-            </div>
+  async _fetchUserTasks(stateKey, user, total) {
+    let tasks;
+    try {
+      // The snapshot endpoint is cached per revision and compressed, unlike a
+      // service response.
+      const res = await this._hass.fetchWithAuth(
+        `/api/maintenance/tasks?user=${encodeURIComponent(user)}`
+      );
+      if (!res.ok) throw new Error(`Loading my tasks failed (${res.status})`);
+      const body = await res.json();
+      tasks = Array.isArray(body?.tasks) ? body.tasks : [];
+    } catch (e) {
+      // Keep the key so a failing backend is not polled on every hass update;
+      // the next revision retries.
+      this._notify(e?.message || String(e));
+      return;
+    }
+    // A newer revision may have been requested while this call was in flight.
+    if (this._renderedKey !== stateKey) return;
+    this._root.getElementById("count").textContent = `${tasks.length} of ${total} task(s)`;
+    this._setTasks(tasks, user);
+  }
 
-            <div class="task-footer">
-              <div class="duration-block">
-                <div class="duration" data-duration="${this._escape(t.id)}">${this._escape(durTxt)}</div>
-                ${startedAt ? `<div class="meta-text">Started: ${this._escape(startedAt)}</div>` : ""}
-              </div>
-              <div class="task-actions">
-                <mwc-button dense outlined class="primary-btn" data-sp="${this._escape(t.id)}" ${canStartPause ? "" : "disabled"}>${this._escape(startPauseLabel)}</mwc-button>
-                <mwc-button dense raised class="danger-btn" data-c="${this._escape(t.id)}" ${disableAll ? "disabled" : ""}>Complete</mwc-button>
-              </div>
-            </div>
-          </div>
-        `;
-      }).join("");
+  _setTasks(tasks, user) {
+    this._tasks = tasks;
+    this._user = user;
+    this._byId = new Map(tasks.map((t) => [t.id, t]));
+    this._offsets = null;
+
+    if (this._heights.size > tasks.length * 2 + VIRTUAL_OVERSCAN_ROWS) {
+      // Drop measurements of deleted tasks so the cache stays bounded.
+      const kept = new Map();
+      for (const t of tasks) {
+        if (this._heights.has(t.id)) kept.set(t.id, this._heights.get(t.id));
+      }
+      this._heights = kept;
+    }
 
-    listEl.innerHTML = html;
-    this._renderedKey = stateKey;
+    this._virtual = tasks.length > VIRTUALIZE_THRESHOLD;
+    this._root.getElementById("list").classList.toggle("virtual", this._virtual);
+    this._renderWindow();
+  }
 
-    this._durationEls = new Map();
-    listEl.querySelectorAll(".duration").forEach((el) => {
-      const id = el.getAttribute("data-duration");
-      if (id) this._durationEls.set(id, el);
+  _onScroll() {
+    if (!this._virtual || this._scrollFrame) return;
+    this._scrollFrame = requestAnimationFrame(() => {
+      this._scrollFrame = null;
+      this._renderWindow();
     });
+  }
 
-    const byId = new Map(tasks.map((t) => [t.id, t]));
+  _rowEstimate() {
+    return this._heightCount ? this._heightSum / this._heightCount : DEFAULT_ROW_HEIGHT;
+  }
 
-    listEl.querySelectorAll("mwc-button[data-sp]").forEach((btn) => {
-      btn.onclick = async () => {
-        const id = btn.getAttribute("data-sp");
-        const task = byId.get(id);
-        if (task) await this._toggleStartPause(task);
-      };
-    });
+  _layout() {
+    if (this._offsets) return this._offsets;
+    const tasks = this._tasks;
+    const estimate = this._rowEstimate();
+    const offsets = new Float64Array(tasks.length + 1);
+    for (let i = 0; i < tasks.length; i++) {
+      offsets[i + 1] = offsets[i] + (this._heights.get(tasks[i].id) ?? estimate);
+    }
+    this._offsets = offsets;
+    return offsets;
+  }
 
-    listEl.querySelectorAll("mwc-button[data-c]").forEach((btn) => {
-      btn.onclick = async () => {
-        const id = btn.getAttribute("data-c");
-        const task = byId.get(id);
-        if (task) await this._complete(task);
-      };
-    });
+  _indexAt(y) {
+    // Last row whose top edge is at or above y.
+    const offsets = this._layout();
+    let lo = 0;
+    let hi = this._tasks.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (offsets[mid] <= y) lo = mid;
+      else hi = mid - 1;
+    }
+    return lo;
+  }
 
-    listEl.querySelectorAll("ha-icon-button[data-edit]").forEach((btn) => {
-      btn.onclick = () => {
-        const id = btn.getAttribute("data-edit");
-        const task = byId.get(id);
-        if (task) this._openEdit(task);
-      };
-    });
+  _renderWindow() {
+    const listEl = this._root.getElementById("list");
+    const spacerEl = this._root.getElementById("spacer");
+    const itemsEl = this._root.getElementById("items");
+    const tasks = this._tasks;
+
+    if (tasks.length === 0) {
+      this._cards = new Map();
+      this._visibleRunning = [];
+      spacerEl.style.height = "";
+      itemsEl.style.transform = "";
+      itemsEl.innerHTML = this._user === null
+        ? ""
+        : `<div class="task-card empty-state">No tasks yet. Click Add Task.</div>`;
+      return;
+    }
 
-    listEl.querySelectorAll("ha-icon-button[data-reset]").forEach((btn) => {
-      btn.onclick = async () => {
-        const id = btn.getAttribute("data-reset");
-        const task = byId.get(id);
-        if (task) await this._resetTask(task);
-      };
-    });
+    let start = 0;
+    let end = tasks.length;
+    if (this._virtual) {
+      const top = listEl.scrollTop;
+      const viewport = listEl.clientHeight || window.innerHeight;
+      start = Math.max(0, this._indexAt(top) - VIRTUAL_OVERSCAN_ROWS);
+      end = Math.min(tasks.length, this._indexAt(top + viewport) + 1 + VIRTUAL_OVERSCAN_ROWS);
+    }
 
-    listEl.querySelectorAll("ha-icon-button[data-del]").forEach((btn) => {
-      btn.onclick = async () => {
-        const id = btn.getAttribute("data-del");
-        const task = byId.get(id);
-        if (task) await this._deleteTask(task);
-      };
-    });
+    // Reuse cards by task id and only re-render the ones whose data changed.
+    const cards = new Map();
+    const els = [];
+    const running = [];
+    for (let i = start; i < end; i++) {
+      const t = tasks[i];
+      const key = JSON.stringify(t);
+      let card = this._cards.get(t.id);
+      if (!card) {
+        const el = document.createElement("div");
+        el.className = "task-card";
+        card = { el, key: null, user: null, durationEl: null, task: null };
+      }
+      if (card.key !== key || card.user !== this._user) {
+        card.el.innerHTML = this._cardHtml(t, this._user);
+        card.durationEl = card.el.querySelector(".duration");
+        card.key = key;
+        card.user = this._user;
+      }
+      card.task = t;
+      cards.set(t.id, card);
+      els.push(card.el);
+      if (t.status === "running" && t.started_at) running.push(card);
+    }
+    this._cards = cards;
+    this._visibleRunning = running;
+
+    const children = itemsEl.children;
+    let sameOrder = children.length === els.length;
+    for (let i = 0; sameOrder && i < els.length; i++) sameOrder = children[i] === els[i];
+    if (!sameOrder) itemsEl.replaceChildren(...els);
+
+    if (!this._virtual) {
+      spacerEl.style.height = "";
+      itemsEl.style.transform = "";
+      return;
+    }
+
+    // Feed real card heights back into the layout so offsets converge.
+    for (const card of cards.values()) {
+      const h = card.el.offsetHeight + CARD_GAP;
+      const prev = this._heights.get(card.task.id);
+      if (prev === h) continue;
+      if (prev === undefined) {
+        this._heightSum += h;
+        this._heightCount += 1;
+      } else {
+        this._heightSum += h - prev;
+      }
+      this._heights.set(card.task.id, h);
+      this._offsets = null;
+    }
+
+    const offsets = this._layout();
+    spacerEl.style.height = `${offsets[tasks.length]}px`;
+    itemsEl.style.transform = `translateY(${offsets[start]}px)`;
+  }
+
+  _tickDurations() {
+    // A quiet install may not push a new state for hours; re-render when the day rolls over.
+    if (this._renderedDay && this._renderedDay !== new Date().toDateString()) {
+      this._renderedDay = null;
+      this._scheduleRender();
+    }
+    // Only running cards inside the rendered window need a live update.
+    for (const card of this._visibleRunning) {
+      if (card.durationEl) card.durationEl.textContent = this._fmtDuration(this._liveTotalSec(card.task));
+    }
+  }
+
+  _onListClick(e) {
+    const btn = e.target?.closest?.("[data-action]");
+    if (!btn || btn.hasAttribute("disabled")) return;
+    const task = this._byId.get(btn.getAttribute("data-id"));
+    if (!task) return;
+
+    switch (btn.getAttribute("data-action")) {
+      case "start-pause":
+        this._toggleStartPause(task);
+        break;
+      case "complete":
+        this._complete(task);
+        break;
+      case "edit":
+        this._openEdit(task);
+        break;
+      case "reset":
+        this._resetTask(task);
+        break;
+      case "delete":
+        this._deleteTask(task);
+        break;
+      default:
+        break;
+    }
+  }
+
+  _cardHtml(t, user) {
+    const daysLeft = t.days_left;
+    const dueTxt = (daysLeft === null || daysLeft === undefined)
+      ? "No due date"
+      : (daysLeft < 0 ? `${Math.abs(daysLeft)}d overdue` : `${daysLeft}d left`);
+
+    const locked = t.locked_by;
+    const status = t.status || "idle";
+    const isLockedByOther = locked && locked !== user;
+
+    const canStartPause = (!locked || locked === user);
+    const startPauseLabel = (status === "running") ? "Pause" : (status === "paused" ? "Resume" : "Start");
+    const totalSec = this._liveTotalSec(t);
+    const durTxt = this._fmtDuration(totalSec);
+    const lastDone = this._fmtDate(t.last_done) || "never";
+    const lastDoneBy = (t.last_done_by || "").trim();
+    const lastDoneLabel = lastDone === "never"
+      ? "Last done: never"
+      : (lastDoneBy ? `Last done: ${lastDone} by ${lastDoneBy}` : `Last done: ${lastDone}`);
+    const startedAt = (status === "running" && t.started_at) ? this._fmtDateTimeLocal(t.started_at) : "";
+
+    const dueClass = (daysLeft !== null && daysLeft !== undefined && daysLeft < 0) ? "overdue" : "";
+    const statusClass = status === "running" ? "running" : "";
+
+    const freq = t.freq_days ? `Every ${t.freq_days}d` : "";
+    const est = t.est_min ? `${t.est_min}m est` : "";
+    const hasAvg = t.avg_min !== undefined && t.avg_min !== null;
+    const avg = hasAvg ? `${t.avg_min}m avg` : "";
+    const note = (t.notes_preview || "").trim();
+
+    const zoneChip = t.zone ? this._buildChip(this._escape(t.zone)) : "";
+    const statusChip = this._buildChip(this._escape(status === "idle" ? "Idle" : status.charAt(0).toUpperCase() + status.slice(1)), statusClass);
+    const dueChip = this._buildChip(this._escape(dueTxt), dueClass);
+    const lockChip = locked ? this._buildChip(`Locked by ${this._escape(locked)}`, "overdue") : "";
+    const lastDoneChip = this._buildChip(this._escape(lastDoneLabel));
+    const freqChip = freq ? this._buildChip(this._escape(freq)) : "";
+    const estChip = est ? this._buildChip(this._escape(est)) : "";
+    const avgChip = avg ? this._buildChip(this._escape(avg)) : "";
+
+    const disableAll = isLockedByOther;
+    const id = this._escape(t.id);
+
+    return `
+      <div class="task-header">
+        <div>
+          <div class="task-title">${this._escape(t.title)}</div>
+          <div class="task-meta">
+            ${zoneChip}
+            ${statusChip}
+            ${dueChip}
+            ${lockChip}
+            ${lastDoneChip}
+            ${freqChip}
+            ${estChip}
+            ${avgChip}
+          </div>
+          ${note ? `<div class="task-note">${this._escape(note)}</div>` : ""}
+        </div>
+        <div class="task-actions">
+          <div class="inline-actions">
+            <ha-icon-button icon="mdi:pencil" aria-label="Edit" data-action="edit" data-id="${id}" ${disableAll ? "disabled" : ""}></ha-icon-button>
+            <ha-icon-button icon="mdi:backup-restore" aria-label="Reset" data-action="reset" data-id="${id}" ${disableAll ? "disabled" : ""}></ha-icon-button>
+            <ha-icon-button icon="mdi:delete" aria-label="Delete" data-action="delete" data-id="${id}" ${disableAll ? "disabled" : ""}></ha-icon-button>
+          </div>
+        </div>
+      </div>
+
+      <div class="task-footer">
+        <div class="duration-block">
+          <div class="duration">${this._escape(durTxt)}</div>
+          ${startedAt ? `<div class="meta-text">Started: ${this._escape(startedAt)}</div>` : ""}
+        </div>
+        <div class="task-actions">
+          <mwc-button dense outlined class="primary-btn" data-action="start-pause" data-id="${id}" ${canStartPause ? "" : "disabled"}>${this._escape(startPauseLabel)}</mwc-button>
+          <mwc-button dense raised class="danger-btn" data-action="complete" data-id="${id}" ${disableAll ? "disabled" : ""}>Complete</mwc-button>
+        </div>
+      </div>
+    `;
   }
 }
 
 customElements.define("maintenance-board", MaintenanceBoardCard);
-
@@ -129,7 +129,8 @@ class MaintenancePanel extends HTMLElement {
     this._hideMissing();
 
     try {
-      this._board.setConfig({ entity, user_entity: userEntity });
+      const view = this._panel?.config?.view;
+      this._board.setConfig({ entity, user_entity: userEntity, ...(view ? { view } : {}) });
     } catch (err) {
       console.error("maintenance-panel: unable to set config", err);
     }